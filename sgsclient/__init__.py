@@ -12,8 +12,23 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import pbr.version
+import sys
 
 
-__version__ = pbr.version.VersionInfo(
-    'sgservice-client').version_string()
+def _version_string():
+    import pbr.version
+
+    return pbr.version.VersionInfo('sgservice-client').version_string()
+
+
+if sys.version_info >= (3, 7):
+    # Importing pbr is slow, so only look the version up when it is used.
+    def __getattr__(name):
+        if name == '__version__':
+            global __version__
+            __version__ = _version_string()
+            return __version__
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+else:
+    __version__ = _version_string()
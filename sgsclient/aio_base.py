@@ -0,0 +1,337 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Mixins turning the managers of :mod:`sgsclient.base` into asyncio managers.
+
+The request helpers of :class:`sgsclient.base.Manager` are replaced by
+coroutines, so the public manager methods, which return the result of one
+of those helpers, return awaitables. URL building and resource construction
+are inherited unchanged.
+"""
+
+import asyncio
+import inspect
+
+from sgsclient import base
+from sgsclient import client
+from sgsclient import exceptions as exc
+from sgsclient import jsonstream
+from sgsclient.openstack.common.apiclient import base as common_base
+from sgsclient.openstack.common.apiclient import exceptions
+from sgsclient import resource_index
+from sgsclient import waiters
+
+
+class AsyncManagerMixin(object):
+    """Issue the requests of a :class:`sgsclient.base.Manager` with await.
+
+    Resources are returned loaded: reading a missing attribute raises
+    AttributeError instead of lazily getting the resource, which would
+    block the event loop.
+    """
+
+    def _list(self, url, response_key=None, obj_class=None,
+              data=None, headers=None, return_raw=False, stream=False,
+              compact=False):
+        # Not a coroutine itself: a streamed listing is an async iterator.
+        if compact and obj_class is None:
+            obj_class = self.compact_resource_class or base.CompactResource
+        if stream:
+            return self._stream_list(url, response_key, obj_class, headers,
+                                     return_raw)
+        return self._list_all(url, response_key, obj_class, headers,
+                              return_raw)
+
+    async def _list_all(self, url, response_key=None, obj_class=None,
+                        headers=None, return_raw=False):
+        body = await self._conditional_get(url, headers or {})
+        return self._list_result(body, response_key, obj_class, return_raw)
+
+    async def _stream_list(self, url, response_key=None, obj_class=None,
+                           headers=None, return_raw=False):
+        """Asynchronously yield the resources of a listing as it is read.
+
+        See :meth:`sgsclient.base.Manager._stream_list`.
+        """
+        if obj_class is None:
+            obj_class = self.resource_class
+        parser = jsonstream.ArrayParser(response_key)
+        resp = await self.api.raw_request('GET', url, headers=headers or {},
+                                          stream=True)
+        try:
+            async for chunk in resp.iter_content(client.CHUNKSIZE):
+                for res in parser.feed(chunk):
+                    if return_raw:
+                        yield res
+                    elif res:
+                        yield obj_class(self, res, loaded=True)
+            for res in parser.close():
+                if return_raw:
+                    yield res
+                elif res:
+                    yield obj_class(self, res, loaded=True)
+        finally:
+            resp.close()
+
+    async def _conditional_get(self, url, headers):
+        key, previous, headers = self._revalidation_headers(url, headers)
+        resp, body = await self.api.json_request('GET', url, headers=headers)
+        return self._revalidated_body(key, previous, resp, body)
+
+    async def _delete(self, url, headers=None):
+        try:
+            resp = await self.api.raw_request('DELETE', url,
+                                              headers=headers or {})
+        finally:
+            self._invalidate(self._url_resource_id(url))
+        return common_base.TupleWithMeta((resp, None), resp)
+
+    async def _update(self, url, data, response_key=None, headers=None):
+        try:
+            resp, body = await self.api.json_request('PUT', url, data=data,
+                                                     headers=headers or {})
+        finally:
+            self._invalidate(self._url_resource_id(url))
+        # PUT requests may not return a body
+        if body:
+            return self._resource_result(body, response_key)
+
+    async def _create(self, url, data=None, response_key=None,
+                      return_raw=False, headers=None):
+        kwargs = {'headers': headers or {}}
+        if data:
+            kwargs['data'] = data
+        resp, body = await self.api.json_request('POST', url, **kwargs)
+        result = self._resource_result(body, response_key, return_raw)
+        self._invalidate(self._created_id(result))
+        return result
+
+    async def _get(self, url, response_key=None, return_raw=False,
+                   headers=None):
+        body = self._cached_body(url, headers)
+        if body is None:
+            body = await self._conditional_get(url, headers or {})
+            self._cache_body(url, headers, body)
+        return self._resource_result(body, response_key, return_raw)
+
+    async def _action(self, action, url, action_data=None,
+                      response_key=None):
+        data = {action: action_data}
+        try:
+            resp, body = await self.api.json_request('POST', url, data=data)
+        finally:
+            self._invalidate(self._url_resource_id(url))
+        return self._action_result(body, response_key)
+
+    def _resource_result(self, body, response_key=None, return_raw=False):
+        result = super(AsyncManagerMixin, self)._resource_result(
+            body, response_key, return_raw)
+        if isinstance(result, base.Resource):
+            result.set_loaded(True)
+        return result
+
+    async def get_many(self, ids, concurrency=10):
+        """Get several resources at once, with concurrent requests.
+
+        :param ids: IDs (or resources) to get.
+        :param concurrency: Maximum number of requests in flight.
+        :returns: A list in the same order as ``ids``. A resource that does
+                  not exist is represented by its ``NotFound`` exception
+                  instead of aborting the whole batch; any other error is
+                  raised and the remaining requests are cancelled.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _get_one(resource_id):
+            async with semaphore:
+                try:
+                    return await self.get(base.getid(resource_id))
+                except (exc.NotFound, exceptions.NotFound) as e:
+                    return e
+
+        tasks = [asyncio.ensure_future(_get_one(i)) for i in ids]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+
+
+class AsyncManagerWithFindMixin(AsyncManagerMixin):
+    """Asyncio version of :class:`sgsclient.base.ManagerWithFind`."""
+
+    async def update(self, *args, **kwargs):
+        # The managers return None without a request when there is nothing
+        # to update; keep the method awaitable in that case too.
+        result = super(AsyncManagerWithFindMixin, self).update(*args,
+                                                               **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def list_iter(self, page_size=None, marker=None, **kwargs):
+        """Asynchronously iterate over every item, one page at a time.
+
+        The request for the next page is sent before the items of the
+        current one are yielded, so it is already in flight while the
+        caller processes them.
+
+        :param page_size: Number of items to request per page; the server
+                          default page size is used if not given.
+        :param marker: Begin with the items that appear later in the list
+                       than the one represented by this id.
+        :param kwargs: Any other argument accepted by ``list``, such as
+                       ``detailed``, ``search_opts`` or ``sort``, except
+                       ``stream``.
+        """
+        self._check_not_streamed(kwargs)
+        next_page = asyncio.ensure_future(
+            self.list(marker=marker, limit=page_size, **kwargs))
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                if not page:
+                    return
+                next_marker = self._marker(page[-1])
+                if next_marker == marker:
+                    # The server ignored the marker and sent the same page
+                    # again; stop before yielding its items twice.
+                    return
+                marker = next_marker
+                next_page = asyncio.ensure_future(self.list(
+                    marker=marker, limit=page_size, **kwargs))
+                for item in page:
+                    yield item
+        finally:
+            # The caller stopped early: drop the page requested ahead.
+            if next_page is not None:
+                next_page.cancel()
+
+    async def list_columns(self, fields, page_size=None, as_tuples=False,
+                           **kwargs):
+        """Return only some fields of every item, without any resource.
+
+        See :meth:`sgsclient.base.ManagerWithFind.list_columns`.
+        """
+        add, result = self._columns(fields, as_tuples)
+        async for item in self.list_iter(page_size=page_size,
+                                         return_raw=True, **kwargs):
+            add(item)
+        return result
+
+    async def refresh(self, resources, search_opts=None, page_size=None):
+        """Update resources in place with their current state.
+
+        See :meth:`sgsclient.base.ManagerWithFind.refresh`.
+        """
+        resources = list(resources)
+        positions = self._refresh_positions(resources)
+        remaining = set(positions)
+        items = self.list_iter(page_size=page_size, detailed=True,
+                               search_opts=search_opts)
+        try:
+            async for item in items:
+                if item.id in remaining:
+                    self._apply_refresh(resources, positions[item.id], item)
+                    remaining.discard(item.id)
+                    if not remaining:
+                        break
+        finally:
+            await items.aclose()
+        missing = [r for r in positions if r in remaining]
+        for resource_id in missing:
+            self._invalidate(resource_id)
+        for resource_id, item in zip(missing, await self.get_many(missing)):
+            if isinstance(item, Exception):
+                raise item
+            self._apply_refresh(resources, positions[resource_id], item)
+        return resources
+
+    async def wait_for(self, resources, target_statuses=None,
+                       timeout=waiters.DEFAULT_TIMEOUT, status_attr='status',
+                       interval=1, max_interval=30, page_size=None,
+                       search_opts=None):
+        """Wait until resources reach one of the target statuses.
+
+        See :meth:`sgsclient.base.ManagerWithFind.wait_for`.
+        """
+        single = not isinstance(resources, (list, tuple, set))
+        current = [resources] if single else list(resources)
+        waiter = waiters.StatusWaiter([base.getid(r) for r in current],
+                                      target_statuses, timeout, status_attr,
+                                      interval, max_interval)
+        current = dict((base.getid(r), r) for r in current)
+        while True:
+            pending = [current[r] for r in waiter.pending]
+            current.update(zip(waiter.pending,
+                               await self.refresh(pending, search_opts,
+                                                  page_size)))
+            if waiter.update(current):
+                break
+            await asyncio.sleep(waiter.next_delay())
+        results = waiter.results()
+        return results[0] if single else results
+
+    async def load_index(self, page_size=None, **kwargs):
+        """Index the listing for :meth:`find` and :meth:`findall`.
+
+        See :meth:`sgsclient.base.ManagerWithFind.load_index`.
+        """
+        kwargs.setdefault('detailed', True)
+        kwargs.setdefault('search_opts', {'all_tenants': 1})
+        items = self.list_iter(page_size=page_size, **kwargs)
+        items = [item async for item in items]
+        index = resource_index.ResourceIndex(items, self.index_keys)
+        self.resource_index = index
+        return index
+
+    async def find(self, **kwargs):
+        """Find a single item with attributes matching ``**kwargs``.
+
+        See :meth:`sgsclient.base.ManagerWithFind.find`.
+        """
+        if self.resource_index is not None:
+            return self._single_match(self.resource_index.findall(**kwargs),
+                                      kwargs)
+        found = []
+        matches = self._iter_matches(kwargs)
+        try:
+            async for obj in matches:
+                found.append(obj)
+                if len(found) > 1:
+                    break
+        finally:
+            await matches.aclose()
+        return self._single_match(found, kwargs)
+
+    async def findall(self, **kwargs):
+        """Find all items with attributes matching ``**kwargs``.
+
+        See :meth:`sgsclient.base.ManagerWithFind.findall`.
+        """
+        if self.resource_index is not None:
+            return self.resource_index.findall(**kwargs)
+        return [obj async for obj in self._iter_matches(kwargs)]
+
+    async def _iter_matches(self, kwargs):
+        searches = list(kwargs.items())
+        items = self.list_iter(
+            detailed=True, search_opts=self._findall_search_opts(kwargs))
+        try:
+            async for obj in items:
+                if self._matches(obj, searches):
+                    yield obj
+        finally:
+            await items.aclose()
@@ -0,0 +1,268 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Non-blocking HTTP transport for the asyncio clients.
+
+This module requires Python 3.6 or later and aiohttp, which is installed
+with the ``aio`` extra: ``pip install sgservice-client[aio]``.
+"""
+
+import asyncio
+import ssl
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import importutils
+
+from sgsclient import client
+from sgsclient import exceptions as exc
+
+aiohttp = importutils.try_import('aiohttp')
+
+LOG = logging.getLogger(__name__)
+# Connections are cheap for an event loop, so allow many more requests in
+# flight than the threaded HTTPClient does.
+DEFAULT_POOL_MAXSIZE = 100
+
+
+class Response(object):
+    """A fully read aiohttp response.
+
+    It exposes the attributes of :class:`requests.Response` used by the
+    managers and exceptions, so responses of both transports can be handled
+    alike.
+    """
+
+    def __init__(self, status_code, reason, headers, content):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return jsonutils.loads(self.content)
+
+
+class StreamedResponse(Response):
+    """An aiohttp response whose body is read on demand.
+
+    It is returned by ``raw_request(..., stream=True)`` for successful
+    requests, and must be closed once the body has been read.
+    """
+
+    def __init__(self, resp):
+        super(StreamedResponse, self).__init__(resp.status, resp.reason,
+                                               resp.headers, None)
+        self._resp = resp
+
+    async def iter_content(self, chunk_size):
+        async for chunk in self._resp.content.iter_chunked(chunk_size):
+            yield chunk
+
+    def close(self):
+        self._resp.release()
+
+
+class AsyncHTTPClient(object):
+    """Send SG-Service requests on a shared non-blocking connection pool.
+
+    Either ``endpoint`` and ``token`` are given, or a keystone ``session``
+    (and optionally ``auth``) that the token and endpoint are looked up
+    from. The lookup uses the blocking keystone session, so it runs in the
+    default executor on the first request, and again when the service
+    rejects a token looked up from the session, such as an expired one.
+
+    :param endpoint: SG-Service endpoint URL.
+    :param token: Token for authentication.
+    :param session: A keystoneclient session to authenticate with.
+    :param auth: Auth plugin to use instead of the session's.
+    :param pool_maxsize: Maximum number of connections open at once; more
+                         requests than this wait for a free connection.
+    :param pool_maxsize_per_host: Maximum number of connections to one
+                                  host, 0 for no limit.
+    :param timeout: Total timeout of a request, in seconds.
+    :param compression: Ask for compressed responses. aiohttp negotiates
+                        the codings it can decode and decompresses the body
+                        as it is read.
+    """
+
+    def __init__(self, endpoint=None, token=None, session=None, auth=None,
+                 service_type='sg-service', endpoint_type='publicURL',
+                 region_name=None, project_id=None, auth_url=None,
+                 timeout=None, insecure=False, cacert=None, cert_file=None,
+                 key_file=None, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_maxsize_per_host=0, compression=True, **kwargs):
+        if aiohttp is None:
+            raise ImportError("The asyncio client requires aiohttp, which is "
+                              "installed with sgservice-client[aio].")
+        self.endpoint = endpoint
+        self.auth_token = token
+        self.keystone_session = session
+        self.auth = auth
+        self.service_type = service_type
+        self.endpoint_type = endpoint_type
+        self.region_name = region_name
+        self.project_id = project_id
+        self.auth_url = auth_url
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.compression = compression
+
+        self.ssl_context = None
+        if insecure:
+            self.ssl_context = False
+        elif cacert or cert_file:
+            self.ssl_context = ssl.create_default_context(cafile=cacert)
+            if cert_file:
+                self.ssl_context.load_cert_chain(cert_file, key_file)
+
+        self._session = None
+        self._auth_lock = None
+        # Only tokens looked up from the session can be renewed.
+        self._token_from_session = False
+
+    async def _get_session(self):
+        # aiohttp sessions are bound to the running loop, so the pool is
+        # created on first use rather than in the constructor.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                limit_per_host=self.pool_maxsize_per_host,
+                ssl=self.ssl_context)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=timeout)
+        return self._session
+
+    async def _authenticate(self):
+        if self.auth_token and self.endpoint:
+            return
+        if self.keystone_session is None:
+            raise exc.EndpointException(
+                "An endpoint and token, or a keystone session, are needed")
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self.auth_token and self.endpoint:
+                return
+            loop = asyncio.get_event_loop()
+            if not self.auth_token:
+                self.auth_token = await loop.run_in_executor(
+                    None, self.keystone_session.get_token, self.auth)
+                self._token_from_session = True
+            if not self.endpoint:
+                self.endpoint = await loop.run_in_executor(
+                    None, lambda: self.keystone_session.get_endpoint(
+                        self.auth, service_type=self.service_type,
+                        interface=self.endpoint_type,
+                        region_name=self.region_name))
+            if not self.project_id:
+                self.project_id = await loop.run_in_executor(
+                    None, self.keystone_session.get_project_id, self.auth)
+
+    async def _reauthenticate(self, stale_token):
+        """Look a new token up after the service rejected stale_token."""
+        async with self._auth_lock:
+            # Requests rejected together only renew the token once.
+            if self.auth_token == stale_token:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(
+                    None, self.keystone_session.invalidate, self.auth)
+                self.auth_token = None
+        await self._authenticate()
+
+    async def _http_request(self, url, method, reauthenticated=False,
+                            **kwargs):
+        await self._authenticate()
+        request_headers = kwargs.pop('headers', None) or {}
+        headers = dict(request_headers)
+        headers.setdefault('User-Agent', client.USER_AGENT)
+        token = self.auth_token
+        headers.setdefault('X-Auth-Token', token)
+        if not self.compression:
+            headers.setdefault('Accept-Encoding', 'identity')
+        if self.auth_url:
+            headers.setdefault('X-Auth-Url', self.auth_url)
+        if self.region_name:
+            headers.setdefault('X-Region-Name', self.region_name)
+        follow_redirects = kwargs.pop('follow_redirects', True)
+        stream = kwargs.pop('stream', False)
+
+        session = await self._get_session()
+        try:
+            resp = await session.request(method, self.endpoint + url,
+                                         headers=headers,
+                                         allow_redirects=False, **kwargs)
+        except aiohttp.ClientConnectorError as e:
+            message = ("Error communicating with %(endpoint)s %(e)s" %
+                       {'endpoint': self.endpoint, 'e': e})
+            raise exc.ConnectionRefused(message)
+        if stream and 200 <= resp.status < 300:
+            LOG.debug("%s %s%s returned %s", method, self.endpoint, url,
+                      resp.status)
+            return StreamedResponse(resp)
+        try:
+            content = await resp.read()
+        finally:
+            resp.release()
+        resp = Response(resp.status, resp.reason, resp.headers, content)
+        LOG.debug("%s %s%s returned %s", method, self.endpoint, url,
+                  resp.status_code)
+
+        if (resp.status_code == 401 and self._token_from_session and
+                not reauthenticated and 'X-Auth-Token' not in request_headers):
+            await self._reauthenticate(token)
+            return await self._http_request(
+                url, method, reauthenticated=True, headers=request_headers,
+                follow_redirects=follow_redirects, stream=stream, **kwargs)
+        elif resp.status_code == 401:
+            raise exc.AuthorizationFailure("Authentication failed. Please try"
+                                           " again.\n%s" % resp.content)
+        elif 400 <= resp.status_code < 600 or resp.status_code == 300:
+            raise exc.from_response(resp, client._decode_body(resp))
+        elif resp.status_code in (301, 302, 305) and follow_redirects:
+            location = resp.headers.get('location')
+            if location is None or not location.startswith(self.endpoint):
+                raise exc.EndpointException(
+                    "Prohibited endpoint redirect %s" % location)
+            kwargs['headers'] = headers
+            kwargs['stream'] = stream
+            return await self._http_request(location[len(self.endpoint):],
+                                            method, **kwargs)
+        return resp
+
+    async def json_request(self, method, url, content_type='application/json',
+                           **kwargs):
+        kwargs.setdefault('headers', {})
+        kwargs['headers'].setdefault('Content-Type', content_type)
+        if 'data' in kwargs:
+            kwargs['data'] = jsonutils.dumps(kwargs['data'])
+
+        resp = await self._http_request(url, method, **kwargs)
+        body = client._decode_body(resp)
+        if body is None:
+            body = resp.text
+        return resp, body
+
+    async def raw_request(self, method, url, **kwargs):
+        return await self._http_request(url, method, **kwargs)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,112 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+On-disk cache of Keystone results for the sgs command line.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import encodeutils
+from oslo_utils import timeutils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.sgsclient', 'cache')
+# Tokens that expire within this many seconds are not reused.
+EXPIRY_WINDOW = 60
+
+
+class AuthCache(object):
+    """Discovered auth versions, token and endpoint of one identity.
+
+    Each identity, made of the auth URL, user, password, project, region
+    and the endpoint that was looked up, is stored in its own JSON file
+    named after a hash of those values; the values themselves, and the
+    password in particular, are not written. The directory is only
+    accessible by the current user and the files are created with mode
+    0600, since they hold a valid token.
+
+    :param key_parts: Values identifying the cached identity.
+    :param cache_dir: Directory holding the cache files.
+    """
+
+    def __init__(self, key_parts, cache_dir=None):
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        key = '\0'.join(encodeutils.safe_decode(str(p or ''))
+                        for p in key_parts)
+        digest = hashlib.sha256(encodeutils.safe_encode(key)).hexdigest()
+        self.path = os.path.join(self.cache_dir, '%s.json' % digest)
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = jsonutils.loads(f.read())
+            except (IOError, OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    @property
+    def auth_versions(self):
+        versions = self._load().get('auth_versions')
+        return tuple(versions) if versions else None
+
+    @property
+    def endpoint(self):
+        return self._load().get('endpoint')
+
+    @property
+    def token(self):
+        """The cached token, or None if it is missing or about to expire."""
+        data = self._load()
+        token = data.get('token')
+        expires_at = data.get('expires_at')
+        if not token or not expires_at:
+            return None
+        try:
+            expires_at = timeutils.parse_isotime(expires_at)
+        except ValueError:
+            return None
+        if timeutils.is_soon(expires_at, EXPIRY_WINDOW):
+            return None
+        return token
+
+    def save(self, auth_versions=None, token=None, expires_at=None,
+             endpoint=None):
+        data = {'auth_versions': auth_versions,
+                'token': token,
+                'expires_at': expires_at and expires_at.isoformat(),
+                'endpoint': endpoint}
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'w') as f:
+                f.write(jsonutils.dumps(data))
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            LOG.debug("Unable to write auth cache %s: %s", self.path, e)
+            return
+        self._data = data
+
+    def clear(self):
+        self._data = {}
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
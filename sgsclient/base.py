@@ -15,18 +15,35 @@ Base utilities to build API operation managers and objects on top of.
 """
 
 import abc
+import collections
 import copy
+import re
+import time
 
 import six
 from six.moves.urllib import parse
 
 from sgsclient import client
+from sgsclient import exceptions as exc
+from sgsclient import jsonstream
 from sgsclient.openstack.common.apiclient import base as common_base
 from sgsclient.openstack.common.apiclient import exceptions
+from sgsclient import resource_cache
+from sgsclient import resource_index
+from sgsclient import retry
+from sgsclient import utils
+from sgsclient import waiters
 
 SORT_DIR_VALUES = ('asc', 'desc')
 SORT_KEY_VALUES = ('id', 'status', 'name', 'created_at')
 SORT_KEY_MAPPINGS = {}
+# Number of GET responses whose validators a manager remembers.
+VALIDATOR_CACHE_SIZE = 64
+# Compact resource classes by resource class and field names; the items
+# of a listing nearly always have the same fields, so there are few.
+_SHAPES = {}
+MAX_SHAPES = 1024
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
 
 
 def getid(obj):
@@ -45,23 +62,123 @@ class Manager(common_base.HookableMixin):
     """Managers interact with a particular type of API (servers, flavors,
 
     images, etc.) and provide CRUD operations for them.
+
+    :param api: The HTTP client to send requests with.
+    :param cache: A :class:`sgsclient.resource_cache.ResourceCache` that
+                  ``get()`` is served from; None disables caching.
+    :param conditional_get: Remember the ETag and Last-Modified validators
+                            of GET responses and revalidate them with
+                            If-None-Match and If-Modified-Since, reusing
+                            the previous body on 304 Not Modified.
     """
     resource_class = None
+    # Read-only resource built by listings with compact=True.
+    compact_resource_class = None
 
-    def __init__(self, api):
+    def __init__(self, api, cache=None, conditional_get=False):
         self.api = api
+        self.cache = cache
+        self.validators = None
+        if conditional_get:
+            self.validators = resource_cache.ResourceCache(
+                ttl=float('inf'), max_size=VALIDATOR_CACHE_SIZE)
+        self._project_id = None
+
+    @property
+    def project_id(self):
+        """Project of the client, looked up on first use.
+
+        Building a manager does no I/O: a session client only resolves its
+        project, which may need authenticating, when it is first read, and
+        then shares it with all the managers of the client.
+        """
+        if self._project_id is not None:
+            return self._project_id
         if isinstance(self.api, client.SessionClient):
-            self.project_id = self.api.get_project_id()
-        else:
-            self.project_id = self.api.project_id
+            return self.api.get_project_id()
+        return self.api.project_id
+
+    @project_id.setter
+    def project_id(self, value):
+        self._project_id = value
 
     def _list(self, url, response_key=None, obj_class=None,
-              data=None, headers=None, return_raw=False,):
+              data=None, headers=None, return_raw=False, stream=False,
+              compact=False):
 
         if headers is None:
             headers = {}
+        if compact and obj_class is None:
+            obj_class = self.compact_resource_class or CompactResource
+        if stream:
+            return self._stream_list(url, response_key, obj_class, headers,
+                                     return_raw)
+        body = self._conditional_get(url, headers)
+        return self._list_result(body, response_key, obj_class, return_raw)
+
+    def _stream_list(self, url, response_key=None, obj_class=None,
+                     headers=None, return_raw=False):
+        """Yield the resources of a listing while its body is read.
+
+        The items are decoded one at a time from the response stream, so
+        neither the body nor the whole listing is ever held in memory.
+        Streamed listings are not revalidated with conditional GETs, since
+        that would require keeping the previous body.
+        """
+        if obj_class is None:
+            obj_class = self.resource_class
+        resp = self.api.raw_request('GET', url, headers=headers or {},
+                                    stream=True)
+        try:
+            for res in jsonstream.iter_items(
+                    resp.iter_content(client.CHUNKSIZE), response_key):
+                if return_raw:
+                    yield res
+                elif res:
+                    yield obj_class(self, res, loaded=True)
+        finally:
+            resp.close()
+
+    def _conditional_get(self, url, headers):
+        """GET url, revalidating the previous response when there is one."""
+        key, previous, headers = self._revalidation_headers(url, headers)
         resp, body = self.api.json_request('GET', url, headers=headers)
+        return self._revalidated_body(key, previous, resp, body)
+
+    def _revalidation_headers(self, url, headers):
+        if self.validators is None:
+            return None, None, headers
+        key = (url, tuple(sorted(headers.items())))
+        previous = self.validators.get(key)
+        if previous is not None:
+            etag, last_modified, body = previous
+            headers = dict(headers)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return key, previous, headers
+
+    def _revalidated_body(self, key, previous, resp, body):
+        if key is None:
+            return body
+        # The body is copied, like the cached ones, since the resources
+        # built from it may change it.
+        if resp.status_code == 304 and previous is not None:
+            # Not modified: the body decoded last time is still current.
+            return copy.deepcopy(previous[2])
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.validators.set(key, (etag, last_modified,
+                                      copy.deepcopy(body)))
+        else:
+            self.validators.invalidate(key)
+        return body
 
+    def _list_result(self, body, response_key=None, obj_class=None,
+                     return_raw=False):
+        """Build the resources of a decoded list response body."""
         if obj_class is None:
             obj_class = self.resource_class
 
@@ -75,22 +192,79 @@ class Manager(common_base.HookableMixin):
             return data
         return [obj_class(self, res, loaded=True) for res in data if res]
 
+    def _resource_result(self, body, response_key=None, return_raw=False):
+        """Build the resource of a decoded single item response body."""
+        if return_raw:
+            if response_key:
+                return body[response_key]
+            return body
+        if response_key:
+            return self.resource_class(self, body[response_key])
+        return self.resource_class(self, body)
+
+    def _action_result(self, body, response_key=None):
+        """Build the resource returned by an action, if any."""
+        if (body is not None and
+                response_key is not None and isinstance(body, dict)):
+            return self._resource_result(body, response_key)
+
+    def _cache_key(self, resource_id):
+        # Clients of other tenants may share the cache, and must not be
+        # served what the service only showed to this one.
+        api = self.api
+        endpoint = (getattr(api, 'endpoint_url', None) or
+                    getattr(api, 'endpoint_override', None) or
+                    getattr(api, 'endpoint', None))
+        return (endpoint, self.project_id, self.resource_class.__name__,
+                resource_id)
+
+    @staticmethod
+    def _url_resource_id(url):
+        """ID of the resource a resource or action URL refers to."""
+        path = url.split('?', 1)[0].rstrip('/').split('/')
+        if path[-1] == 'action':
+            path.pop()
+        return path[-1]
+
+    def _cached_body(self, url, headers):
+        """Return the cached GET response body of url, if any."""
+        # Requests with extra headers, like a configuration session, may
+        # get a different answer and are not cached.
+        if self.cache is None or headers:
+            return None
+        body = self.cache.get(self._cache_key(self._url_resource_id(url)))
+        return copy.deepcopy(body)
+
+    def _cache_body(self, url, headers, body):
+        if self.cache is not None and not headers and body:
+            self.cache.set(self._cache_key(self._url_resource_id(url)),
+                           copy.deepcopy(body))
+
+    def _invalidate(self, resource_id):
+        """Drop a resource changed by a request from the cache."""
+        if self.cache is not None and resource_id is not None:
+            self.cache.invalidate(self._cache_key(resource_id))
+
     def _delete(self, url, headers=None):
         if headers is None:
             headers = {}
-        resp = self.api.raw_request('DELETE', url, headers=headers)
+        try:
+            resp = self.api.raw_request('DELETE', url, headers=headers)
+        finally:
+            self._invalidate(self._url_resource_id(url))
         return common_base.TupleWithMeta((resp, None), resp)
 
     def _update(self, url, data, response_key=None, headers=None):
         if headers is None:
             headers = {}
-        resp, body = self.api.json_request('PUT', url, data=data,
-                                           headers=headers)
+        try:
+            resp, body = self.api.json_request('PUT', url, data=data,
+                                               headers=headers)
+        finally:
+            self._invalidate(self._url_resource_id(url))
         # PUT requests may not return a body
         if body:
-            if response_key:
-                return self.resource_class(self, body[response_key])
-            return self.resource_class(self, body)
+            return self._resource_result(body, response_key)
 
     def _create(self, url, data=None, response_key=None,
                 return_raw=False, headers=None):
@@ -101,33 +275,64 @@ class Manager(common_base.HookableMixin):
                                                data=data, headers=headers)
         else:
             resp, body = self.api.json_request('POST', url, headers=headers)
-        if return_raw:
-            if response_key:
-                return body[response_key]
-            return body
-        if response_key:
-            return self.resource_class(self, body[response_key])
-        return self.resource_class(self, body)
+        result = self._resource_result(body, response_key, return_raw)
+        self._invalidate(self._created_id(result))
+        return result
+
+    @staticmethod
+    def _created_id(result):
+        if isinstance(result, Resource):
+            result = result._info
+        if isinstance(result, dict):
+            return result.get('id')
 
     def _get(self, url, response_key=None, return_raw=False, headers=None):
         if headers is None:
             headers = {}
-        resp, body = self.api.json_request('GET', url, headers=headers)
-        if return_raw:
-            if response_key:
-                return body[response_key]
-            return body
-        if response_key:
-            return self.resource_class(self, body[response_key])
-        return self.resource_class(self, body)
+        body = self._cached_body(url, headers)
+        if body is None:
+            body = self._conditional_get(url, headers)
+            self._cache_body(url, headers, body)
+        return self._resource_result(body, response_key, return_raw)
+
+    def _retry_options(self, action):
+        """Request options retrying the action, if the policy allows it."""
+        policy = getattr(self.api, 'retry_policy', None)
+        if (isinstance(policy, retry.RetryPolicy) and
+                policy.retries_action(action)):
+            return {'retry': True}
+        return {}
 
     def _action(self, action, url, action_data=None, response_key=None):
         data = {action: action_data}
-        resp, body = self.api.json_request('POST', url, data=data)
+        try:
+            resp, body = self.api.json_request('POST', url, data=data,
+                                               **self._retry_options(action))
+        finally:
+            self._invalidate(self._url_resource_id(url))
+        return self._action_result(body, response_key)
+
+    def get_many(self, ids, concurrency=10):
+        """Get several resources at once, fanning the GETs out over threads.
+
+        All requests go through this manager's HTTP client, so its
+        connection pool should allow at least ``concurrency`` connections
+        per host.
+
+        :param ids: IDs (or resources) to get.
+        :param concurrency: Maximum number of requests in flight.
+        :returns: A list in the same order as ``ids``. A resource that does
+                  not exist is represented by its ``NotFound`` exception
+                  instead of aborting the whole batch; any other error is
+                  raised.
+        """
+        def _get_one(resource_id):
+            try:
+                return self.get(getid(resource_id))
+            except (exc.NotFound, exceptions.NotFound) as e:
+                return e
 
-        if (body is not None and
-                response_key is not None and isinstance(body, dict)):
-            return self.resource_class(self, body[response_key])
+        return utils.parallel_map(_get_one, ids, concurrency=concurrency)
 
     def _build_list_url(self, resource_type, detailed=False,
                         search_opts=None, marker=None, limit=None,
@@ -244,19 +449,264 @@ class Manager(common_base.HookableMixin):
 @six.add_metaclass(abc.ABCMeta)
 class ManagerWithFind(Manager):
     """Manager with additional `find()`/`findall()` methods."""
+    # Search options of the list API that findall() passes to the server.
+    filter_keys = ('name', 'display_name', 'status', 'project_id')
+    # Attributes indexed by load_index().
+    index_keys = resource_index.DEFAULT_KEYS
+    # The ResourceIndex find() and findall() answer from, if loaded.
+    resource_index = None
 
     @abc.abstractmethod
     def list(self):
         pass
 
+    def _list_pages(self, page_size=None, marker=None, **kwargs):
+        """Yield successive pages of :meth:`list`, following markers."""
+        while True:
+            page = self.list(marker=marker, limit=page_size, **kwargs)
+            if not page:
+                return
+            next_marker = self._marker(page[-1])
+            if next_marker == marker:
+                # The server ignored the marker and sent the same page
+                # again; stop before yielding its items twice.
+                return
+            yield page
+            marker = next_marker
+
+    @staticmethod
+    def _check_not_streamed(kwargs):
+        if kwargs.get('stream'):
+            raise ValueError('stream is not supported when iterating over '
+                             'pages of a listing.')
+
+    @staticmethod
+    def _marker(item):
+        """ID of a listed resource, or of a raw item."""
+        if isinstance(item, dict):
+            return item.get('id')
+        return getid(item)
+
+    def list_iter(self, page_size=None, marker=None, prefetch=0, **kwargs):
+        """Lazily iterate over every item, one page at a time.
+
+        Markers are followed until the server runs out of items, and each
+        resource is yielded as soon as its page arrives, so only one page
+        is held in memory at a time.
+
+        With ``prefetch`` set, the following pages are fetched by a
+        background worker while the caller processes the current one.
+
+        :param page_size: Number of items to request per page; the server
+                          default page size is used if not given.
+        :param marker: Begin with the items that appear later in the list
+                       than the one represented by this id.
+        :param prefetch: Maximum number of pages to read ahead of the
+                         caller; 0 disables read-ahead.
+        :param kwargs: Any other argument accepted by :meth:`list`, such as
+                       ``detailed``, ``search_opts`` or ``sort``, except
+                       ``stream``: the pages are already read one at a
+                       time, and the marker of the next one is only known
+                       once the current one is complete.
+        """
+        self._check_not_streamed(kwargs)
+        pages = self._list_pages(page_size, marker, **kwargs)
+        if prefetch:
+            pages = utils.prefetch(pages, depth=prefetch)
+        for page in pages:
+            for item in page:
+                yield item
+
+    def list_columns(self, fields, page_size=None, as_tuples=False,
+                     **kwargs):
+        """Return only some fields of every item, without any resource.
+
+        The listing is read page by page as raw dictionaries, and only the
+        values of ``fields`` are kept, which saves the construction of a
+        resource per item in reports over large listings::
+
+            columns = cs.volumes.list_columns(['id', 'status'],
+                                              detailed=True)
+            enabled = columns['status'].count('enabled')
+
+        :param fields: Names of the fields to return. A field an item does
+                       not have is None.
+        :param page_size: Number of items to request per page; the server
+                          default page size is used if not given.
+        :param as_tuples: Return one named tuple per item instead of one
+                          list per field.
+        :param kwargs: Any other argument accepted by :meth:`list_iter`.
+        :returns: An ordered dictionary of the list of values of each
+                  field, or a list of named tuples.
+        """
+        add, result = self._columns(fields, as_tuples)
+        for item in self.list_iter(page_size=page_size, return_raw=True,
+                                   **kwargs):
+            add(item)
+        return result
+
+    def _columns(self, fields, as_tuples):
+        """Return a function recording an item, and what it records in."""
+        fields = list(fields)
+        if as_tuples:
+            # Fields that are not valid tuple field names, such as
+            # 'os-vol-host-attr:host', are renamed to their position.
+            row = collections.namedtuple(
+                self.resource_class.__name__ + 'Row', fields, rename=True)
+            rows = []
+
+            def add(item):
+                rows.append(row._make([item.get(f) for f in fields]))
+            return add, rows
+
+        columns = collections.OrderedDict((f, []) for f in fields)
+        appends = [(f, columns[f].append) for f in columns]
+
+        def add(item):
+            for field, append in appends:
+                append(item.get(field))
+        return add, columns
+
+    def refresh(self, resources, search_opts=None, page_size=None):
+        """Update resources in place with their current state.
+
+        The state is read from the detailed list, page by page, until every
+        resource has been seen, so the number of requests grows with the
+        number of pages rather than of resources. Resources that are not
+        in the listing, for example those of another project when
+        ``search_opts`` does not ask for all tenants, are fetched one by one.
+
+        :param resources: Resources to refresh. IDs may be given instead,
+                          in which case new resources are returned for them.
+        :param search_opts: Search options narrowing the listing, such as
+                            ``{'status': 'enabling'}``.
+        :param page_size: Number of items to request per list call.
+        :returns: The refreshed resources, in the order they were given.
+        """
+        resources = list(resources)
+        positions = self._refresh_positions(resources)
+        remaining = set(positions)
+        for item in self.list_iter(page_size=page_size, detailed=True,
+                                   search_opts=search_opts):
+            if item.id in remaining:
+                self._apply_refresh(resources, positions[item.id], item)
+                remaining.discard(item.id)
+                if not remaining:
+                    break
+        missing = [r for r in positions if r in remaining]
+        for resource_id in missing:
+            # Waiters poll with refresh, so it must not read cached bodies.
+            self._invalidate(resource_id)
+        for resource_id, item in zip(missing, self.get_many(missing)):
+            if isinstance(item, Exception):
+                raise item
+            self._apply_refresh(resources, positions[resource_id], item)
+        return resources
+
+    @staticmethod
+    def _refresh_positions(resources):
+        """Map the ID of each resource to its indexes in resources."""
+        positions = collections.OrderedDict()
+        for index, resource in enumerate(resources):
+            positions.setdefault(getid(resource), []).append(index)
+        return positions
+
+    @staticmethod
+    def _apply_refresh(resources, indexes, item):
+        for index in indexes:
+            resource = resources[index]
+            if isinstance(resource, Resource):
+                resource._info = item._info
+                resource._add_details(item._info)
+                resource.set_loaded(True)
+            else:
+                resources[index] = item
+
+    def wait_for(self, resources, target_statuses=None,
+                 timeout=waiters.DEFAULT_TIMEOUT, status_attr='status',
+                 interval=1, max_interval=30, page_size=None,
+                 search_opts=None):
+        """Wait until resources reach one of the target statuses.
+
+        All pending resources are polled together with :meth:`refresh`,
+        with an exponentially growing delay between polls. Resources that
+        are given as objects are updated in place.
+
+        :param resources: A resource or ID, or a list of them.
+        :param target_statuses: Statuses to wait for. By default, any status
+                                that is not transitional, such as
+                                ``enabled`` after ``enabling``.
+        :param timeout: Seconds to wait before raising
+                        :class:`sgsclient.exceptions.WaitTimeout`.
+        :param status_attr: Resource attribute holding the status, for
+                            example ``replicate_status`` for volumes.
+        :param interval: First delay between two polls, in seconds.
+        :param max_interval: Upper bound of the delay between two polls.
+        :param page_size: Number of items to request per list call.
+        :param search_opts: Search options restricting the listing, such
+                            as ``{'all_tenants': 1}``.
+        :returns: The resource, or list of resources, in its final state.
+        :raises ResourceInErrorState: if a resource goes into an error
+                                      status that is not a target.
+        """
+        single = not isinstance(resources, (list, tuple, set))
+        current = [resources] if single else list(resources)
+        waiter = waiters.StatusWaiter([getid(r) for r in current],
+                                      target_statuses, timeout, status_attr,
+                                      interval, max_interval)
+        current = dict((getid(r), r) for r in current)
+        while True:
+            pending = [current[r] for r in waiter.pending]
+            current.update(zip(waiter.pending,
+                               self.refresh(pending, search_opts,
+                                            page_size)))
+            if waiter.update(current):
+                break
+            time.sleep(waiter.next_delay())
+        results = waiter.results()
+        return results[0] if single else results
+
+    def load_index(self, page_size=None, **kwargs):
+        """Index the listing for :meth:`find` and :meth:`findall`.
+
+        The detailed listing of all tenants is read once into a
+        :class:`sgsclient.resource_index.ResourceIndex` on
+        :attr:`index_keys`, and later searches are answered from it
+        without any request. Call it again to reload the index, or keep
+        it current with its ``update`` and ``discard`` methods; set
+        :attr:`resource_index` to None to search the server again.
+
+        :param page_size: Number of items to request per list call.
+        :param kwargs: Any other argument accepted by :meth:`list`, such as
+                       ``search_opts``.
+        :returns: The index.
+        """
+        kwargs.setdefault('detailed', True)
+        kwargs.setdefault('search_opts', {'all_tenants': 1})
+        index = resource_index.ResourceIndex(
+            self.list_iter(page_size=page_size, **kwargs), self.index_keys)
+        self.resource_index = index
+        return index
+
     def find(self, **kwargs):
         """Find a single item with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
+        The listing is searched as in :meth:`findall`, and stops as soon as
+        a second match shows the item is not unique. The match is returned
+        as listed, in detail, without getting it again.
         """
-        rl = self.findall(**kwargs)
-        num = len(rl)
+        if self.resource_index is not None:
+            return self._single_match(self.resource_index.findall(**kwargs),
+                                      kwargs)
+        found = []
+        for obj in self._iter_matches(kwargs):
+            found.append(obj)
+            if len(found) > 1:
+                break
+        return self._single_match(found, kwargs)
+
+    def _single_match(self, found, kwargs):
+        num = len(found)
 
         if num == 0:
             msg = "No %s matching %s." % (self.resource_class.__name__, kwargs)
@@ -264,41 +714,51 @@ class ManagerWithFind(Manager):
         elif num > 1:
             raise exceptions.NoUniqueMatch
         else:
-            return self.get(rl[0].id)
+            return found[0]
 
     def findall(self, **kwargs):
         """Find all items with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
-        """
+        The attributes in :attr:`filter_keys` are passed to the server as
+        search options, so only the items matching them are listed. The
+        detailed listing is then read page by page, and checked against
+        every attribute on the Python side.
 
+        Once :meth:`load_index` has been called, the index is searched
+        instead of the server.
+        """
+        if self.resource_index is not None:
+            return self.resource_index.findall(**kwargs)
+        return list(self._iter_matches(kwargs))
+
+    def _iter_matches(self, kwargs):
+        searches = list(kwargs.items())
+        for obj in self.list_iter(
+                detailed=True, search_opts=self._findall_search_opts(kwargs)):
+            if self._matches(obj, searches):
+                yield obj
+
+    def _findall_search_opts(self, kwargs):
         # Want to search for all tenants here so that when attempting to delete
         # that a user like admin doesn't get a failure when trying to delete
         # another tenant's volume by name.
         search_opts = {'all_tenants': 1}
 
-        # Pass 'name' or 'display_name' search_opts to server filtering to
-        # increase search performance.
-        if 'name' in kwargs:
-            search_opts['name'] = kwargs['name']
-        elif 'display_name' in kwargs:
-            search_opts['display_name'] = kwargs['display_name']
-
-        listing = self.list(search_opts=search_opts)
-
-        found = []
-        searches = kwargs.items()
-
-        for obj in listing:
-            try:
-                if all(getattr(obj, attr) == value
-                       for (attr, value) in searches):
-                    found.append(obj)
-            except AttributeError:
-                continue
-
-        return found
+        # Pass the attributes the list API can filter on to the server, to
+        # increase search performance. The results are still checked, since
+        # the server may match more loosely, for example ignoring case.
+        for key in self.filter_keys:
+            if isinstance(kwargs.get(key), six.string_types):
+                search_opts[key] = kwargs[key]
+        return search_opts
+
+    @staticmethod
+    def _matches(obj, searches):
+        try:
+            return all(getattr(obj, attr) == value
+                       for (attr, value) in searches)
+        except AttributeError:
+            return False
 
 
 class Resource(object):
@@ -366,3 +826,133 @@ class Resource(object):
 
     def to_dict(self):
         return copy.deepcopy(self._info)
+
+
+class CompactResource(object):
+    """A read-only resource taking as little memory as possible.
+
+    Listings return these with ``compact=True``. Resources with the same
+    fields share a subclass, created on first use, that has one slot per
+    field: the class is the schema, and each resource only holds its
+    values, without an attribute dictionary or the response dict. Fields
+    that cannot be slots, such as ``os-vol-host-attr:host``, are kept in a
+    dictionary and are still readable with :func:`getattr`.
+
+    Compact resources are always considered loaded; use
+    :meth:`to_resource` to get a full, modifiable :class:`Resource`.
+
+    :param manager: Manager object
+    :param info: dictionary representing resource attributes
+    :param loaded: ignored, for compatibility with :class:`Resource`
+    """
+    __slots__ = ('manager', '_extra')
+    # Set on the subclasses of each shape.
+    _declared = None
+    _fields = ()
+    _setters = ()
+
+    def __new__(cls, manager, info, loaded=True):
+        return object.__new__(cls._shape(tuple(info)))
+
+    def __init__(self, manager, info, loaded=True):
+        self.manager = manager
+        self._extra = None
+        if self._fields is None:
+            self._extra = dict(info)
+        elif None not in self._setters:
+            for setter, value in zip(self._setters, info.values()):
+                setter(self, value)
+        else:
+            self._extra = {}
+            for setter, (name, value) in zip(self._setters, info.items()):
+                if setter is None:
+                    self._extra[name] = value
+                else:
+                    setter(self, value)
+
+    @classmethod
+    def _shape(cls, fields):
+        declared = cls._declared or cls
+        key = declared, fields
+        shape = _SHAPES.get(key)
+        if shape is None:
+            if len(_SHAPES) >= MAX_SHAPES:
+                # Too many different shapes: keep the fields of new ones in
+                # the dictionary rather than creating a class per resource.
+                key = declared, None
+                shape = _SHAPES.get(key)
+            if shape is None:
+                shape = _SHAPES.setdefault(key, cls._make_shape(declared,
+                                                                fields))
+        return shape
+
+    @staticmethod
+    def _make_shape(declared, fields):
+        slots = tuple(name for name in fields or ()
+                      if _IDENTIFIER.match(name) and
+                      not hasattr(declared, name))
+        shape = type(declared.__name__, (declared,),
+                     {'__slots__': slots,
+                      '__module__': declared.__module__,
+                      '_declared': declared,
+                      '_fields': fields})
+        if fields is not None:
+            shape._setters = tuple(
+                shape.__dict__[name].__set__ if name in slots else None
+                for name in fields)
+        return shape
+
+    def __getattr__(self, k):
+        # Only called for names that are not slots of the shape.
+        if k in CompactResource.__slots__:
+            raise AttributeError(k)
+        if self._extra is None or k not in self._extra:
+            raise AttributeError(k)
+        return self._extra[k]
+
+    def __reduce__(self):
+        # The shapes are not importable; rebuild through the declared class.
+        return self._declared or type(self), (self.manager, self.to_dict())
+
+    def __dir__(self):
+        return sorted(set(dir(type(self))) | set(self._extra or ()))
+
+    @property
+    def _info(self):
+        return self.to_dict()
+
+    def __repr__(self):
+        info = ", ".join("%s=%s" % item for item in
+                         sorted(self.to_dict().items()))
+        return "<%s %s>" % (self.__class__.__name__, info)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactResource):
+            return False
+        return (self._declared is other._declared and
+                self.to_dict() == other.to_dict())
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def is_loaded(self):
+        return True
+
+    def to_dict(self):
+        """Return the fields as a new dictionary.
+
+        Unlike :meth:`Resource.to_dict`, nested values are not copied.
+        """
+        extra = self._extra or {}
+        if self._fields is None:
+            return dict(extra)
+        return dict((name, extra[name] if setter is None
+                     else getattr(self, name))
+                    for name, setter in zip(self._fields, self._setters))
+
+    def to_resource(self):
+        """Return the full :class:`Resource` with the same fields."""
+        return self.manager.resource_class(self.manager, self.to_dict(),
+                                           loaded=True)
@@ -13,7 +13,10 @@
 import copy
 import hashlib
 import os
+import random
 import socket
+import threading
+import time
 
 import keystoneclient.adapter as keystone_adapter
 from oslo_log import log as logging
@@ -22,23 +25,170 @@ from oslo_utils import encodeutils
 from oslo_utils import importutils
 import requests
 import six
+from six.moves import http_cookiejar
 from six.moves import urllib
 
 from sgsclient import exceptions as exc
+from sgsclient import resource_cache
 
 LOG = logging.getLogger(__name__)
 USER_AGENT = 'sgservice-client'
 CHUNKSIZE = 1024 * 64  # 64kB
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def _accept_encoding():
+    """Content codings the requests stack is able to decode.
+
+    urllib3 lists gzip and deflate, plus br and zstd when the brotli or
+    zstandard modules are installed.
+    """
+    try:
+        from urllib3.util import request as urllib3_request
+        codings = urllib3_request.ACCEPT_ENCODING.split(',')
+    except (ImportError, AttributeError):
+        codings = ['gzip', 'deflate']
+    return ', '.join(c.strip() for c in codings)
+
+
+# Responses are decompressed by urllib3 one chunk at a time as the body is
+# read, so the whole compressed body is never held next to the decoded one.
+ACCEPT_ENCODING = _accept_encoding()
+
+
+# Client classes by API version, so the module is only imported once.
+_CLIENT_CLASSES = {}
+
+
+def _client_class(version):
+    client_class = _CLIENT_CLASSES.get(str(version))
+    if client_class is None:
+        module = importutils.import_versioned_module(
+            'sgsclient', version, 'client'
+        )
+        client_class = _CLIENT_CLASSES.setdefault(str(version),
+                                                  getattr(module, 'Client'))
+    return client_class
 
 
 def Client(version, *args, **kwargs):
-    module = importutils.import_versioned_module(
-        'sgsclient', version, 'client'
-    )
-    client_class = getattr(module, 'Client')
+    client_class = _client_class(version)
     return client_class(*args, **kwargs)
 
 
+class ClientFactory(object):
+    """Build many clients that share their connections and lookups.
+
+    Services creating a client per request, for many tenants, pay for the
+    construction of a transport, a connection pool and a catalog lookup
+    each time. Clients built by a factory instead share:
+
+    * the connection pool of the token clients, so connections to the
+      endpoint are reused across clients;
+    * the keystone session of the session clients, with its connections;
+    * the endpoints looked up in the catalog, by project, region, service
+      type and interface, in a bounded LRU cache whose entries expire.
+      The endpoints of the service include the project, so tenants do
+      not share theirs.
+
+    The factory is thread safe::
+
+        factory = client.ClientFactory('1', session=session)
+        sgs = factory.client(auth=tenant_auth)
+
+    :param version: API version of the clients.
+    :param session: A keystoneclient session shared by the clients built
+                    with an ``auth`` plugin. (optional)
+    :param endpoint_cache_size: Maximum number of endpoints to remember.
+    :param endpoint_ttl: Seconds an endpoint lookup is reused for.
+    :param kwargs: Arguments passed to every client, such as ``timeout``,
+                   ``insecure`` or the connection pool options.
+    """
+
+    def __init__(self, version='1', session=None, endpoint_cache_size=128,
+                 endpoint_ttl=3600, **kwargs):
+        self.client_class = _client_class(version)
+        self.session = session
+        self.endpoints = resource_cache.ResourceCache(
+            ttl=endpoint_ttl, max_size=endpoint_cache_size)
+        self.connection_pool = kwargs.pop('connection_pool', None)
+        pool_options = dict((option, kwargs.pop(option))
+                            for option in ('pool_connections',
+                                           'pool_maxsize', 'pool_block')
+                            if option in kwargs)
+        if self.connection_pool is None:
+            self.connection_pool = ConnectionPool(
+                idle_timeout=kwargs.pop('pool_idle_timeout', None),
+                **pool_options)
+        self.defaults = kwargs
+
+    def endpoint(self, auth=None, region_name=None,
+                 service_type='sg-service', endpoint_type='publicURL'):
+        """Return the catalog endpoint of the service, from the cache."""
+        # The project comes from the token of the auth plugin, which it
+        # caches, so this costs no request once the plugin authenticated.
+        key = (self.session.get_project_id(auth), region_name, service_type,
+               endpoint_type)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.session.get_endpoint(
+                auth, service_type=service_type, interface=endpoint_type,
+                region_name=region_name)
+            if endpoint:
+                self.endpoints.set(key, endpoint)
+        return endpoint
+
+    def client(self, endpoint=None, token=None, auth=None, **kwargs):
+        """Build a client.
+
+        With an ``auth`` plugin, the client authenticates through the
+        shared session, and its endpoint is looked up in the catalog
+        unless given. Otherwise, ``endpoint`` and ``token`` are used over
+        the shared connection pool.
+
+        :param endpoint: SG-Service endpoint URL.
+        :param token: Token for authentication.
+        :param auth: Auth plugin of the tenant, to use with the session.
+        :param kwargs: Other arguments of the client, overriding those
+                       given to the factory.
+        """
+        options = dict(self.defaults, **kwargs)
+        if auth is not None:
+            if self.session is None:
+                raise exc.EndpointException(
+                    "A keystone session is needed for auth plugins")
+            if endpoint is None:
+                endpoint = self.endpoint(
+                    auth, options.get('region_name'),
+                    options.get('service_type', 'sg-service'),
+                    options.get('endpoint_type', 'publicURL'))
+            return self.client_class(endpoint, session=self.session,
+                                     auth=auth, **options)
+        return self.client_class(endpoint, token=token,
+                                 connection_pool=self.connection_pool,
+                                 **options)
+
+    def close(self):
+        """Close the shared connections of the token clients."""
+        self.connection_pool.close()
+
+
+def _decode_body(resp):
+    """Decode a JSON response body, or return None if it is not JSON.
+
+    The raw bytes are decoded directly, which avoids building
+    ``resp.text`` first.
+    """
+    if not resp.content:
+        return None
+    try:
+        return jsonutils.loads(resp.content)
+    except ValueError as e:
+        LOG.debug("load http response text error: %s", e)
+        return None
+
+
 def get_system_ca_file():
     """Return path to system default CA file."""
     # Standard CA file locations for Debian/Ubuntu, RedHat/Fedora,
@@ -57,39 +207,121 @@ def get_system_ca_file():
     LOG.warning("System ca file could not be found.")
 
 
-class HTTPClient(object):
+class ConnectionPool(object):
+    """Long-lived, thread-safe pool of keep-alive HTTP connections.
 
-    def __init__(self, endpoint, **kwargs):
-        self.endpoint = endpoint
-        self.auth_url = kwargs.get('auth_url')
-        self.auth_token = kwargs.get('token')
-        self.username = kwargs.get('username')
-        self.password = kwargs.get('password')
-        self.region_name = kwargs.get('region_name')
-        self.include_pass = kwargs.get('include_pass')
-        self.project_id = kwargs.get('project_id')
-        self.endpoint_url = endpoint
+    Wraps a :class:`requests.Session` whose adapters keep connections to
+    each host open between calls, so repeated requests to the SG-Service
+    endpoint reuse the established TCP connection and TLS session instead
+    of handshaking again.
 
-        self.cert_file = kwargs.get('cert_file')
-        self.key_file = kwargs.get('key_file')
-        self.timeout = kwargs.get('timeout')
-        self._logger = logging.getLogger(__name__)
+    :param pool_connections: Number of per-host connection pools to cache.
+    :param pool_maxsize: Maximum number of connections kept per host.
+    :param pool_block: Block when a host has no free connection instead of
+                       opening an extra, non-pooled one.
+    :param idle_timeout: Seconds without any request after which all pooled
+                         connections are closed. ``None`` disables eviction.
 
-        self.ssl_connection_params = {
-            'cacert': kwargs.get('cacert'),
-            'cert_file': kwargs.get('cert_file'),
-            'key_file': kwargs.get('key_file'),
-            'insecure': kwargs.get('insecure'),
-        }
+    Cookies are neither stored nor sent again: the pool may be shared by
+    clients of different users and tenants, which must not see each
+    other's cookies.
+    """
 
-        self.verify_cert = None
-        if urllib.parse.urlparse(endpoint).scheme == "https":
-            if kwargs.get('insecure'):
-                self.verify_cert = False
-            else:
-                self.verify_cert = kwargs.get('cacert', get_system_ca_file())
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 idle_timeout=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._session = None
+        self._last_used = None
+        self._in_flight = 0
+
+    def _make_session(self):
+        session = requests.Session()
+        session.cookies.set_policy(
+            http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _acquire(self):
+        with self._lock:
+            now = time.time()
+            if (self._session is not None and self.idle_timeout and
+                    not self._in_flight and
+                    now - self._last_used > self.idle_timeout):
+                LOG.debug("Closing connections idle for more than %ss",
+                          self.idle_timeout)
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                self._session = self._make_session()
+            self._last_used = now
+            self._in_flight += 1
+            return self._session
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._last_used = time.time()
+
+    def request(self, method, url, **kwargs):
+        session = self._acquire()
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            self._release()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class HTTPTracer(object):
+    """Logs HTTPClient requests as curl commands, and their responses.
+
+    Nothing is formatted unless the logger is enabled for DEBUG, so the
+    tracer costs a single level check per request when debugging is off.
+    Any object with the ``enabled``, ``trace_request`` and
+    ``trace_response`` methods can be passed to HTTPClient as
+    ``http_tracer`` instead.
+
+    :param max_body: Maximum length of a request or response body to log;
+                     longer bodies are truncated. None logs whole bodies.
+    :param sample_rate: Fraction of the requests to trace, from 0 to 1.
+    :param logger: Logger the traces are written to.
+    """
 
-    def _safe_header(self, name, value):
+    def __init__(self, max_body=None, sample_rate=1.0, logger=None):
+        self.max_body = max_body
+        self.sample_rate = sample_rate
+        self.logger = logger or LOG
+
+    def enabled(self):
+        """Whether the next request should be traced."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        if self.sample_rate >= 1:
+            return True
+        return random.random() < self.sample_rate
+
+    def _truncate(self, body):
+        """Return the part of body to log and the length left out."""
+        if self.max_body is None or len(body) <= self.max_body:
+            return body, 0
+        return body[:self.max_body], len(body) - self.max_body
+
+    @staticmethod
+    def _safe_header(name, value):
         if name in ['X-Auth-Token', 'X-Subject-Token']:
             # because in python3 byte string handling is ... ug
             v = value.encode('utf-8')
@@ -100,7 +332,7 @@ class HTTPClient(object):
             return (encodeutils.safe_decode(name),
                     encodeutils.safe_decode(value))
 
-    def log_curl_request(self, method, url, kwargs):
+    def trace_request(self, client, method, url, kwargs):
         curl = ['curl -i -X %s' % method]
 
         for (key, value) in kwargs['headers'].items():
@@ -113,45 +345,135 @@ class HTTPClient(object):
             ('cacert', '--cacert %s'),
         ]
         for (key, fmt) in conn_params_fmt:
-            value = self.ssl_connection_params.get(key)
+            value = client.ssl_connection_params.get(key)
             if value:
                 curl.append(fmt % value)
 
-        if self.ssl_connection_params.get('insecure'):
+        if client.ssl_connection_params.get('insecure'):
             curl.append('-k')
 
         if 'data' in kwargs:
-            curl.append('-d \'%s\'' % kwargs['data'])
+            data, remaining = self._truncate(kwargs['data'])
+            if remaining:
+                data = '%s... (%d more)' % (data, remaining)
+            curl.append('-d \'%s\'' % data)
 
-        curl.append('%s%s' % (self.endpoint, url))
-        LOG.debug(' '.join(curl))
+        curl.append('%s%s' % (client.endpoint, url))
+        self.logger.debug(' '.join(curl))
 
-    @staticmethod
-    def log_http_response(resp):
+    def trace_response(self, resp, body=True):
+        """Log a response; body is False for streamed responses."""
         status = (resp.raw.version / 10.0, resp.status_code, resp.reason)
         dump = ['\nHTTP/%.1f %s %s' % status]
         dump.extend(['%s: %s' % (k, v) for k, v in resp.headers.items()])
         dump.append('')
-        if resp.content:
-            content = resp.content
+        if body and resp.content:
+            content, remaining = self._truncate(resp.content)
             if isinstance(content, six.binary_type):
+                # A truncated body may end in the middle of a character.
+                errors = 'ignore' if remaining else 'strict'
                 try:
-                    content = encodeutils.safe_decode(resp.content)
+                    content = encodeutils.safe_decode(content, errors=errors)
                 except UnicodeDecodeError:
-                    pass
-                else:
-                    dump.extend([content, ''])
-        LOG.debug('\n'.join(dump))
+                    content = None
+            if content is not None:
+                if remaining:
+                    content += '... (%d more)' % remaining
+                dump.extend([content, ''])
+        self.logger.debug('\n'.join(dump))
+
+
+class HTTPClient(object):
+
+    def __init__(self, endpoint, **kwargs):
+        self.endpoint = endpoint
+        self.auth_url = kwargs.get('auth_url')
+        self.auth_token = kwargs.get('token')
+        self.username = kwargs.get('username')
+        self.password = kwargs.get('password')
+        self.region_name = kwargs.get('region_name')
+        self.include_pass = kwargs.get('include_pass')
+        self.project_id = kwargs.get('project_id')
+        self.endpoint_url = endpoint
+
+        self.cert_file = kwargs.get('cert_file')
+        self.key_file = kwargs.get('key_file')
+        self.timeout = kwargs.get('timeout')
+        self._logger = logging.getLogger(__name__)
+        self.accept_encoding = (ACCEPT_ENCODING
+                                if kwargs.get('compression', True)
+                                else 'identity')
+        self.tracer = kwargs.get('http_tracer') or HTTPTracer(
+            max_body=kwargs.get('http_log_max_body'),
+            sample_rate=kwargs.get('http_log_sample_rate', 1.0))
+        self.retry_policy = kwargs.get('retry_policy')
+        self.rate_limiter = kwargs.get('rate_limiter')
+
+        # All managers of a client share this HTTPClient, and with it the
+        # pool; pass connection_pool to share it between clients as well.
+        self.connection_pool = kwargs.get('connection_pool')
+        if self.connection_pool is None:
+            self.connection_pool = ConnectionPool(
+                pool_connections=kwargs.get('pool_connections',
+                                            DEFAULT_POOL_CONNECTIONS),
+                pool_maxsize=kwargs.get('pool_maxsize',
+                                        DEFAULT_POOL_MAXSIZE),
+                pool_block=kwargs.get('pool_block', False),
+                idle_timeout=kwargs.get('pool_idle_timeout'))
+
+        self.ssl_connection_params = {
+            'cacert': kwargs.get('cacert'),
+            'cert_file': kwargs.get('cert_file'),
+            'key_file': kwargs.get('key_file'),
+            'insecure': kwargs.get('insecure'),
+        }
+
+        self.verify_cert = None
+        if urllib.parse.urlparse(endpoint).scheme == "https":
+            if kwargs.get('insecure'):
+                self.verify_cert = False
+            else:
+                # Only look for the system CA file when none is given.
+                self.verify_cert = (kwargs['cacert'] if 'cacert' in kwargs
+                                    else get_system_ca_file())
+
+    def log_curl_request(self, method, url, kwargs):
+        self.tracer.trace_request(self, method, url, kwargs)
+
+    @staticmethod
+    def log_http_response(resp):
+        HTTPTracer().trace_response(resp)
 
     def _http_request(self, url, method, **kwargs):
         """Send an http request with the specified characteristics.
 
-        Wrapper around requests.request to handle tasks such
+        Each attempt waits for the rate limiter, and the request is sent
+        again as the retry policy allows; pass ``retry=True`` to retry it
+        whatever its method.
+        """
+        retry = kwargs.pop('retry', False)
+
+        def send():
+            if self.rate_limiter is None:
+                return self._send_request(url, method, **kwargs)
+            return self.rate_limiter.call(
+                method, url, lambda: self._send_request(url, method,
+                                                        **kwargs))
+
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.call(method, send, retry=retry)
+
+    def _send_request(self, url, method, **kwargs):
+        """Send an http request once.
+
+        Wrapper around the pooled requests session to handle tasks such
         as setting headers and error handling.
         """
         # Copy the kwargs so we can reuse the original in case of redirects
         kwargs['headers'] = copy.deepcopy(kwargs.get('headers', {}))
         kwargs['headers'].setdefault('User-Agent', USER_AGENT)
+        kwargs['headers'].setdefault('Accept-Encoding', self.accept_encoding)
         if self.auth_token:
             kwargs['headers'].setdefault('X-Auth-Token', self.auth_token)
         else:
@@ -161,7 +483,11 @@ class HTTPClient(object):
         if self.region_name:
             kwargs['headers'].setdefault('X-Region-Name', self.region_name)
 
-        self.log_curl_request(method, url, kwargs)
+        # Sampling is decided once per request, so that a traced request
+        # is always followed by its response.
+        trace = self.tracer.enabled()
+        if trace:
+            self.tracer.trace_request(self, method, url, kwargs)
 
         if self.cert_file and self.key_file:
             kwargs['cert'] = (self.cert_file, self.key_file)
@@ -186,7 +512,7 @@ class HTTPClient(object):
         allow_redirects = False
 
         try:
-            resp = requests.request(
+            resp = self.connection_pool.request(
                 method,
                 self.endpoint_url + url,
                 allow_redirects=allow_redirects,
@@ -203,32 +529,29 @@ class HTTPClient(object):
                        {'endpoint': endpoint, 'e': e})
             raise exc.ConnectionRefused(message)
 
-        self.log_http_response(resp)
-
-        body = None
-        if resp.text:
-            try:
-                body = jsonutils.loads(resp.text)
-            except ValueError as e:
-                self._logger.debug("load http response text error: %s", e)
+        if trace:
+            # Logging a streamed body would read it all into memory.
+            self.tracer.trace_response(resp, body=not kwargs.get('stream'))
 
+        # The body is only decoded here for errors; successful responses
+        # are decoded once by the caller.
         if 'X-Auth-Key' not in kwargs['headers'] and \
                 (resp.status_code == 401 or
-                 (resp.status_code == 500 and "(HTTP 401)" in resp.content)):
+                 (resp.status_code == 500 and b"(HTTP 401)" in resp.content)):
             raise exc.AuthorizationFailure("Authentication failed. Please try"
                                            " again.\n%s"
                                            % resp.content)
         elif 400 <= resp.status_code < 600:
-            raise exc.from_response(resp, body)
+            raise exc.from_response(resp, _decode_body(resp))
         elif resp.status_code in (301, 302, 305):
             # Redirected. Reissue the request to the new location,
             # unless caller specified follow_redirects=False
             if follow_redirects:
                 location = resp.headers.get('location')
                 path = self.strip_endpoint(location)
-                resp = self._http_request(path, method, **kwargs)
+                resp = self._send_request(path, method, **kwargs)
         elif resp.status_code == 300:
-            raise exc.from_response(resp, body)
+            raise exc.from_response(resp, _decode_body(resp))
 
         return resp
 
@@ -270,7 +593,7 @@ class HTTPClient(object):
 
         if body and 'application/json' in resp.headers['content-type']:
             try:
-                body = resp.json()
+                body = jsonutils.loads(body)
             except ValueError:
                 LOG.error('Could not decode response body as JSON')
         else:
@@ -315,28 +638,68 @@ class HTTPClient(object):
 class SessionClient(keystone_adapter.Adapter):
     """sgs specific keystoneclient Adapter.
 
+    :param bool compression: Ask for compressed responses. (optional)
+    :param retry_policy: A :class:`sgsclient.retry.RetryPolicy` to send
+                         failed requests again with. (optional)
+    :param rate_limiter: A :class:`sgsclient.ratelimit.RateLimiter` to
+                         keep the requests under the service limits.
+                         (optional)
     """
 
-    def request(self, url, method, **kwargs):
+    def __init__(self, *args, **kwargs):
+        compression = kwargs.pop('compression', True)
+        retry_policy = kwargs.pop('retry_policy', None)
+        rate_limiter = kwargs.pop('rate_limiter', None)
+        super(SessionClient, self).__init__(*args, **kwargs)
+        self.accept_encoding = ACCEPT_ENCODING if compression else 'identity'
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self._project_id = None
+
+    def get_project_id(self, auth=None):
+        # The project of the session does not change, and looking it up may
+        # authenticate, so it is resolved once per client.
+        if auth is not None:
+            return super(SessionClient, self).get_project_id(auth)
+        if self._project_id is None:
+            self._project_id = super(SessionClient, self).get_project_id()
+        return self._project_id
+
+    def _request(self, url, method, **kwargs):
+        retry = kwargs.pop('retry', False)
+
+        def send():
+            if self.rate_limiter is None:
+                return self._send_request(url, method, **kwargs)
+            return self.rate_limiter.call(
+                method, url, lambda: self._send_request(url, method,
+                                                        **kwargs))
+
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.call(method, send, retry=retry)
+
+    def _send_request(self, url, method, **kwargs):
         raise_exc = kwargs.pop('raise_exc', True)
+        kwargs.setdefault('headers', {}).setdefault('Accept-Encoding',
+                                                    self.accept_encoding)
         resp = super(SessionClient, self).request(url,
                                                   method,
                                                   raise_exc=False,
                                                   **kwargs)
 
-        body = None
-        if resp.text:
-            try:
-                body = jsonutils.loads(resp.text)
-            except ValueError:
-                pass
-
+        # Only errors are decoded here, successful bodies are left to the
+        # caller so that they are decoded once.
         if raise_exc and resp.status_code >= 400:
+            error = exc.from_response(resp, _decode_body(resp))
             LOG.trace("Error communicating with {url}: {exc}"
-                      .format(url=url,
-                              exc=exc.from_response(resp, body)))
-            raise exc.from_response(resp, body)
+                      .format(url=url, exc=error))
+            raise error
 
+        return resp
+
+    def request(self, url, method, **kwargs):
+        resp = self._request(url, method, **kwargs)
         return resp, resp.text
 
     def json_request(self, method, url, **kwargs):
@@ -355,39 +718,29 @@ class SessionClient(keystone_adapter.Adapter):
             # or it will be modified by keystone adapter.
             kwargs['json'] = None
 
-        resp, body = self.request(url, method, **kwargs)
-        if body:
-            try:
-                body = jsonutils.loads(body)
-            except ValueError:
-                pass
+        resp = self._request(url, method, **kwargs)
+        body = _decode_body(resp)
+        if body is None:
+            # Not JSON: hand back the text as before.
+            body = resp.text
         return resp, body
 
     def raw_request(self, method, url, **kwargs):
-        # A non-json request; instead of calling
-        # super.request, need to call the grandparent
-        # adapter.request
-        raise_exc = kwargs.pop('raise_exc', True)
+        # A non-json request; _request calls the adapter's request
+        # rather than our own, which decodes the body as text.
         if 'body' in kwargs:
             if 'data' in kwargs:
                 raise ValueError("Can't provide both 'data' and "
                                  "'body' to a request")
             LOG.warning("Use of 'body' is deprecated; use 'data' instead")
             kwargs['data'] = kwargs.pop('body')
-        resp = keystone_adapter.Adapter.request(self,
-                                                url,
-                                                method,
-                                                raise_exc=False,
-                                                **kwargs)
+        return self._request(url, method, **kwargs)
 
-        if raise_exc and resp.status_code >= 400:
-            content = jsonutils.loads(resp.content)
-            LOG.trace("Error communicating with {url}: {exc}"
-                      .format(url=url,
-                              exc=exc.from_response(resp, content)))
-            raise exc.from_response(resp, content)
 
-        return resp
+_HTTP_CLIENT_ONLY_OPTIONS = ('connection_pool', 'pool_connections',
+                             'pool_maxsize', 'pool_block',
+                             'pool_idle_timeout', 'http_tracer',
+                             'http_log_max_body', 'http_log_sample_rate')
 
 
 def _construct_http_client(*args, **kwargs):
@@ -400,6 +753,10 @@ def _construct_http_client(*args, **kwargs):
         endpoint_type = kwargs.pop('endpoint_type', 'publicURL')
         region_name = kwargs.pop('region_name', None)
         service_name = kwargs.pop('service_name', 'sgservice')
+        # Connection pooling and request logging are handled by the
+        # keystone session itself.
+        for option in _HTTP_CLIENT_ONLY_OPTIONS:
+            kwargs.pop(option, None)
         parameters = {
             'endpoint_override': endpoint,
             'session': session,
@@ -111,6 +111,31 @@ class ConnectionRefused(Exception):
         return "ConnectionRefused: %s" % repr(self.response)
 
 
+class ResourceInErrorState(Exception):
+    """A resource being waited for went into an error status."""
+
+    def __init__(self, resource, status):
+        self.resource = resource
+        self.status = status
+
+    def __str__(self):
+        return ("%s %s went into status %s" %
+                (self.resource.__class__.__name__,
+                 getattr(self.resource, 'id', self.resource), self.status))
+
+
+class WaitTimeout(Exception):
+    """Resources did not reach the awaited status in time."""
+
+    def __init__(self, pending, timeout):
+        self.pending = pending
+        self.timeout = timeout
+
+    def __str__(self):
+        return ("Timed out after %ss waiting for %s" %
+                (self.timeout, ', '.join(self.pending)))
+
+
 class AmbiguousEndpoints(Exception):
     """Found more than one matching endpoint in Service Catalog."""
 
@@ -0,0 +1,186 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Incremental decoding of the item array of JSON list responses.
+"""
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class ArrayParser(object):
+    """Push parser for the items of a list response body.
+
+    Chunks of the body are fed as they are read, and each call returns the
+    items of the array that were completed by the chunk. Only the
+    unparsed tail of the body is buffered, so the memory used depends on
+    the size of one item rather than on the size of the document::
+
+        parser = ArrayParser('volumes')
+        for chunk in resp.iter_content(client.CHUNKSIZE):
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+
+    :param key: Key of the array in the top level object, such as
+                ``volumes``; None when the body is the array itself. The
+                other members of the object are skipped.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._state = 'array' if key is None else 'object'
+        self._member = None
+
+    def feed(self, chunk):
+        """Parse a chunk of the body.
+
+        :param chunk: Bytes, or text, read from the body.
+        :returns: The list of items completed by this chunk.
+        :raises ValueError: if the body is not a list response.
+        """
+        if self._state == 'done':
+            # Nothing after the array is needed, such as the links of the
+            # listing, so the rest of the body is not even buffered.
+            return []
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self):
+        """Parse the rest of the body once it has been fully read.
+
+        :returns: The list of the remaining items.
+        :raises ValueError: if the body was truncated.
+        """
+        items = []
+        if self._state != 'done':
+            self._buf = (self._buf[self._pos:] +
+                         self._decoder.decode(b'', final=True))
+            self._pos = 0
+            items = self._parse(final=True)
+        if self._state != 'done':
+            raise ValueError("Truncated JSON list response")
+        return items
+
+    def _token(self):
+        """Return the next non-blank character, or None to wait for more."""
+        self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+        if self._pos < len(self._buf):
+            return self._buf[self._pos]
+        return None
+
+    def _value(self, final):
+        """Decode the value at the current position, or wait for more.
+
+        Returns a (complete, value) pair. A value ending exactly at the end
+        of the buffer may be the start of a longer number, so it is only
+        accepted once more of the body, or its end, has been read.
+        """
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except ValueError:
+            if final:
+                raise
+            return False, None
+        if end == len(self._buf) and not final:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, char, token):
+        if token != char:
+            raise ValueError("Expected %r in JSON list response at %r"
+                             % (char, self._buf[self._pos:self._pos + 20]))
+        self._pos += 1
+
+    def _parse(self, final):
+        items = []
+        while self._state != 'done':
+            token = self._token()
+            if token is None:
+                break
+            state = self._state
+            if state == 'object':
+                self._expect('{', token)
+                self._state = 'member'
+            elif state == 'member':
+                if token == '}':
+                    self._pos += 1
+                    self._state = 'done'
+                    continue
+                complete, self._member = self._value(final)
+                if not complete:
+                    break
+                self._state = 'colon'
+            elif state == 'colon':
+                self._expect(':', token)
+                self._state = ('array' if self._member == self.key
+                               else 'skip')
+            elif state == 'skip':
+                complete, _value = self._value(final)
+                if not complete:
+                    break
+                self._state = 'next_member'
+            elif state == 'next_member':
+                if token == '}':
+                    self._pos += 1
+                    self._state = 'done'
+                else:
+                    self._expect(',', token)
+                    self._state = 'member'
+            elif state == 'array':
+                self._expect('[', token)
+                self._state = 'first_item'
+            elif state in ('first_item', 'item'):
+                if token == ']' and state == 'first_item':
+                    self._pos += 1
+                    self._state = 'done'
+                    continue
+                complete, item = self._value(final)
+                if not complete:
+                    break
+                items.append(item)
+                self._state = 'next_item'
+            elif state == 'next_item':
+                if token == ']':
+                    self._pos += 1
+                    self._state = 'done'
+                else:
+                    self._expect(',', token)
+                    self._state = 'item'
+        return items
+
+
+def iter_items(chunks, key=None):
+    """Yield the items of a list response body read in chunks.
+
+    :param chunks: Iterable of the chunks of the body, for example
+                   ``resp.iter_content(client.CHUNKSIZE)``.
+    :param key: Key of the array in the top level object, or None.
+    """
+    parser = ArrayParser(key)
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
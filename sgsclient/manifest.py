@@ -0,0 +1,89 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cached description of the sgs commands, used by bash completion and help.
+
+This module must stay cheap to import: it is used before the API modules,
+keystoneclient or oslo libraries are loaded.
+"""
+
+import json
+import os
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.sgsclient', 'cache')
+
+
+def _fingerprint(version):
+    """Identify the shell sources the manifest was generated from."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    parts = []
+    for source in ('shell.py', os.path.join('v%s' % version, 'shell.py')):
+        try:
+            st = os.stat(os.path.join(package_dir, source))
+        except OSError:
+            return None
+        parts.append('%s:%d:%d' % (source, st.st_mtime, st.st_size))
+    return ';'.join(parts)
+
+
+def terminal_columns():
+    """Width argparse formats help for."""
+    try:
+        import shutil
+        return shutil.get_terminal_size().columns
+    except (AttributeError, ImportError):
+        return int(os.environ.get('COLUMNS', 80))
+
+
+class Manifest(object):
+    """Commands, options and help texts of one API version's shell.
+
+    The data is generated from the argparse parsers on first use and saved
+    as JSON. It is regenerated whenever the shell modules change.
+
+    :param version: API version of the described shell.
+    :param cache_dir: Directory holding the manifest files.
+    """
+
+    def __init__(self, version, cache_dir=None):
+        self.version = version
+        cache_dir = cache_dir or os.environ.get('OS_CACHE_DIR')
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        self.path = os.path.join(self.cache_dir,
+                                 'manifest-v%s.json' % version)
+
+    def load(self):
+        """Return the saved manifest, or None if missing or out of date."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if data.get('fingerprint') != _fingerprint(self.version):
+            return None
+        return data
+
+    def save(self, data):
+        data = dict(data, fingerprint=_fingerprint(self.version))
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError):
+            # Not being able to cache only costs speed.
+            pass
+        return data
@@ -0,0 +1,204 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Client-side rate limiting of requests.
+"""
+
+import re
+import threading
+import time
+
+from oslo_log import log as logging
+
+from sgsclient import exceptions as exc
+
+LOG = logging.getLogger(__name__)
+
+
+class TokenBucket(object):
+    """Thread safe token bucket whose rate adapts to the service limits.
+
+    A request takes a token, and waits when none is left until one is
+    added; tokens are added at ``rate`` per second, and up to ``burst``
+    of them are saved while requests are sent more slowly. Tokens are
+    reserved in the order requests arrive, so waiting threads are served
+    in turn rather than all polling the bucket.
+
+    The rate is cut by ``decrease`` each time the service answers over
+    limit, no lower than ``min_rate``, and grows back by ``increase``
+    times ``max_rate`` for each request the service accepts.
+
+    :param rate: Requests per second allowed.
+    :param burst: Requests that may be sent at once after a quiet period.
+    :param min_rate: Lowest rate the bucket slows down to.
+    :param decrease: Factor the rate is multiplied by on an over limit.
+    :param increase: Fraction of the configured rate added back for each
+                     accepted request.
+    """
+
+    def __init__(self, rate, burst=None, min_rate=None, decrease=0.5,
+                 increase=0.01):
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self.min_rate = (min_rate if min_rate is not None
+                         else self.max_rate / 20)
+        self.decrease = decrease
+        self.increase = increase
+        self._tokens = float(self.burst)
+        self._last = time.time()
+        self._blocked_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        """Take a token, and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self):
+        """Take a token, waiting until it is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def over_limit(self, retry_after=0):
+        """Slow down after the service answered over limit."""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Drop the saved tokens, so that the requests waiting are sent
+            # at the new rate rather than in a burst.
+            self._tokens = min(self._tokens, 0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until,
+                                          now + retry_after)
+            LOG.debug("Over limit, slowing down to %.2f requests/s",
+                      self.rate)
+
+    def accepted(self):
+        """Speed up again after the service accepted a request."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self._refill(time.time())
+                self.rate = min(self.max_rate,
+                                self.rate + self.max_rate * self.increase)
+
+
+def _compile(path):
+    """Regex of a path pattern, such as ``/volumes/{id}/action``.
+
+    ``{name}`` matches one segment of the path, and ``*`` anything.
+    """
+    regex = []
+    for part in re.split(r'(\{[^}]*\}|\*)', path):
+        if part == '*':
+            regex.append('.*')
+        elif part.startswith('{') and part.endswith('}'):
+            regex.append('[^/]+')
+        else:
+            regex.append(re.escape(part))
+    return re.compile(''.join(regex) + '$')
+
+
+class Limit(object):
+    """Rate limit of the requests matching a method and a path pattern.
+
+    :param rate: Requests allowed per ``per`` seconds.
+    :param method: HTTP method the limit applies to, or ``*`` for all.
+    :param path: Path pattern the limit applies to, where ``{name}``
+                 matches one segment and ``*`` anything, such as
+                 ``/volumes/{id}/action``. The query string is ignored.
+    :param per: Length of the period of ``rate``, in seconds.
+    :param burst: Requests that may be sent at once after a quiet period;
+                  by default as many as allowed in a second.
+    :param kwargs: Other arguments of :class:`TokenBucket`.
+    """
+
+    def __init__(self, rate, method='*', path='*', per=1, burst=None,
+                 **kwargs):
+        self.method = method.upper()
+        self.path = path
+        self.regex = _compile(path)
+        self.bucket = TokenBucket(float(rate) / per, burst=burst, **kwargs)
+
+    def matches(self, method, path):
+        return ((self.method == '*' or self.method == method.upper()) and
+                self.regex.match(path) is not None)
+
+    def __repr__(self):
+        return '<Limit %s %s %.2f/s>' % (self.method, self.path,
+                                         self.bucket.rate)
+
+
+class RateLimiter(object):
+    """Keep the requests of a process under the limits of the service.
+
+    Every limit matching a request applies to it, so that a limit on the
+    actions of volumes can be combined with a global one::
+
+        limiter = ratelimit.RateLimiter([
+            ratelimit.Limit(5, 'POST', '/volumes/{id}/action'),
+            ratelimit.Limit(50),
+        ])
+        sgs = client.Client('1', endpoint, token=token,
+                            rate_limiter=limiter)
+
+    The limiter is thread safe. Give the same one to every client of the
+    process, as :class:`sgsclient.client.ClientFactory` does with its
+    arguments, so that their requests are counted together; the managers
+    of a client always share the limiter of its transport.
+
+    :param limits: The :class:`Limit` objects to apply.
+    """
+
+    def __init__(self, limits=()):
+        self.limits = list(limits)
+
+    def matching(self, method, url):
+        path = url.split('?', 1)[0]
+        return [limit for limit in self.limits
+                if limit.matches(method, path)]
+
+    def call(self, method, url, send):
+        """Send a request once the limits matching it allow.
+
+        :param method: HTTP method of the request.
+        :param url: Path of the request, relative to the endpoint.
+        :param send: Callable sending the request.
+        """
+        limits = self.matching(method, url)
+        # The tokens of all the limits are reserved before waiting, so
+        # the request waits for the slowest of them, not for their sum.
+        wait = max([limit.bucket.reserve() for limit in limits] or [0])
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            resp = send()
+        except exc.OverLimit as e:
+            for limit in limits:
+                limit.bucket.over_limit(e.retry_after)
+            raise
+        for limit in limits:
+            limit.bucket.accepted()
+        return resp
@@ -0,0 +1,141 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+In-memory index of listed resources.
+"""
+
+import collections
+import threading
+
+from sgsclient.openstack.common.apiclient import exceptions
+
+DEFAULT_KEYS = ('id', 'name', 'status', 'project_id')
+
+
+class ResourceIndex(object):
+    """Resources by ID, with hash indexes on some of their attributes.
+
+    Lookups on indexed attributes take constant time, instead of a scan of
+    the whole listing per query, which matters to scripts resolving many
+    names against one listing. Conditions on other attributes are checked
+    on the candidates of the most selective indexed one, or on every
+    resource if none is indexed.
+
+    The index is a snapshot: resources changed on the server afterwards
+    are only seen once they are passed to :meth:`update` again, and
+    deleted ones once :meth:`discard` is called for them.
+
+    :param resources: Resources to index.
+    :param keys: Names of the attributes to index.
+    """
+
+    def __init__(self, resources=(), keys=DEFAULT_KEYS):
+        self.keys = tuple(keys)
+        self._resources = collections.OrderedDict()
+        self._indexes = dict((key, {}) for key in self.keys)
+        self._lock = threading.Lock()
+        self.update(resources)
+
+    def __len__(self):
+        return len(self._resources)
+
+    def __iter__(self):
+        return iter(list(self._resources.values()))
+
+    def __contains__(self, resource_id):
+        return resource_id in self._resources
+
+    def update(self, resources):
+        """Add resources, or replace the indexed state of known ones."""
+        with self._lock:
+            for resource in resources:
+                self._remove(resource.id)
+                self._resources[resource.id] = resource
+                for key, index in self._indexes.items():
+                    value = getattr(resource, key, None)
+                    try:
+                        index.setdefault(value, collections.OrderedDict())[
+                            resource.id] = resource
+                    except TypeError:
+                        # Unhashable values, such as metadata, are only
+                        # matched by scanning.
+                        continue
+
+    def discard(self, resource_id):
+        """Remove a resource, given by ID, if it is indexed."""
+        with self._lock:
+            self._remove(resource_id)
+
+    def clear(self):
+        with self._lock:
+            self._resources.clear()
+            for index in self._indexes.values():
+                index.clear()
+
+    def _remove(self, resource_id):
+        resource = self._resources.pop(resource_id, None)
+        if resource is None:
+            return
+        for key, index in self._indexes.items():
+            try:
+                matches = index.get(getattr(resource, key, None))
+            except TypeError:
+                continue
+            if matches is not None:
+                matches.pop(resource_id, None)
+                if not matches:
+                    del index[getattr(resource, key, None)]
+
+    def get(self, resource_id):
+        """Return the resource with this ID, or None."""
+        return self._resources.get(resource_id)
+
+    def findall(self, **kwargs):
+        """Return the resources with attributes matching ``**kwargs``."""
+        candidates = None
+        for key, value in kwargs.items():
+            if key not in self._indexes:
+                continue
+            try:
+                matches = self._indexes[key].get(value)
+            except TypeError:
+                continue
+            if not matches:
+                return []
+            if candidates is None or len(matches) < len(candidates):
+                candidates = matches
+        if candidates is None:
+            candidates = self._resources
+        searches = list(kwargs.items())
+        found = []
+        for resource in list(candidates.values()):
+            try:
+                if all(getattr(resource, attr) == value
+                       for (attr, value) in searches):
+                    found.append(resource)
+            except AttributeError:
+                continue
+        return found
+
+    def find(self, **kwargs):
+        """Return the single resource with attributes matching ``**kwargs``.
+
+        :raises NotFound: if no resource matches.
+        :raises NoUniqueMatch: if several resources match.
+        """
+        found = self.findall(**kwargs)
+        if not found:
+            raise exceptions.NotFound("No resource matching %s." % kwargs)
+        if len(found) > 1:
+            raise exceptions.NoUniqueMatch
+        return found[0]
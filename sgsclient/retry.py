@@ -0,0 +1,181 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Retries of requests failed by transient errors.
+"""
+
+import threading
+import time
+
+from keystoneclient import exceptions as ks_exceptions
+from oslo_log import log as logging
+
+from sgsclient import exceptions as exc
+from sgsclient import utils
+
+LOG = logging.getLogger(__name__)
+
+# Methods that may be sent again without changing their effect.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'DELETE'])
+# Over limit, and the gateway errors of a server restarting or overloaded.
+RETRY_STATUSES = frozenset([413, 502, 503, 504])
+CONNECTION_ERRORS = (exc.ConnectionRefused, ks_exceptions.ConnectionError)
+
+
+class RetryBudget(object):
+    """Limit the retries to a fraction of the requests sent.
+
+    Every request deposits ``ratio`` of a token and every retry withdraws
+    a whole one, so when the service fails every request, retries add at
+    most that fraction to its load, however many attempts a single
+    request is allowed. ``min_per_second`` tokens are added as time
+    passes, so that clients sending few requests can still retry them.
+    The budget is thread safe.
+
+    :param ratio: Retries allowed per request sent.
+    :param min_per_second: Retries allowed per second regardless of the
+                           number of requests.
+    :param max_tokens: Maximum number of retries saved up, and sent in a
+                       burst once the service fails.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1.0, max_tokens=10):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def _add(self, tokens):
+        now = time.time()
+        tokens += (now - self._last) * self.min_per_second
+        self._last = now
+        self._tokens = min(self.max_tokens, self._tokens + tokens)
+
+    def deposit(self):
+        """Account for a request sent."""
+        with self._lock:
+            self._add(self.ratio)
+
+    def withdraw(self):
+        """Take a retry from the budget; False if it is spent."""
+        with self._lock:
+            self._add(0)
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# Shared by the retry policies of the process, unless they are given their
+# own, so that all clients back off together during an outage.
+DEFAULT_BUDGET = RetryBudget()
+
+
+class RetryPolicy(object):
+    """When, and after how long, to send a failed request again.
+
+    Requests with an idempotent method, and the actions named in
+    ``actions``, are retried when the connection fails or when the
+    service answers with one of ``statuses``. The delay before a retry
+    is the ``Retry-After`` of a 413 response, or else grows exponentially
+    with random jitter. A request gets at most ``retries`` retries, and
+    only as long as the retry budget allows::
+
+        policy = retry.RetryPolicy(retries=5, actions=['reset_status'])
+        sgs = client.Client('1', endpoint, token=token,
+                            retry_policy=policy)
+
+    :param retries: Maximum number of retries of a request.
+    :param methods: HTTP methods that are always retried.
+    :param statuses: Response status codes that are retried.
+    :param actions: Names of the resource actions that are safe to retry,
+                    such as ``reset_status``. Actions are POST requests,
+                    so they are not retried unless named here.
+    :param backoff: Delay before the first retry, in seconds.
+    :param max_backoff: Upper bound of the delays, in seconds.
+    :param jitter: Fraction of the delays that is randomized, from 0 to 1.
+    :param max_retry_after: Longest ``Retry-After`` to wait for, in
+                            seconds; the error is raised when the service
+                            asks for a longer wait.
+    :param budget: The :class:`RetryBudget` the retries are taken from, or
+                   None for no limit.
+    """
+
+    def __init__(self, retries=3, methods=IDEMPOTENT_METHODS,
+                 statuses=RETRY_STATUSES, actions=(), backoff=0.5,
+                 max_backoff=30, jitter=0.5, max_retry_after=60,
+                 budget=DEFAULT_BUDGET):
+        self.retries = retries
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.actions = frozenset(actions)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    def retries_action(self, action):
+        """Whether the action of this name may be sent again."""
+        return action in self.actions
+
+    def is_retryable(self, error):
+        """Whether the request that raised error may be sent again."""
+        if isinstance(error, CONNECTION_ERRORS):
+            return True
+        return (isinstance(error, exc.ClientException) and
+                error.code in self.statuses)
+
+    def _delay(self, error, delays):
+        """Seconds to wait before the next attempt, or None to give up."""
+        retry_after = getattr(error, 'retry_after', 0)
+        if retry_after:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+        return next(delays)
+
+    def call(self, method, send, retry=False):
+        """Send a request, and send it again while it may be retried.
+
+        :param method: HTTP method of the request.
+        :param send: Callable sending the request and returning its
+                     response, or raising the error of the request.
+        :param retry: Retry the request whatever its method.
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+        if not (retry or method.upper() in self.methods):
+            return send()
+        delays = utils.backoff(self.backoff, self.max_backoff,
+                               jitter=self.jitter)
+        attempt = 0
+        while True:
+            try:
+                return send()
+            except (exc.ClientException,) + CONNECTION_ERRORS as e:
+                if attempt >= self.retries or not self.is_retryable(e):
+                    raise
+                delay = self._delay(e, delays)
+                if delay is None:
+                    raise
+                if self.budget is not None and not self.budget.withdraw():
+                    LOG.debug("Retry budget spent, not retrying %s: %s",
+                              method, e)
+                    raise
+                attempt += 1
+                LOG.debug("Retrying %s in %.2fs (%d/%d): %s",
+                          method, delay, attempt, self.retries, e)
+                time.sleep(delay)
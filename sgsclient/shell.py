@@ -17,30 +17,32 @@ Command-line interface to the SG-Service Project.
 from __future__ import print_function
 
 import argparse
+import logging
 import sys
 
-from keystoneclient.auth.identity.generic import password
-from keystoneclient.auth.identity.generic import token
-from keystoneclient.auth.identity import v3 as identity
-from keystoneclient import discover
-from keystoneclient import exceptions as ks_exc
-from keystoneclient import session as ksession
-from oslo_log import handlers
-from oslo_log import log as logging
 from oslo_utils import importutils
 import six
 import six.moves.urllib.parse as urlparse
 
 import sgsclient
-from sgsclient import client as sgs_client
+from sgsclient import exceptions as sgs_exc
+from sgsclient import manifest as sgs_manifest
 from sgsclient.openstack.common.apiclient import exceptions as exc
 from sgsclient import utils
 
 logger = logging.getLogger(__name__)
 
 
+# NOTE: keystoneclient, the API modules and oslo.log are only imported by
+# the code paths that need them, to keep the startup of every sgs
+# invocation short; help and bash completion need none of them.
+
+
 class SGServiceShell(object):
     def _append_global_identity_args(self, parser):
+        from keystoneclient.auth.identity import v3 as identity
+        from keystoneclient import session as ksession
+
         # Register the CLI arguments that have moved to the session object.
         ksession.Session.register_cli_options(parser)
 
@@ -62,8 +64,7 @@ class SGServiceShell(object):
                             help=argparse.SUPPRESS, )
 
         parser.add_argument('--version',
-                            action='version',
-                            version=sgsclient.__version__,
+                            action=VersionAction,
                             help="Show program's version number and exit.")
 
         parser.add_argument('-d', '--debug',
@@ -132,6 +133,30 @@ class SGServiceShell(object):
                             default=utils.env('OS_ENDPOINT_TYPE'),
                             help='Defaults to env[OS_ENDPOINT_TYPE].')
 
+        parser.add_argument('--parallel',
+                            type=int,
+                            metavar='<count>',
+                            default=int(utils.env('SGS_PARALLEL',
+                                                  default=1)),
+                            help='Number of items that commands taking '
+                                 'several resources, such as delete, '
+                                 'process concurrently. '
+                                 'Defaults to env[SGS_PARALLEL] or 1.')
+
+        parser.add_argument('--os-cache',
+                            default=bool(utils.env('OS_CACHE')),
+                            action='store_true',
+                            help='Cache the Keystone token, discovered '
+                                 'versions and SG-Service endpoint on disk '
+                                 'and reuse them while the token is valid. '
+                                 'Defaults to env[OS_CACHE].')
+
+        parser.add_argument('--os-cache-dir',
+                            default=utils.env('OS_CACHE_DIR'),
+                            help='Directory of the --os-cache files. '
+                                 'Defaults to env[OS_CACHE_DIR] or '
+                                 '~/.sgsclient/cache.')
+
         parser.add_argument('--include-password',
                             default=bool(utils.env(
                                 'SGS_INCLUDE_PASSWORD')),
@@ -142,14 +167,24 @@ class SGServiceShell(object):
 
         return parser
 
-    def get_subcommand_parser(self, version):
-        parser = self.get_base_parser()
+    def get_subcommand_parser(self, version, command=None, parser=None):
+        """Build the parser for the subcommands of an API version.
+
+        :param version: API version whose shell module is used.
+        :param command: Only register this subcommand. All subcommands are
+                        registered when it is not given or unknown.
+        :param parser: Base parser to extend; a new one is built if None.
+        """
+        if parser is None:
+            parser = self.get_base_parser()
 
         self.subcommands = {}
         subparsers = parser.add_subparsers(metavar='<subcommand>')
         submodule = importutils.import_versioned_module(
             'sgsclient', version, 'shell'
         )
+        if command and self._find_action(subparsers, submodule, command):
+            return parser
         self._find_actions(subparsers, submodule)
         self._find_actions(subparsers, self)
 
@@ -166,27 +201,44 @@ class SGServiceShell(object):
         self.subcommands['bash_completion'] = subparser
         subparser.set_defaults(func=self.do_bash_completion)
 
+    def _find_action(self, subparsers, actions_module, command):
+        """Register a single subcommand, if the module provides it."""
+        if command in ('help', 'bash-completion', 'bash_completion'):
+            return False
+        callback = getattr(actions_module,
+                           'do_%s' % command.replace('-', '_'), None)
+        if callback is None or command != command.replace('_', '-'):
+            return False
+        self._add_action(subparsers, command, callback)
+        return True
+
     def _find_actions(self, subparsers, actions_module):
         for attr in (a for a in dir(actions_module) if a.startswith('do_')):
             # I prefer to be hypen-separated instead of underscores.
             command = attr[3:].replace('_', '-')
             callback = getattr(actions_module, attr)
-            desc = callback.__doc__ or ''
-            help = desc.strip().split('\n')[0]
-            arguments = getattr(callback, 'arguments', [])
-
-            subparser = subparsers.add_parser(command, help=help,
-                                              description=desc,
-                                              add_help=False,
-                                              formatter_class=HelpFormatter)
-            subparser.add_argument('-h', '--help', action='help',
-                                   help=argparse.SUPPRESS)
-            self.subcommands[command] = subparser
-            for (args, kwargs) in arguments:
-                subparser.add_argument(*args, **kwargs)
-            subparser.set_defaults(func=callback)
+            self._add_action(subparsers, command, callback)
+
+    def _add_action(self, subparsers, command, callback):
+        desc = callback.__doc__ or ''
+        help = desc.strip().split('\n')[0]
+        arguments = getattr(callback, 'arguments', [])
+
+        subparser = subparsers.add_parser(command, help=help,
+                                          description=desc,
+                                          add_help=False,
+                                          formatter_class=HelpFormatter)
+        subparser.add_argument('-h', '--help', action='help',
+                               help=argparse.SUPPRESS)
+        self.subcommands[command] = subparser
+        for (args, kwargs) in arguments:
+            subparser.add_argument(*args, **kwargs)
+        subparser.set_defaults(func=callback)
 
     def _discover_auth_versions(self, session, auth_url):
+        from keystoneclient import discover
+        from keystoneclient import exceptions as ks_exc
+
         # discover the API versions the server is supporting base on the
         # given URL
         v2_auth_url = None
@@ -216,7 +268,11 @@ class SGServiceShell(object):
 
         return (v2_auth_url, v3_auth_url)
 
-    def _get_keystone_auth(self, session, auth_url, **kwargs):
+    def _get_keystone_auth(self, session, auth_url, auth_versions=None,
+                           **kwargs):
+        from keystoneclient.auth.identity.generic import password
+        from keystoneclient.auth.identity.generic import token
+
         auth_token = kwargs.pop('auth_token', None)
         if auth_token:
             return token.Token(
@@ -233,9 +289,12 @@ class SGServiceShell(object):
         # so we should use workaround until we move to keystoneauth.
         # The idea of the code came from glanceclient.
 
-        (v2_auth_url, v3_auth_url) = self._discover_auth_versions(
-            session=session,
-            auth_url=auth_url)
+        if not auth_versions:
+            auth_versions = self._discover_auth_versions(
+                session=session,
+                auth_url=auth_url)
+        self.auth_versions = auth_versions
+        (v2_auth_url, v3_auth_url) = auth_versions
 
         if v3_auth_url:
             # NOTE(starodubcevna): set user_domain_id and project_domain_id
@@ -270,27 +329,69 @@ class SGServiceShell(object):
                              "Please provide a correct Keystone V3 auth_url.")
 
     def _setup_logging(self, debug):
+        from oslo_log import handlers
+
         # Output the logs to command-line interface
         color_handler = handlers.ColorHandler(sys.stdout)
-        logger_root = logging.getLogger(None).logger
+        logger_root = logging.getLogger()
         logger_root.level = logging.DEBUG if debug else logging.WARNING
         logger_root.addHandler(color_handler)
 
         # Set the logger level of special library
-        logging.getLogger('iso8601') \
-            .logger.setLevel(logging.WARNING)
-        logging.getLogger('urllib3.connectionpool') \
-            .logger.setLevel(logging.WARNING)
+        logging.getLogger('iso8601').setLevel(logging.WARNING)
+        logging.getLogger('urllib3.connectionpool').setLevel(logging.WARNING)
+
+    def _get_manifest(self, version, with_help=False):
+        """Load the command manifest, generating it if needed."""
+        manifest = sgs_manifest.Manifest(version)
+        data = manifest.load()
+        if data is None or (with_help and data.get('columns') !=
+                            sgs_manifest.terminal_columns()):
+            data = manifest.save(self._build_manifest(version))
+        return data
+
+    def _build_manifest(self, version):
+        parser = self.get_subcommand_parser(version)
+        commands = {}
+        for name, subparser in self.subcommands.items():
+            commands[name] = {
+                'options': sorted(subparser._optionals._option_string_actions),
+                'help': subparser.format_help(),
+            }
+        return {'columns': sgs_manifest.terminal_columns(),
+                'help': parser.format_help(),
+                'commands': commands}
+
+    def _run_from_manifest(self, argv):
+        """Answer plain help and bash completion without any parser."""
+        if argv in ([], ['-h'], ['--help']):
+            self.do_help(argparse.Namespace(command=None))
+        elif (argv[0] == 'help' and len(argv) <= 2 and
+                not any(a.startswith('-') for a in argv[1:])):
+            self.do_help(argparse.Namespace(command=(argv[1:] or [None])[0]))
+        elif argv in (['bash-completion'], ['bash_completion']):
+            self.do_bash_completion(argparse.Namespace())
+        else:
+            return False
+        return True
 
     def main(self, argv):
+        if self._run_from_manifest(argv):
+            return 0
+
         # Parse args once to find version
         parser = self.get_base_parser()
         (options, args) = parser.parse_known_args(argv)
         self._setup_logging(options.debug)
 
-        # build available subcommands based on version
+        # Build the subcommands based on version. Only the invoked one is
+        # registered; help needs all of them.
         api_version = options.sgs_api_version
-        subcommand_parser = self.get_subcommand_parser(api_version)
+        command = None
+        if not options.help:
+            command = next((a for a in args if not a.startswith('-')), None)
+        subcommand_parser = self.get_subcommand_parser(
+            api_version, command=command, parser=parser)
         self.parser = subcommand_parser
 
         # keystone_session = None
@@ -344,6 +445,7 @@ class SGServiceShell(object):
                                        " env[OS_AUTH_URL]")
 
         endpoint = args.sgs_url
+        cache = None
 
         if args.os_no_client_auth:
             # Authenticate through sgservice, don't use session
@@ -360,32 +462,66 @@ class SGServiceShell(object):
             if args.os_region_name:
                 kwargs['region_name'] = args.os_region_name
         else:
+            from keystoneclient.auth import token_endpoint
+            from keystoneclient import session as ksession
+
             # Create a keystone session and keystone auth
             keystone_session = ksession.Session.load_from_cli_options(args)
             project_id = args.os_project_id or args.os_tenant_id
             project_name = args.os_project_name or args.os_tenant_name
 
-            keystone_auth = self._get_keystone_auth(
-                keystone_session,
-                args.os_auth_url,
-                username=args.os_username,
-                user_id=args.os_user_id,
-                user_domain_id=args.os_user_domain_id,
-                user_domain_name=args.os_user_domain_name,
-                password=args.os_password,
-                auth_token=args.os_auth_token,
-                project_id=project_id,
-                project_name=project_name,
-                project_domain_id=args.os_project_domain_id,
-                project_domain_name=args.os_project_domain_name)
-
             endpoint_type = args.os_endpoint_type or 'publicURL'
             service_type = args.os_service_type or 'sg-service'
 
-            endpoint = keystone_auth.get_endpoint(
-                keystone_session,
-                service_type=service_type,
-                region_name=args.os_region_name)
+            # Only password logins are cached: a token given on the command
+            # line does not identify the user the cache entry belongs to.
+            # The password is part of the key, so that a wrong or changed
+            # password is checked by Keystone instead of getting the token
+            # cached for the previous one.
+            if args.os_cache and not args.os_auth_token:
+                from sgsclient import auth_cache
+
+                cache = auth_cache.AuthCache(
+                    (args.os_auth_url,
+                     args.os_user_id or args.os_username,
+                     args.os_password,
+                     args.os_user_domain_id or args.os_user_domain_name,
+                     project_id or project_name,
+                     args.os_project_domain_id or
+                     args.os_project_domain_name,
+                     args.os_region_name, service_type, endpoint_type),
+                    cache_dir=args.os_cache_dir)
+
+            if cache and cache.token and cache.endpoint:
+                endpoint = cache.endpoint
+                keystone_auth = token_endpoint.Token(endpoint, cache.token)
+            else:
+                keystone_auth = self._get_keystone_auth(
+                    keystone_session,
+                    args.os_auth_url,
+                    auth_versions=cache and cache.auth_versions,
+                    username=args.os_username,
+                    user_id=args.os_user_id,
+                    user_domain_id=args.os_user_domain_id,
+                    user_domain_name=args.os_user_domain_name,
+                    password=args.os_password,
+                    auth_token=args.os_auth_token,
+                    project_id=project_id,
+                    project_name=project_name,
+                    project_domain_id=args.os_project_domain_id,
+                    project_domain_name=args.os_project_domain_name)
+
+                endpoint = keystone_auth.get_endpoint(
+                    keystone_session,
+                    service_type=service_type,
+                    region_name=args.os_region_name)
+
+                if cache:
+                    access = keystone_auth.get_access(keystone_session)
+                    cache.save(auth_versions=self.auth_versions,
+                               token=access.auth_token,
+                               expires_at=access.expires,
+                               endpoint=endpoint)
 
             kwargs = {
                 'session': keystone_session,
@@ -398,22 +534,34 @@ class SGServiceShell(object):
         if args.api_timeout:
             kwargs['timeout'] = args.api_timeout
 
+        from sgsclient import client as sgs_client
+
         client = sgs_client.Client(api_version, endpoint, **kwargs)
 
-        args.func(client, args)
+        try:
+            args.func(client, args)
+        except (exc.Unauthorized, sgs_exc.Unauthorized):
+            if cache:
+                # The cached token was revoked; authenticate next time.
+                cache.clear()
+            raise
+
+    @staticmethod
+    def _api_version(args):
+        return (getattr(args, 'sgs_api_version', None) or
+                utils.env('SGS_API_VERSION', default='1'))
 
     def do_bash_completion(self, args):
         """Prints all of the commands and options to stdout."""
-        commands = set()
+        data = self._get_manifest(self._api_version(args))
+        commands = set(data['commands'])
         options = set()
-        for sc_str, sc in self.subcommands.items():
-            commands.add(sc_str)
-            for option in list(sc._optionals._option_string_actions):
-                options.add(option)
+        for command in data['commands'].values():
+            options.update(command['options'])
 
         commands.remove('bash-completion')
         commands.remove('bash_completion')
-        print(' '.join(commands | options))
+        print(' '.join(sorted(commands | options)))
 
     @utils.arg('command', metavar='<subcommand>', nargs='?',
                help='Display help for <subcommand>')
@@ -421,14 +569,29 @@ class SGServiceShell(object):
         """Display help about this program or one of its subcommands.
 
         """
+        data = self._get_manifest(self._api_version(args), with_help=True)
         if getattr(args, 'command', None):
-            if args.command in self.subcommands:
-                self.subcommands[args.command].print_help()
+            if args.command in data['commands']:
+                sys.stdout.write(data['commands'][args.command]['help'])
             else:
                 msg = "'%s' is not a valid subcommand"
                 raise exc.CommandError(msg % args.command)
         else:
-            self.parser.print_help()
+            sys.stdout.write(data['help'])
+
+
+class VersionAction(argparse.Action):
+    """Print the version, which is only looked up when asked for."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS,
+                 default=argparse.SUPPRESS, help=None):
+        super(VersionAction, self).__init__(option_strings=option_strings,
+                                            dest=dest, default=default,
+                                            nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(sgsclient.__version__)
+        parser.exit()
 
 
 class HelpFormatter(argparse.HelpFormatter):
@@ -0,0 +1,74 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+import stat
+
+import fixtures
+from oslo_utils import timeutils
+
+from sgsclient import auth_cache
+from sgsclient.tests.unit import base
+
+KEY = ('http://keystone:5000/v3', 'admin', 'default', 'demo', 'default',
+       'RegionOne', 'sg-service', 'publicURL')
+
+
+class AuthCacheTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(AuthCacheTest, self).setUp()
+        self.cache_dir = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'cache')
+
+    def _save(self, expires_in):
+        cache = auth_cache.AuthCache(KEY, cache_dir=self.cache_dir)
+        expires_at = (timeutils.utcnow(with_timezone=True) +
+                      datetime.timedelta(seconds=expires_in))
+        cache.save(auth_versions=(None, 'http://keystone:5000/v3'),
+                   token='token', expires_at=expires_at,
+                   endpoint='http://sgs:8975/v1/demo')
+
+    def test_round_trip(self):
+        self._save(3600)
+        cache = auth_cache.AuthCache(KEY, cache_dir=self.cache_dir)
+        self.assertEqual('token', cache.token)
+        self.assertEqual('http://sgs:8975/v1/demo', cache.endpoint)
+        self.assertEqual((None, 'http://keystone:5000/v3'),
+                         cache.auth_versions)
+
+    def test_files_are_private(self):
+        self._save(3600)
+        cache = auth_cache.AuthCache(KEY, cache_dir=self.cache_dir)
+        self.assertEqual(0o700, stat.S_IMODE(os.stat(self.cache_dir).st_mode))
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(cache.path).st_mode))
+
+    def test_expiring_token_is_not_reused(self):
+        self._save(10)
+        cache = auth_cache.AuthCache(KEY, cache_dir=self.cache_dir)
+        self.assertIsNone(cache.token)
+        self.assertEqual('http://sgs:8975/v1/demo', cache.endpoint)
+
+    def test_other_identity_misses(self):
+        self._save(3600)
+        key = KEY[:3] + ('other-project',) + KEY[4:]
+        cache = auth_cache.AuthCache(key, cache_dir=self.cache_dir)
+        self.assertIsNone(cache.token)
+        self.assertIsNone(cache.auth_versions)
+
+    def test_clear(self):
+        self._save(3600)
+        cache = auth_cache.AuthCache(KEY, cache_dir=self.cache_dir)
+        cache.clear()
+        self.assertFalse(os.path.exists(cache.path))
+        self.assertIsNone(cache.token)
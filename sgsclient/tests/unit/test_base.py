@@ -0,0 +1,590 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import pickle
+import threading
+
+import mock
+from oslo_serialization import jsonutils
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from sgsclient import base as base_module
+from sgsclient import exceptions
+from sgsclient.openstack.common.apiclient import exceptions as api_exceptions
+from sgsclient.tests.unit import base
+from sgsclient.tests.unit.v1 import fakes
+from sgsclient.v1 import client as v1_client
+from sgsclient.v1 import volumes as volumes_module
+from sgsclient import waiters
+
+cs = fakes.FakeClient()
+
+
+def _backups(*ids):
+    return ({}, {'backups': [{'id': i, 'name': 'backup-%s' % i}
+                             for i in ids]})
+
+
+class ListIterTest(base.TestCaseShell):
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_iter_follows_markers(self, mock_request):
+        mock_request.side_effect = [_backups('1', '2'), _backups('3', '4'),
+                                    _backups('5'), _backups()]
+        backups = cs.backups.list_iter(page_size=2)
+        self.assertEqual(0, mock_request.call_count)
+        self.assertEqual(['1', '2', '3', '4', '5'],
+                         [b.id for b in backups])
+        self.assertEqual(
+            [mock.call('GET', '/backups?limit=2', headers={}),
+             mock.call('GET', '/backups?limit=2&marker=2', headers={}),
+             mock.call('GET', '/backups?limit=2&marker=4', headers={}),
+             mock.call('GET', '/backups?limit=2&marker=5', headers={})],
+            mock_request.call_args_list)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_iter_follows_pages_capped_by_the_server(
+            self, mock_request):
+        mock_request.side_effect = [_backups('1', '2'), _backups('3'),
+                                    _backups()]
+        backups = cs.backups.list_iter(page_size=5000)
+        self.assertEqual(['1', '2', '3'], [b.id for b in backups])
+        mock_request.assert_called_with(
+            'GET', '/backups?limit=5000&marker=3', headers={})
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_iter_without_page_size_stops_on_empty_page(
+            self, mock_request):
+        mock_request.side_effect = [_backups('1', '2'), _backups()]
+        backups = list(cs.backups.list_iter(
+            detailed=True, search_opts={'status': 'available'}))
+        self.assertEqual(['1', '2'], [b.id for b in backups])
+        mock_request.assert_called_with(
+            'GET', '/backups/detail?marker=2&status=available', headers={})
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_iter_stops_when_marker_is_ignored(self, mock_request):
+        mock_request.return_value = _backups('1', '2')
+        backups = list(cs.backups.list_iter())
+        self.assertEqual(['1', '2'], [b.id for b in backups])
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.raw_request')
+    def test_list_iter_does_not_stream(self, mock_request):
+        backups = cs.backups.list_iter(page_size=2, stream=True)
+        self.assertRaises(ValueError, next, backups)
+        self.assertRaises(ValueError, cs.backups.list_columns, ['id'],
+                          stream=True)
+        self.assertFalse(mock_request.called)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_iter_with_prefetch(self, mock_request):
+        mock_request.side_effect = [_backups('1', '2'), _backups('3', '4'),
+                                    _backups('5'), _backups()]
+        backups = cs.backups.list_iter(page_size=2, prefetch=1)
+        self.assertEqual(['1', '2', '3', '4', '5'],
+                         [b.id for b in backups])
+        self.assertEqual(4, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_iter_with_prefetch_reraises_errors(self, mock_request):
+        mock_request.side_effect = [_backups('1', '2'), ValueError('boom')]
+        backups = cs.backups.list_iter(page_size=2, prefetch=2)
+        self.assertEqual('1', next(backups).id)
+        self.assertEqual('2', next(backups).id)
+        self.assertRaises(ValueError, next, backups)
+
+
+class ListColumnsTest(base.TestCaseShell):
+
+    @mock.patch('sgsclient.base.Resource.__init__')
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_columns(self, mock_request, mock_init):
+        mock_request.side_effect = [_backups('1', '2'), _backups('3'),
+                                    _backups()]
+        columns = cs.backups.list_columns(['id', 'status', 'name'],
+                                          page_size=2, detailed=True)
+        self.assertEqual(['id', 'status', 'name'], list(columns))
+        self.assertEqual(['1', '2', '3'], columns['id'])
+        self.assertEqual([None] * 3, columns['status'])
+        self.assertEqual('backup-3', columns['name'][2])
+        self.assertFalse(mock_init.called)
+        mock_request.assert_called_with(
+            'GET', '/backups/detail?limit=2&marker=3', headers={})
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_columns_as_tuples(self, mock_request):
+        mock_request.side_effect = [_backups('1', '2'), _backups()]
+        rows = cs.backups.list_columns(['id', 'x:y'], as_tuples=True)
+        self.assertEqual([('1', None), ('2', None)], rows)
+        self.assertEqual('2', rows[1].id)
+        self.assertEqual('BackupRow', type(rows[0]).__name__)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_list_return_raw(self, mock_request):
+        mock_request.return_value = _backups('1')
+        self.assertEqual([{'id': '1', 'name': 'backup-1'}],
+                         cs.backups.list(return_raw=True))
+
+
+def _snapshots(*items):
+    return ({}, {'snapshots': [dict(item) for item in items]})
+
+
+class FindTest(base.TestCaseShell):
+
+    first = {'id': '1', 'name': 'snap', 'volume_id': 'v', 'size': 1}
+    second = {'id': '2', 'name': 'snap', 'volume_id': 'v', 'size': 2}
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_findall_pushes_supported_filters(self, mock_request):
+        mock_request.side_effect = [_snapshots(self.first, self.second),
+                                    _snapshots()]
+        found = cs.snapshots.findall(name='snap', volume_id='v', size=2)
+        self.assertEqual(['2'], [s.id for s in found])
+        self.assertEqual(
+            mock.call('GET', '/snapshots/detail?all_tenants=1&name=snap'
+                      '&volume_id=v', headers={}),
+            mock_request.call_args_list[0])
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_findall_follows_markers(self, mock_request):
+        mock_request.side_effect = [_snapshots(self.first),
+                                    _snapshots(self.second), _snapshots()]
+        found = cs.snapshots.findall(name='snap')
+        self.assertEqual(['1', '2'], [s.id for s in found])
+        self.assertEqual(
+            [mock.call('GET', '/snapshots/detail?all_tenants=1&name=snap',
+                       headers={}),
+             mock.call('GET', '/snapshots/detail?all_tenants=1&marker=1'
+                       '&name=snap', headers={}),
+             mock.call('GET', '/snapshots/detail?all_tenants=1&marker=2'
+                       '&name=snap', headers={})],
+            mock_request.call_args_list)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_filters_not_supported_by_the_api_are_not_pushed(
+            self, mock_request):
+        mock_request.side_effect = [_volumes('enabled'), _volumes()]
+        cs.volumes.findall(status='enabled', volume_id='v')
+        self.assertEqual(
+            mock.call('GET', '/volumes/detail?all_tenants=1&status=enabled',
+                      headers={}),
+            mock_request.call_args_list[0])
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_find_returns_listed_resource(self, mock_request):
+        mock_request.side_effect = [_snapshots(self.first), _snapshots()]
+        snapshot = cs.snapshots.find(name='snap')
+        self.assertEqual('1', snapshot.id)
+        self.assertEqual('v', snapshot.volume_id)
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_find_stops_at_second_match(self, mock_request):
+        mock_request.side_effect = [_snapshots(self.first, self.second)]
+        self.assertRaises(api_exceptions.NoUniqueMatch, cs.snapshots.find,
+                          name='snap')
+        self.assertEqual(1, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_find_not_found(self, mock_request):
+        mock_request.side_effect = [_snapshots(self.first), _snapshots()]
+        self.assertRaises(api_exceptions.NotFound, cs.snapshots.find,
+                          name='snap', size=3)
+
+
+class GetManyTest(base.TestCaseShell):
+
+    def _get(self, method, url, headers):
+        volume_id = url.rsplit('/', 1)[1]
+        if volume_id == 'missing':
+            raise exceptions.NotFound(404)
+        if volume_id == 'broken':
+            raise exceptions.ClientException(500)
+        return {}, {'volume': {'id': volume_id}}
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_get_many_keeps_input_order(self, mock_request):
+        mock_request.side_effect = self._get
+        ids = [str(i) for i in range(20)]
+        volumes = cs.volumes.get_many(ids, concurrency=4)
+        self.assertEqual(ids, [v.id for v in volumes])
+        self.assertEqual(20, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_get_many_returns_not_found_per_id(self, mock_request):
+        mock_request.side_effect = self._get
+        volumes = cs.volumes.get_many(['1', 'missing', '3'], concurrency=2)
+        self.assertEqual('1', volumes[0].id)
+        self.assertIsInstance(volumes[1], exceptions.NotFound)
+        self.assertEqual('3', volumes[2].id)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_get_many_raises_other_errors(self, mock_request):
+        mock_request.side_effect = self._get
+        self.assertRaises(exceptions.ClientException, cs.volumes.get_many,
+                          ['1', 'broken', '3'], concurrency=2)
+
+
+def _volumes(*statuses):
+    return ({}, {'volumes': [{'id': str(i), 'status': status}
+                             for i, status in enumerate(statuses)]})
+
+
+class RefreshTest(base.TestCaseShell):
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_refresh_updates_in_place(self, mock_request):
+        mock_request.side_effect = [_volumes('enabled', 'in-use'),
+                                    _volumes()]
+        volumes = [volumes_module.Volume(cs.volumes, {'id': str(i),
+                                                      'status': 'enabling'})
+                   for i in range(2)]
+        refreshed = cs.volumes.refresh(volumes)
+        self.assertIs(volumes[0], refreshed[0])
+        self.assertEqual(['enabled', 'in-use'],
+                         [v.status for v in volumes])
+        self.assertEqual({'id': '1', 'status': 'in-use'}, volumes[1].to_dict())
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_refresh_stops_paging_when_all_seen(self, mock_request):
+        mock_request.side_effect = [_volumes('enabled', 'enabled'),
+                                    _volumes('enabled', 'enabled')]
+        volumes = cs.volumes.refresh(['1'], page_size=2,
+                                     search_opts={'all_tenants': 1})
+        self.assertEqual('1', volumes[0].id)
+        mock_request.assert_called_once_with(
+            'GET', '/volumes/detail?all_tenants=1&limit=2', headers={})
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_refresh_gets_unlisted_resources(self, mock_request):
+        mock_request.side_effect = [
+            _volumes('enabled'), _volumes(),
+            ({}, {'volume': {'id': 'other', 'status': 'in-use'}})]
+        volumes = cs.volumes.refresh(['other', '0'])
+        self.assertEqual(['in-use', 'enabled'], [v.status for v in volumes])
+        self.assertEqual(3, mock_request.call_count)
+        mock_request.assert_called_with('GET', '/volumes/other', headers={})
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_refresh_raises_not_found(self, mock_request):
+        mock_request.side_effect = [_volumes(), exceptions.NotFound(404)]
+        self.assertRaises(exceptions.NotFound, cs.volumes.refresh, ['gone'])
+
+
+@mock.patch('time.sleep')
+class WaitForTest(base.TestCaseShell):
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_wait_for_polls_with_one_list(self, mock_request, mock_sleep):
+        mock_request.side_effect = [_volumes('enabling', 'enabling'),
+                                    _volumes('enabled', 'enabling'),
+                                    _volumes('enabled', 'enabled')]
+        volumes = cs.volumes.wait_for(['0', '1'])
+        self.assertEqual(['enabled', 'enabled'], [v.status for v in volumes])
+        self.assertEqual(3 * [mock.call('GET', '/volumes/detail',
+                                        headers={})],
+                         mock_request.call_args_list)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_wait_for_target_status(self, mock_request, mock_sleep):
+        mock_request.side_effect = [_volumes('enabled'),
+                                    _volumes('failed-over')]
+        volume = cs.volumes.wait_for('0', target_statuses=['failed-over'])
+        self.assertEqual('failed-over', volume.status)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_wait_for_gets_unlisted_resources(self, mock_request,
+                                              mock_sleep):
+        mock_request.side_effect = [
+            _volumes('enabled'), _volumes(),
+            ({}, {'volume': {'id': 'other', 'status': 'in-use'}})]
+        volumes = cs.volumes.wait_for(['0', 'other'])
+        self.assertEqual(['enabled', 'in-use'], [v.status for v in volumes])
+        mock_request.assert_called_with('GET', '/volumes/other', headers={})
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_wait_for_error_status(self, mock_request, mock_sleep):
+        mock_request.side_effect = [_volumes('enabling'), _volumes('error')]
+        e = self.assertRaises(exceptions.ResourceInErrorState,
+                              cs.volumes.wait_for, '0')
+        self.assertEqual('error', e.status)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_wait_for_timeout(self, mock_request, mock_sleep):
+        mock_request.return_value = _volumes('attaching')
+        e = self.assertRaises(exceptions.WaitTimeout,
+                              cs.volumes.wait_for, '0', timeout=0)
+        self.assertEqual(['0'], e.pending)
+        self.assertFalse(mock_sleep.called)
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_wait_for_backs_off_until_status_changes(self, mock_request,
+                                                     mock_sleep):
+        mock_request.side_effect = ([_volumes('enabling', 'enabling')] * 4 +
+                                    [_volumes('enabled', 'enabling')] +
+                                    [_volumes('enabled', 'enabled')])
+        with mock.patch('random.uniform', return_value=1):
+            cs.volumes.wait_for(['0', '1'])
+        self.assertEqual([1, 2, 4, 8, 1],
+                         [c[0][0] for c in mock_sleep.call_args_list])
+
+    def test_waiter_without_status_yet(self, mock_sleep):
+        # A status that is not set yet, or not even returned, does not
+        # count as a change, but the waiter still has a delay to give.
+        waiter = waiters.StatusWaiter(['0'], target_statuses=['enabled'],
+                                      status_attr='replicate_status')
+        volume = volumes_module.Volume(None, {'id': '0'}, loaded=True)
+        self.assertFalse(waiter.update({'0': volume}))
+        with mock.patch('random.uniform', return_value=1):
+            self.assertEqual(1, waiter.next_delay())
+            self.assertEqual(2, waiter.next_delay())
+
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Serves the volumes of the server, with an ETag per version."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        etag = '"v%d"' % server.version
+        server.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path.startswith('/volumes/detail'):
+            body = {'volumes': server.volumes}
+        else:
+            volume_id = self.path.rsplit('/', 1)[1]
+            body = {'volume': [v for v in server.volumes
+                               if v['id'] == volume_id][0]}
+        body = jsonutils.dump_as_bytes(body)
+        server.bytes_sent += len(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class ConditionalGetTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ConditionalGetTest, self).setUp()
+        self.server = StandInServer(('127.0.0.1', 0), StandInHandler)
+        self.server.version = 1
+        self.server.volumes = [{'id': str(i), 'status': 'enabled'}
+                               for i in range(100)]
+        self.server.requests = []
+        self.server.bytes_sent = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = v1_client.Client(
+            'http://127.0.0.1:%d' % self.server.server_port, token='token',
+            conditional_get=True)
+        self.addCleanup(self.client.http_client.connection_pool.close)
+
+    def test_unchanged_list_is_not_downloaded_again(self):
+        first = self.client.volumes.list(detailed=True)
+        sent = self.server.bytes_sent
+        with mock.patch('oslo_serialization.jsonutils.loads') as mock_loads:
+            second = self.client.volumes.list(detailed=True)
+        self.assertFalse(mock_loads.called)
+        self.assertEqual(sent, self.server.bytes_sent)
+        self.assertEqual([None, '"v1"'], self.server.requests)
+        self.assertEqual([v.to_dict() for v in first],
+                         [v.to_dict() for v in second])
+
+    def test_changed_resources_do_not_change_later_results(self):
+        first = self.client.volumes.list(detailed=True)
+        first[0].status = 'deleting'
+        first[0]._info['metadata'] = {'key': 'value'}
+        first[1]._info['status'] = 'error'
+        second = self.client.volumes.list(detailed=True)
+        self.assertEqual([None, '"v1"'], self.server.requests)
+        self.assertEqual(self.server.volumes,
+                         [v.to_dict() for v in second])
+        volume = self.client.volumes.get('0')
+        volume._info['status'] = 'error'
+        self.assertEqual('enabled', self.client.volumes.get('0').status)
+
+    def test_changed_list_is_downloaded(self):
+        self.client.volumes.list(detailed=True)
+        self.server.version = 2
+        self.server.volumes[0]['status'] = 'disabled'
+        volumes = self.client.volumes.list(detailed=True)
+        self.assertEqual('disabled', volumes[0].status)
+        self.client.volumes.list(detailed=True)
+        self.assertEqual([None, '"v1"', '"v2"'], self.server.requests)
+
+    def test_get_is_revalidated(self):
+        self.client.volumes.get('1')
+        volume = self.client.volumes.get('1')
+        self.assertEqual('enabled', volume.status)
+        self.assertEqual([None, '"v1"'], self.server.requests)
+
+    def test_disabled_by_default(self):
+        client = v1_client.Client(self.client.http_client.endpoint,
+                                  token='token')
+        self.addCleanup(client.http_client.connection_pool.close)
+        client.volumes.list(detailed=True)
+        client.volumes.list(detailed=True)
+        self.assertEqual([None, None], self.server.requests)
+
+
+class StreamListTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(StreamListTest, self).setUp()
+        self.server = StandInServer(('127.0.0.1', 0), StandInHandler)
+        self.server.version = 1
+        self.server.volumes = [{'id': str(i), 'status': 'enabled'}
+                               for i in range(5000)]
+        self.server.requests = []
+        self.server.bytes_sent = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = v1_client.Client(
+            'http://127.0.0.1:%d' % self.server.server_port, token='token',
+            conditional_get=True)
+        self.addCleanup(self.client.http_client.connection_pool.close)
+
+    def test_stream_matches_list(self):
+        streamed = self.client.volumes.list(detailed=True, stream=True)
+        self.assertNotIsInstance(streamed, list)
+        self.assertEqual(
+            [v.to_dict() for v in self.client.volumes.list(detailed=True)],
+            [v.to_dict() for v in streamed])
+
+    def test_stream_is_not_revalidated(self):
+        list(self.client.volumes.list(detailed=True, stream=True))
+        list(self.client.volumes.list(detailed=True, stream=True))
+        self.assertEqual([None, None], self.server.requests)
+
+    def test_stream_is_decoded_lazily(self):
+        chunks = [b'{"volumes": [{"id": "1"}, ', b'{"id": "2"}]}']
+        resp = mock.Mock()
+        remaining = iter(chunks)
+        resp.iter_content.return_value = remaining
+        api = mock.Mock(project_id=None)
+        api.raw_request.return_value = resp
+        manager = volumes_module.VolumeManager(api)
+        streamed = manager.list(stream=True)
+        self.assertFalse(api.raw_request.called)
+        self.assertEqual('1', next(streamed).id)
+        # The first item came before the rest of the body was read.
+        self.assertEqual(chunks[1], next(remaining))
+        api.raw_request.assert_called_once_with(
+            'GET', '/volumes', headers={}, stream=True)
+        streamed.close()
+        resp.close.assert_called_once_with()
+
+
+class CompactResourceTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(CompactResourceTest, self).setUp()
+        self.manager = volumes_module.VolumeManager(mock.Mock())
+        self.info = {'id': '1', 'name': 'vol', 'metadata': {'k': 'v'}}
+
+    def test_attributes(self):
+        volume = volumes_module.CompactVolume(self.manager, self.info)
+        self.assertEqual('1', volume.id)
+        self.assertEqual({'k': 'v'}, volume.metadata)
+        self.assertTrue(volume.is_loaded())
+        self.assertRaises(AttributeError, getattr, volume, 'status')
+        self.assertFalse(hasattr(volume, '__dict__'))
+        self.assertIn('metadata', dir(volume))
+
+    def test_schema_is_shared(self):
+        first = volumes_module.CompactVolume(self.manager, self.info)
+        second = volumes_module.CompactVolume(
+            self.manager, {'id': '2', 'name': 'other', 'metadata': {}})
+        self.assertIs(type(first), type(second))
+        self.assertIsInstance(first, volumes_module.CompactVolume)
+        self.assertEqual('other', second.name)
+
+    def test_fields_that_are_not_identifiers(self):
+        self.info['os-vol-host-attr:host'] = 'host'
+        self.info['to_dict'] = 'field'
+        volume = volumes_module.CompactVolume(self.manager, self.info)
+        self.assertEqual('host', getattr(volume, 'os-vol-host-attr:host'))
+        self.assertEqual('1', volume.id)
+        self.assertEqual(self.info, volume.to_dict())
+
+    def test_too_many_shapes(self):
+        with mock.patch.object(base_module, 'MAX_SHAPES', 0):
+            volume = volumes_module.CompactVolume(self.manager,
+                                                  {'id': '1', 'x-y': 2})
+        self.assertEqual('1', volume.id)
+        self.assertEqual({'id': '1', 'x-y': 2}, volume.to_dict())
+
+    def test_to_dict_does_not_deep_copy(self):
+        volume = volumes_module.CompactVolume(self.manager, self.info)
+        info = volume.to_dict()
+        self.assertEqual(self.info, info)
+        info['id'] = '2'
+        self.assertEqual('1', volume.id)
+        self.assertIs(self.info['metadata'], info['metadata'])
+
+    def test_equality_and_repr(self):
+        volume = volumes_module.CompactVolume(self.manager, self.info)
+        self.assertEqual(
+            volume, volumes_module.CompactVolume(self.manager,
+                                                 dict(self.info)))
+        self.assertNotEqual(volume, volumes_module.Volume(self.manager,
+                                                          self.info))
+        self.assertTrue(repr(volume).startswith('<Volume '))
+
+    def test_to_resource(self):
+        volume = volumes_module.CompactVolume(self.manager, self.info)
+        full = volume.to_resource()
+        self.assertIsInstance(full, volumes_module.Volume)
+        self.assertEqual(self.info, full.to_dict())
+
+    def test_pickle(self):
+        volume = volumes_module.CompactVolume(None, self.info)
+        restored = pickle.loads(pickle.dumps(volume))
+        self.assertEqual(volume, restored)
+        self.assertIs(type(volume), type(restored))
+
+    def test_list_compact(self):
+        api = mock.Mock(project_id=None)
+        api.json_request.return_value = (
+            {}, {'volumes': [self.info, {'id': '2'}]})
+        manager = volumes_module.VolumeManager(api)
+        volumes = manager.list(compact=True)
+        for volume in volumes:
+            self.assertIsInstance(volume, volumes_module.CompactVolume)
+        self.assertEqual(['1', '2'], [v.id for v in volumes])
@@ -0,0 +1,377 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import gzip
+import threading
+
+import fixtures
+import mock
+from oslo_serialization import jsonutils
+import requests
+from six.moves import BaseHTTPServer
+import testtools
+
+from sgsclient import client
+from sgsclient import exceptions
+from sgsclient.tests.unit import base
+from sgsclient.v1 import client as v1_client
+
+
+def _response(status_code, body):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers['Content-Type'] = 'application/json'
+    resp._content = jsonutils.dump_as_bytes(body)
+    resp.raw = mock.Mock(version=11)
+    return resp
+
+
+class ConnectionPoolTest(base.TestCaseShell):
+
+    def test_session_is_reused(self):
+        pool = client.ConnectionPool()
+        with mock.patch('requests.Session.request') as mock_request:
+            pool.request('GET', 'http://endpoint/volumes')
+            session = pool._session
+            pool.request('GET', 'http://endpoint/volumes')
+        self.assertIs(session, pool._session)
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_adapter_uses_pool_settings(self):
+        pool = client.ConnectionPool(pool_connections=3, pool_maxsize=7,
+                                     pool_block=True)
+        with mock.patch('requests.Session.request'):
+            pool.request('GET', 'https://endpoint/volumes')
+        adapter = pool._session.get_adapter('https://endpoint')
+        self.assertEqual(3, adapter._pool_connections)
+        self.assertEqual(7, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+
+    @mock.patch('time.time')
+    def test_idle_connections_are_evicted(self, mock_time):
+        pool = client.ConnectionPool(idle_timeout=30)
+        mock_time.return_value = 100
+        with mock.patch('requests.Session.request'):
+            pool.request('GET', 'http://endpoint/volumes')
+            session = pool._session
+            mock_time.return_value = 120
+            pool.request('GET', 'http://endpoint/volumes')
+            self.assertIs(session, pool._session)
+            mock_time.return_value = 200
+            pool.request('GET', 'http://endpoint/volumes')
+        self.assertIsNot(session, pool._session)
+
+    def test_cookies_are_not_shared(self):
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), CookieHandler)
+        server.cookies = []
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        pool = client.ConnectionPool()
+        self.addCleanup(pool.close)
+        url = 'http://127.0.0.1:%d/volumes' % server.server_port
+        pool.request('GET', url)
+        pool.request('GET', url)
+        self.assertEqual([None, None], server.cookies)
+        self.assertEqual(0, len(pool._session.cookies))
+
+
+class CookieHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.cookies.append(self.headers.get('Cookie'))
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'session=tenant-a; Path=/')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPClientPoolTest(base.TestCaseShell):
+
+    def test_managers_share_connection_pool(self):
+        cs = v1_client.Client('http://endpoint', token='token',
+                              pool_maxsize=20)
+        pool = cs.http_client.connection_pool
+        self.assertEqual(20, pool.pool_maxsize)
+        for manager in (cs.volumes, cs.replications, cs.replicates,
+                        cs.backups, cs.snapshots, cs.checkpoints):
+            self.assertIs(pool, manager.api.connection_pool)
+
+    def test_connection_pool_can_be_shared_between_clients(self):
+        pool = client.ConnectionPool()
+        first = client.HTTPClient('http://endpoint', connection_pool=pool)
+        second = client.HTTPClient('http://other', connection_pool=pool)
+        self.assertIs(first.connection_pool, second.connection_pool)
+
+
+class JSONDecodeTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(JSONDecodeTest, self).setUp()
+        self.loads = self.useFixture(fixtures.MockPatch(
+            'oslo_serialization.jsonutils.loads',
+            side_effect=jsonutils.loads)).mock
+
+    @mock.patch.object(client.ConnectionPool, 'request')
+    def test_http_client_decodes_once(self, mock_request):
+        body = {'volumes': [{'id': '1'}]}
+        mock_request.return_value = _response(200, body)
+        http = client.HTTPClient('http://endpoint', token='token')
+        resp, decoded = http.json_request('GET', '/volumes')
+        self.assertEqual(body, decoded)
+        self.assertEqual(1, self.loads.call_count)
+
+    @mock.patch.object(client.ConnectionPool, 'request')
+    def test_http_client_decodes_errors(self, mock_request):
+        mock_request.return_value = _response(
+            404, {'itemNotFound': {'message': 'No volume 1'}})
+        http = client.HTTPClient('http://endpoint', token='token')
+        e = self.assertRaises(exceptions.NotFound,
+                              http.json_request, 'GET', '/volumes/1')
+        self.assertEqual('No volume 1', e.message)
+        self.assertEqual(1, self.loads.call_count)
+
+    @mock.patch('keystoneclient.adapter.Adapter.request')
+    def test_session_client_decodes_once(self, mock_request):
+        body = {'volumes': [{'id': '1'}]}
+        mock_request.return_value = _response(200, body)
+        session = client.SessionClient(session=mock.Mock())
+        resp, decoded = session.json_request('GET', '/volumes')
+        self.assertEqual(body, decoded)
+        self.assertEqual(1, self.loads.call_count)
+
+
+class HTTPTracerTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(HTTPTracerTest, self).setUp()
+        self.logger = mock.Mock()
+        self.logger.isEnabledFor.return_value = True
+        self.body = {'volumes': [{'id': str(i)} for i in range(100)]}
+        self.useFixture(fixtures.MockPatchObject(
+            client.ConnectionPool, 'request',
+            return_value=_response(200, self.body)))
+
+    def _request(self, **kwargs):
+        tracer = client.HTTPTracer(logger=self.logger, **kwargs)
+        http = client.HTTPClient('http://endpoint', token='token',
+                                 http_tracer=tracer)
+        http.json_request('GET', '/volumes')
+
+    @mock.patch('hashlib.sha1')
+    def test_disabled_tracer_formats_nothing(self, mock_sha1):
+        self.logger.isEnabledFor.return_value = False
+        self._request()
+        self.assertFalse(mock_sha1.called)
+        self.assertFalse(self.logger.debug.called)
+
+    def test_request_and_response_are_traced(self):
+        self._request()
+        self.assertEqual(2, self.logger.debug.call_count)
+        curl = self.logger.debug.call_args_list[0][0][0]
+        self.assertIn('curl -i -X GET', curl)
+        self.assertIn('X-Auth-Token: {SHA1}', curl)
+        self.assertNotIn("X-Auth-Token: token'", curl)
+        dump = self.logger.debug.call_args_list[1][0][0]
+        self.assertIn(jsonutils.dumps(self.body), dump)
+
+    def test_response_body_is_truncated(self):
+        self._request(max_body=20)
+        dump = self.logger.debug.call_args_list[1][0][0]
+        content = jsonutils.dump_as_bytes(self.body)
+        self.assertIn('%s... (%d more)' % (content[:20].decode(),
+                                           len(content) - 20), dump)
+        self.assertNotIn(jsonutils.dumps(self.body), dump)
+
+    @mock.patch('random.random')
+    def test_requests_are_sampled(self, mock_random):
+        mock_random.return_value = 0.7
+        self._request(sample_rate=0.5)
+        self.assertFalse(self.logger.debug.called)
+        mock_random.return_value = 0.2
+        self._request(sample_rate=0.5)
+        self.assertEqual(2, self.logger.debug.call_count)
+
+    def test_session_client_ignores_http_client_options(self):
+        http = client._construct_http_client(session=mock.Mock(),
+                                             http_log_max_body=10,
+                                             pool_maxsize=5)
+        self.assertIsInstance(http, client.SessionClient)
+
+
+class GzipHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.accept_encoding = self.headers.get('Accept-Encoding')
+        body = jsonutils.dump_as_bytes(
+            {'volumes': [{'id': str(i), 'status': 'enabled'}
+                         for i in range(1000)]})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if 'gzip' in self.server.accept_encoding:
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.server.bytes_sent = len(body)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CompressionTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(CompressionTest, self).setUp()
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0),
+                                                GzipHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.endpoint = 'http://127.0.0.1:%d' % self.server.server_port
+
+    def _list(self, **kwargs):
+        cs = v1_client.Client(self.endpoint, token='token', **kwargs)
+        self.addCleanup(cs.http_client.connection_pool.close)
+        return cs.volumes.list(detailed=True)
+
+    @testtools.skipUnless(hasattr(gzip, 'compress'), 'needs gzip.compress')
+    def test_compressed_response(self):
+        volumes = self._list()
+        self.assertEqual(1000, len(volumes))
+        self.assertEqual(client.ACCEPT_ENCODING, self.server.accept_encoding)
+        self.assertIn('gzip', self.server.accept_encoding)
+        compressed = self.server.bytes_sent
+        self._list(compression=False)
+        self.assertEqual('identity', self.server.accept_encoding)
+        self.assertLess(compressed * 5, self.server.bytes_sent)
+
+    @mock.patch('keystoneclient.adapter.Adapter.request')
+    def test_session_client_negotiates(self, mock_request):
+        mock_request.return_value = _response(200, {'volumes': []})
+        session = client.SessionClient(session=mock.Mock())
+        session.json_request('GET', '/volumes')
+        headers = mock_request.call_args[1]['headers']
+        self.assertEqual(client.ACCEPT_ENCODING, headers['Accept-Encoding'])
+
+
+class LazyProjectIdTest(base.TestCaseShell):
+
+    def test_client_construction_does_no_lookup(self):
+        session = mock.Mock()
+        session.get_project_id.return_value = 'project'
+        cs = v1_client.Client(session=session)
+        self.assertFalse(session.get_project_id.called)
+        self.assertEqual('project', cs.volumes.project_id)
+        self.assertEqual('project', cs.backups.project_id)
+        self.assertEqual('project', cs.checkpoints.project_id)
+        self.assertEqual(1, session.get_project_id.call_count)
+
+    def test_http_client_project_id(self):
+        cs = v1_client.Client('http://endpoint', token='token',
+                              project_id='project')
+        self.assertEqual('project', cs.snapshots.project_id)
+        cs.snapshots.project_id = 'other'
+        self.assertEqual('other', cs.snapshots.project_id)
+        self.assertEqual('project', cs.volumes.project_id)
+
+    @mock.patch('sgsclient.client.get_system_ca_file')
+    def test_given_cacert_is_not_looked_up(self, mock_ca_file):
+        client.HTTPClient('https://endpoint', cacert='/ca.pem')
+        self.assertFalse(mock_ca_file.called)
+
+
+class ClientFactoryTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ClientFactoryTest, self).setUp()
+        self.session = mock.Mock()
+        self.session.get_endpoint.return_value = 'http://sgs:8975/v1'
+
+    def test_versioned_module_is_imported_once(self):
+        with mock.patch.dict(client._CLIENT_CLASSES, clear=True), \
+                mock.patch('oslo_utils.importutils.import_versioned_module',
+                           return_value=v1_client) as mock_import:
+            client.Client('1', 'http://endpoint', token='token')
+            client.Client(1, 'http://endpoint', token='token')
+            client.ClientFactory('1')
+        self.assertEqual(1, mock_import.call_count)
+
+    def test_token_clients_share_the_pool(self):
+        factory = client.ClientFactory(pool_maxsize=20, timeout=5)
+        first = factory.client('http://endpoint', token='a')
+        second = factory.client('http://endpoint', token='b', timeout=10)
+        self.assertIs(factory.connection_pool,
+                      first.http_client.connection_pool)
+        self.assertIs(factory.connection_pool,
+                      second.http_client.connection_pool)
+        self.assertEqual(20, factory.connection_pool.pool_maxsize)
+        self.assertEqual('b', second.http_client.auth_token)
+        self.assertEqual(5, first.http_client.timeout)
+        self.assertEqual(10, second.http_client.timeout)
+
+    def test_session_clients_share_endpoint_lookup(self):
+        self.session.get_project_id.return_value = 'demo'
+        factory = client.ClientFactory(session=self.session,
+                                       region_name='r1')
+        clients = [factory.client(auth=mock.Mock()) for _i in range(3)]
+        self.assertEqual(1, self.session.get_endpoint.call_count)
+        self.session.get_endpoint.assert_called_once_with(
+            mock.ANY, service_type='sg-service', interface='publicURL',
+            region_name='r1')
+        for sgs in clients:
+            self.assertIsInstance(sgs.http_client, client.SessionClient)
+            self.assertIs(self.session, sgs.http_client.session)
+            self.assertEqual('http://sgs:8975/v1',
+                             sgs.http_client.endpoint_override)
+
+        factory.client(auth=mock.Mock(), region_name='r2')
+        self.assertEqual(2, self.session.get_endpoint.call_count)
+
+    def test_tenants_get_their_own_endpoint(self):
+        tenant_a, tenant_b = mock.Mock(), mock.Mock()
+        projects = {tenant_a: 'a', tenant_b: 'b'}
+        self.session.get_project_id.side_effect = projects.get
+        self.session.get_endpoint.side_effect = (
+            lambda auth, **kwargs: 'http://sgs:8975/v1/%s' % projects[auth])
+        factory = client.ClientFactory(session=self.session)
+        first = factory.client(auth=tenant_a)
+        second = factory.client(auth=tenant_b)
+        again = factory.client(auth=tenant_a)
+        self.assertEqual('http://sgs:8975/v1/a',
+                         first.http_client.endpoint_override)
+        self.assertEqual('http://sgs:8975/v1/b',
+                         second.http_client.endpoint_override)
+        self.assertEqual('http://sgs:8975/v1/a',
+                         again.http_client.endpoint_override)
+        self.assertEqual(2, self.session.get_endpoint.call_count)
+
+    def test_endpoint_cache_is_bounded(self):
+        factory = client.ClientFactory(session=self.session,
+                                       endpoint_cache_size=1)
+        factory.endpoint(region_name='r1')
+        factory.endpoint(region_name='r2')
+        factory.endpoint(region_name='r1')
+        self.assertEqual(3, self.session.get_endpoint.call_count)
+
+    def test_auth_needs_a_session(self):
+        factory = client.ClientFactory()
+        self.assertRaises(exceptions.EndpointException, factory.client,
+                          auth=mock.Mock())
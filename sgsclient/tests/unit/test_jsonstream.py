@@ -0,0 +1,66 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oslo_serialization import jsonutils
+
+from sgsclient import jsonstream
+from sgsclient.tests.unit import base
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class ArrayParserTest(base.TestCaseShell):
+
+    body = {'volumes_links': [{'rel': 'next', 'href': 'http://next'}],
+            'volumes': [{'id': str(i), 'name': u'volum\xe9-%d' % i,
+                         'size': 10 ** i, 'metadata': {'k': [1, None]}}
+                        for i in range(20)]}
+
+    def test_any_chunk_size(self):
+        data = jsonutils.dump_as_bytes(self.body, ensure_ascii=False)
+        for size in (1, 2, 3, 7, 100, len(data)):
+            items = list(jsonstream.iter_items(_chunks(data, size),
+                                               'volumes'))
+            self.assertEqual(self.body['volumes'], items)
+
+    def test_items_are_returned_as_they_complete(self):
+        parser = jsonstream.ArrayParser('volumes')
+        self.assertEqual([], parser.feed(b'{"volumes": [{"id": "1"}'))
+        self.assertEqual([{'id': '1'}], parser.feed(b', {"id": '))
+        self.assertEqual([{'id': '2'}], parser.feed(b'"2"}]'))
+        self.assertEqual([], parser.feed(b', "links": []}'))
+        self.assertEqual([], parser.close())
+
+    def test_number_split_across_chunks(self):
+        items = jsonstream.iter_items([b'[1, 22', b'3, 4', b']'])
+        self.assertEqual([1, 223, 4], list(items))
+
+    def test_missing_key(self):
+        items = jsonstream.iter_items([b'{"other": {"volumes": [1]}}'],
+                                      'volumes')
+        self.assertEqual([], list(items))
+
+    def test_empty_array(self):
+        items = jsonstream.iter_items([b' { "volumes" : [ ] } '], 'volumes')
+        self.assertEqual([], list(items))
+
+    def test_truncated_body(self):
+        items = jsonstream.iter_items([b'{"volumes": [{"id": "1"}, {"i'],
+                                      'volumes')
+        self.assertRaises(ValueError, list, items)
+
+    def test_not_a_list_response(self):
+        items = jsonstream.iter_items([b'{"volumes": {"id": "1"}}'],
+                                      'volumes')
+        self.assertRaises(ValueError, list, items)
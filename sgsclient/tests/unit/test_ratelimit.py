@@ -0,0 +1,118 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_serialization import jsonutils
+import requests
+
+from sgsclient import client
+from sgsclient import exceptions
+from sgsclient import ratelimit
+from sgsclient import retry
+from sgsclient.tests.unit import base
+
+
+def _response(status_code, headers=None):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers['Content-Type'] = 'application/json'
+    resp.headers.update(headers or {})
+    resp._content = jsonutils.dump_as_bytes({})
+    resp.raw = mock.Mock(version=11)
+    return resp
+
+
+@mock.patch('time.time', return_value=100)
+class TokenBucketTest(base.TestCaseShell):
+
+    def test_waits_once_burst_is_spent(self, mock_time):
+        bucket = ratelimit.TokenBucket(rate=2, burst=2)
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0.5, bucket.reserve())
+        self.assertEqual(1.0, bucket.reserve())
+        mock_time.return_value = 102
+        self.assertEqual(0, bucket.reserve())
+
+    def test_over_limit_slows_down(self, mock_time):
+        bucket = ratelimit.TokenBucket(rate=10, min_rate=4, increase=0.1)
+        bucket.over_limit()
+        self.assertEqual(5, bucket.rate)
+        self.assertEqual(0.2, bucket.reserve())
+        bucket.over_limit()
+        self.assertEqual(4, bucket.rate)
+        for _i in range(10):
+            bucket.accepted()
+        self.assertEqual(10, bucket.rate)
+
+    def test_retry_after_blocks(self, mock_time):
+        bucket = ratelimit.TokenBucket(rate=10)
+        bucket.over_limit(retry_after=3)
+        self.assertEqual(3, bucket.reserve())
+        mock_time.return_value = 104
+        self.assertEqual(0, bucket.reserve())
+
+
+class RateLimiterTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(RateLimiterTest, self).setUp()
+        self.action = ratelimit.Limit(5, 'POST', '/volumes/{id}/action')
+        self.hourly = ratelimit.Limit(3600, 'GET', '/volumes*', per=3600)
+        self.limiter = ratelimit.RateLimiter([self.action, self.hourly])
+
+    def test_limits_match_method_and_path(self):
+        self.assertEqual([self.action], self.limiter.matching(
+            'post', '/volumes/1/action'))
+        self.assertEqual([], self.limiter.matching(
+            'POST', '/volumes/1/detail/action'))
+        self.assertEqual([self.hourly], self.limiter.matching(
+            'GET', '/volumes/detail?limit=10'))
+        self.assertEqual([], self.limiter.matching('GET', '/backups'))
+        self.assertEqual(1, self.hourly.bucket.rate)
+
+    @mock.patch('time.sleep')
+    def test_over_limit_slows_matching_limits(self, mock_sleep):
+        send = mock.Mock(side_effect=exceptions.OverLimit(413))
+        self.assertRaises(exceptions.OverLimit, self.limiter.call,
+                          'POST', '/volumes/1/action', send)
+        self.assertEqual(2.5, self.action.bucket.rate)
+        self.assertEqual(1, self.hourly.bucket.rate)
+
+
+@mock.patch('time.sleep')
+class TransportRateLimitTest(base.TestCaseShell):
+
+    @mock.patch.object(client.ConnectionPool, 'request')
+    def test_every_attempt_is_limited(self, mock_request, mock_sleep):
+        limit = ratelimit.Limit(10, 'GET')
+        limiter = ratelimit.RateLimiter([limit])
+        policy = retry.RetryPolicy(budget=None)
+        mock_request.side_effect = [
+            _response(413, headers={'Retry-After': '2'}), _response(200)]
+        http = client.HTTPClient('http://endpoint', token='token',
+                                 rate_limiter=limiter, retry_policy=policy)
+        http.json_request('GET', '/volumes')
+        self.assertEqual(2, mock_request.call_count)
+        self.assertAlmostEqual(5.1, limit.bucket.rate)
+
+    @mock.patch('keystoneclient.adapter.Adapter.request')
+    def test_session_client_is_limited(self, mock_request, mock_sleep):
+        limiter = mock.Mock()
+        limiter.call.side_effect = lambda method, url, send: send()
+        mock_request.return_value = _response(200)
+        session = client.SessionClient(session=mock.Mock(),
+                                       rate_limiter=limiter)
+        session.json_request('GET', '/volumes')
+        self.assertEqual('GET', limiter.call.call_args[0][0])
+        self.assertEqual('/volumes', limiter.call.call_args[0][1])
+        self.assertTrue(mock_request.called)
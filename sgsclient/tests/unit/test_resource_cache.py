@@ -0,0 +1,140 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from sgsclient import client
+from sgsclient import resource_cache
+from sgsclient.tests.unit import base
+from sgsclient.tests.unit.v1 import fakes
+from sgsclient.v1 import replicates
+from sgsclient.v1 import volumes
+
+cs = fakes.FakeClient()
+
+
+def _volume(volume_id, status='enabled'):
+    return {}, {'volume': {'id': volume_id, 'status': status}}
+
+
+class ResourceCacheTest(base.TestCaseShell):
+
+    def test_entries_expire(self):
+        cache = resource_cache.ResourceCache(ttl=10)
+        with mock.patch('time.time', return_value=100):
+            cache.set('key', 'value')
+        with mock.patch('time.time', return_value=105):
+            self.assertEqual('value', cache.get('key'))
+        with mock.patch('time.time', return_value=111):
+            self.assertIsNone(cache.get('key'))
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0,
+                          'size': 0}, cache.stats())
+
+    def test_least_recently_used_is_evicted(self):
+        cache = resource_cache.ResourceCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(1, cache.stats()['evictions'])
+
+
+@mock.patch('sgsclient.client.HTTPClient.json_request')
+class ManagerCacheTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ManagerCacheTest, self).setUp()
+        self.cache = resource_cache.ResourceCache()
+        self.volumes = volumes.VolumeManager(cs.http_client, self.cache)
+
+    def test_get_is_served_from_cache(self, mock_request):
+        mock_request.return_value = _volume('1')
+        first = self.volumes.get('1')
+        second = self.volumes.get('1')
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertIsNot(first._info, second._info)
+        self.assertEqual(1, self.cache.hits)
+
+    def test_get_with_session_is_not_cached(self, mock_request):
+        mock_request.return_value = _volume('1')
+        self.volumes.get('1', session_id='session')
+        self.volumes.get('1', session_id='session')
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_action_invalidates(self, mock_request):
+        mock_request.side_effect = [_volume('1'),
+                                    _volume('1', 'disabling'),
+                                    _volume('1', 'disabled')]
+        self.volumes.get('1')
+        self.volumes.disable('1')
+        self.assertEqual('disabled', self.volumes.get('1').status)
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_update_invalidates(self, mock_request):
+        mock_request.side_effect = [_volume('1'), _volume('1'),
+                                    _volume('1')]
+        self.volumes.get('1')
+        self.volumes.update('1', name='new')
+        self.volumes.get('1')
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_failed_action_invalidates(self, mock_request):
+        mock_request.side_effect = [_volume('1'), ValueError('boom'),
+                                    _volume('1')]
+        self.volumes.get('1')
+        self.assertRaises(ValueError, self.volumes.disable, '1')
+        self.volumes.get('1')
+        self.assertEqual(3, mock_request.call_count)
+
+    @mock.patch('sgsclient.client.HTTPClient.raw_request')
+    def test_delete_invalidates(self, mock_raw, mock_request):
+        mock_request.return_value = _volume('1')
+        self.volumes.get('1')
+        self.volumes.delete('1')
+        self.volumes.get('1')
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_replicate_action_invalidates_volume(self, mock_request):
+        mock_request.side_effect = [_volume('1'),
+                                    ({}, {'replicate': {'id': '1'}}),
+                                    _volume('1')]
+        replicate_manager = replicates.ReplicateManager(cs.http_client,
+                                                        self.cache)
+        self.volumes.get('1')
+        replicate_manager.enable('1')
+        self.volumes.get('1')
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_tenants_do_not_share_entries(self, mock_request):
+        mock_request.return_value = _volume('1')
+        other = volumes.VolumeManager(
+            client.HTTPClient('http://endpoint/v1/other', token='token'),
+            self.cache)
+        self.volumes.get('1')
+        other.get('1')
+        self.assertEqual(2, mock_request.call_count)
+        other.get('1')
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_refresh_is_not_served_from_cache(self, mock_request):
+        mock_request.side_effect = [_volume('1'),
+                                    ({}, {'volumes': []}),
+                                    _volume('1', 'disabled')]
+        self.volumes.get('1')
+        refreshed = self.volumes.refresh(['1'])
+        self.assertEqual('disabled', refreshed[0].status)
+        self.assertEqual('disabled', self.volumes.get('1').status)
+        self.assertEqual(3, mock_request.call_count)
@@ -0,0 +1,100 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from sgsclient.openstack.common.apiclient import exceptions
+from sgsclient import resource_index
+from sgsclient.tests.unit import base
+from sgsclient.tests.unit.v1 import fakes
+from sgsclient import utils
+from sgsclient.v1 import snapshots
+
+cs = fakes.FakeClient()
+
+
+def _snapshot(snapshot_id, name, status='available', volume_id='v1',
+              **kwargs):
+    info = {'id': snapshot_id, 'name': name, 'status': status,
+            'volume_id': volume_id}
+    info.update(kwargs)
+    return snapshots.Snapshot(None, info, loaded=True)
+
+
+class ResourceIndexTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ResourceIndexTest, self).setUp()
+        self.index = resource_index.ResourceIndex(
+            [_snapshot('1', 'a'), _snapshot('2', 'b', volume_id='v2'),
+             _snapshot('3', 'b', status='error', metadata={'k': 'v'})],
+            keys=('id', 'name', 'status', 'volume_id', 'metadata'))
+
+    def test_lookups(self):
+        self.assertEqual(3, len(self.index))
+        self.assertIn('2', self.index)
+        self.assertEqual('a', self.index.get('1').name)
+        self.assertIsNone(self.index.get('4'))
+        self.assertEqual(['2', '3'],
+                         [s.id for s in self.index.findall(name='b')])
+        self.assertEqual('3', self.index.find(name='b', status='error').id)
+        self.assertEqual([], self.index.findall(name='c'))
+
+    def test_unindexed_and_unhashable_attributes_are_scanned(self):
+        self.assertEqual('3', self.index.find(metadata={'k': 'v'}).id)
+        self.assertEqual([], self.index.findall(size=1))
+
+    def test_find_errors(self):
+        self.assertRaises(exceptions.NotFound, self.index.find, name='c')
+        self.assertRaises(exceptions.NoUniqueMatch, self.index.find,
+                          name='b')
+
+    def test_update_replaces_indexed_state(self):
+        self.index.update([_snapshot('2', 'c', volume_id='v1')])
+        self.assertEqual([], self.index.findall(volume_id='v2'))
+        self.assertEqual(['1', '2', '3'], sorted(
+            s.id for s in self.index.findall(volume_id='v1')))
+        self.assertEqual('2', self.index.find(name='c').id)
+
+    def test_discard(self):
+        self.index.discard('1')
+        self.index.discard('missing')
+        self.assertNotIn('1', self.index)
+        self.assertEqual([], self.index.findall(name='a'))
+
+
+class LoadIndexTest(base.TestCaseShell):
+
+    @mock.patch('sgsclient.client.HTTPClient.json_request')
+    def test_find_uses_loaded_index(self, mock_request):
+        mock_request.side_effect = [
+            ({}, {'snapshots': [{'id': str(i), 'name': 'snap-%d' % i}
+                                for i in range(100)]}),
+            ({}, {'snapshots': []})]
+        index = cs.snapshots.load_index()
+        self.addCleanup(setattr, cs.snapshots, 'resource_index', None)
+        self.assertEqual(100, len(index))
+        self.assertEqual(
+            mock.call('GET', '/snapshots/detail?all_tenants=1', headers={}),
+            mock_request.call_args_list[0])
+        mock_request.reset_mock()
+        for i in range(100):
+            self.assertEqual(str(i),
+                             cs.snapshots.find(name='snap-%d' % i).id)
+            self.assertEqual(str(i),
+                             utils.find_resource(cs.snapshots, str(i)).id)
+            self.assertEqual(str(i), utils.find_resource(
+                cs.snapshots, 'snap-%d' % i).id)
+        self.assertEqual([], cs.snapshots.findall(name='other'))
+        self.assertRaises(exceptions.NotFound, cs.snapshots.find,
+                          name='other')
+        self.assertFalse(mock_request.called)
@@ -0,0 +1,180 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from keystoneclient import exceptions as ks_exceptions
+import mock
+from oslo_serialization import jsonutils
+import requests
+
+from sgsclient import client
+from sgsclient import exceptions
+from sgsclient import retry
+from sgsclient.tests.unit import base
+from sgsclient.v1 import client as v1_client
+
+
+def _response(status_code, body=None, headers=None):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers['Content-Type'] = 'application/json'
+    resp.headers.update(headers or {})
+    resp._content = jsonutils.dump_as_bytes(body or {})
+    resp.raw = mock.Mock(version=11)
+    return resp
+
+
+class RetryBudgetTest(base.TestCaseShell):
+
+    @mock.patch('time.time', return_value=100)
+    def test_retries_are_a_fraction_of_requests(self, mock_time):
+        budget = retry.RetryBudget(ratio=0.5, min_per_second=0,
+                                   max_tokens=1)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    @mock.patch('time.time')
+    def test_tokens_are_added_over_time(self, mock_time):
+        mock_time.return_value = 100
+        budget = retry.RetryBudget(min_per_second=1, max_tokens=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        mock_time.return_value = 101
+        self.assertTrue(budget.withdraw())
+        mock_time.return_value = 200
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+
+@mock.patch('time.sleep')
+class RetryPolicyTest(base.TestCaseShell):
+
+    def _policy(self, **kwargs):
+        kwargs.setdefault('budget', None)
+        kwargs.setdefault('jitter', 0)
+        return retry.RetryPolicy(**kwargs)
+
+    def test_retries_idempotent_requests(self, mock_sleep):
+        send = mock.Mock(side_effect=[exceptions.ConnectionRefused(),
+                                      exceptions.ClientException(503),
+                                      'resp'])
+        self.assertEqual('resp', self._policy().call('GET', send))
+        self.assertEqual(3, send.call_count)
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mock_sleep.call_args_list)
+
+    def test_gives_up_after_retries(self, mock_sleep):
+        send = mock.Mock(side_effect=exceptions.ClientException(502))
+        self.assertRaises(exceptions.ClientException,
+                          self._policy(retries=2).call, 'DELETE', send)
+        self.assertEqual(3, send.call_count)
+
+    def test_other_errors_are_raised(self, mock_sleep):
+        send = mock.Mock(side_effect=exceptions.NotFound(404))
+        self.assertRaises(exceptions.NotFound,
+                          self._policy().call, 'GET', send)
+        self.assertEqual(1, send.call_count)
+
+    def test_keystone_connection_errors_are_retried(self, mock_sleep):
+        send = mock.Mock(side_effect=[ks_exceptions.ConnectionRefused(),
+                                      'resp'])
+        self.assertEqual('resp', self._policy().call('HEAD', send))
+
+    def test_post_is_only_retried_on_request(self, mock_sleep):
+        send = mock.Mock(side_effect=exceptions.ConnectionRefused())
+        policy = self._policy()
+        self.assertRaises(exceptions.ConnectionRefused,
+                          policy.call, 'POST', send)
+        self.assertEqual(1, send.call_count)
+        send.side_effect = [exceptions.ConnectionRefused(), 'resp']
+        self.assertEqual('resp', policy.call('POST', send, retry=True))
+
+    def test_honours_retry_after(self, mock_sleep):
+        error = exceptions.OverLimit(
+            413, response=_response(413, headers={'Retry-After': '7'}))
+        send = mock.Mock(side_effect=[error, 'resp'])
+        self.assertEqual('resp', self._policy().call('GET', send))
+        mock_sleep.assert_called_once_with(7)
+
+    def test_long_retry_after_is_raised(self, mock_sleep):
+        error = exceptions.OverLimit(
+            413, response=_response(413, headers={'Retry-After': '600'}))
+        send = mock.Mock(side_effect=error)
+        self.assertRaises(exceptions.OverLimit,
+                          self._policy().call, 'GET', send)
+        self.assertFalse(mock_sleep.called)
+
+    def test_spent_budget_stops_retries(self, mock_sleep):
+        budget = retry.RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+        policy = self._policy(budget=budget)
+        send = mock.Mock(side_effect=exceptions.ClientException(503))
+        self.assertRaises(exceptions.ClientException,
+                          policy.call, 'GET', send)
+        self.assertEqual(2, send.call_count)
+
+
+@mock.patch('time.sleep')
+class TransportRetryTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(TransportRetryTest, self).setUp()
+        self.policy = retry.RetryPolicy(budget=None,
+                                        actions=['reset_status'])
+
+    @mock.patch.object(client.ConnectionPool, 'request')
+    def test_http_client_retries(self, mock_request, mock_sleep):
+        mock_request.side_effect = [requests.exceptions.ConnectionError(),
+                                    _response(503),
+                                    _response(200, {'volumes': []})]
+        http = client.HTTPClient('http://endpoint', token='token',
+                                 retry_policy=self.policy)
+        resp, body = http.json_request('GET', '/volumes')
+        self.assertEqual({'volumes': []}, body)
+        self.assertEqual(3, mock_request.call_count)
+
+    @mock.patch.object(client.ConnectionPool, 'request')
+    def test_http_client_does_not_retry_by_default(self, mock_request,
+                                                   mock_sleep):
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+        http = client.HTTPClient('http://endpoint', token='token')
+        self.assertRaises(exceptions.ConnectionRefused,
+                          http.json_request, 'GET', '/volumes')
+        self.assertEqual(1, mock_request.call_count)
+
+    @mock.patch('keystoneclient.adapter.Adapter.request')
+    def test_session_client_retries(self, mock_request, mock_sleep):
+        mock_request.side_effect = [ks_exceptions.ConnectionRefused(),
+                                    _response(504),
+                                    _response(204)]
+        session = client.SessionClient(session=mock.Mock(),
+                                       retry_policy=self.policy)
+        resp = session.raw_request('DELETE', '/volumes/1')
+        self.assertEqual(204, resp.status_code)
+        self.assertEqual(3, mock_request.call_count)
+
+    @mock.patch.object(client.ConnectionPool, 'request')
+    def test_opted_in_actions_are_retried(self, mock_request, mock_sleep):
+        cs = v1_client.Client('http://endpoint', token='token',
+                              retry_policy=self.policy)
+        mock_request.side_effect = [_response(503), _response(202)]
+        cs.volumes.reset_state('1', 'enabled')
+        self.assertEqual(2, mock_request.call_count)
+
+        mock_request.reset_mock()
+        mock_request.side_effect = [_response(503), _response(202)]
+        self.assertRaises(exceptions.ClientException, cs.volumes.disable, '1')
+        self.assertEqual(1, mock_request.call_count)
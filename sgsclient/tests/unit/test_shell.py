@@ -0,0 +1,184 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+
+import fixtures
+from keystoneclient.auth import token_endpoint
+import mock
+import six
+
+from sgsclient.openstack.common.apiclient import exceptions
+from sgsclient import shell
+from sgsclient.tests.unit import base
+from sgsclient.v1 import shell as v1_shell
+
+
+class ShellManifestTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ShellManifestTest, self).setUp()
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.EnvironmentVariable('OS_CACHE_DIR',
+                                                     cache_dir))
+        self.stdout = self.useFixture(fixtures.MonkeyPatch(
+            'sys.stdout', six.StringIO())).new_value
+
+    def test_bash_completion(self):
+        shell.SGServiceShell().main(['bash-completion'])
+        words = self.stdout.getvalue().split()
+        self.assertIn('list', words)
+        self.assertIn('snapshot-delete', words)
+        self.assertIn('--all-tenants', words)
+        self.assertNotIn('bash-completion', words)
+        self.assertNotIn('bash_completion', words)
+
+    def test_manifest_is_reused(self):
+        shell.SGServiceShell().main(['bash-completion'])
+        first = self.stdout.getvalue()
+        with mock.patch.object(shell.SGServiceShell,
+                               'get_subcommand_parser') as mock_parser:
+            shell.SGServiceShell().main(['bash-completion'])
+            shell.SGServiceShell().main(['help', 'list'])
+        self.assertFalse(mock_parser.called)
+        self.assertTrue(self.stdout.getvalue().startswith(first * 2))
+
+    def test_help_for_subcommand(self):
+        shell.SGServiceShell().main(['help', 'backup-delete'])
+        self.assertIn('usage: sgs backup-delete', self.stdout.getvalue())
+
+    def test_help_for_unknown_subcommand(self):
+        self.assertRaises(exceptions.CommandError,
+                          shell.SGServiceShell().main, ['help', 'nope'])
+
+
+class ShellSubcommandTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ShellSubcommandTest, self).setUp()
+        self.stdout = self.useFixture(fixtures.MonkeyPatch(
+            'sys.stdout', six.StringIO())).new_value
+        self.stderr = self.useFixture(fixtures.MonkeyPatch(
+            'sys.stderr', six.StringIO())).new_value
+        self.client = self.useFixture(fixtures.MockPatch(
+            'sgsclient.client.Client')).mock
+        self.argv = ['--os-no-client-auth', '--sgs-url', 'http://sgs/v1',
+                     '--os-username', 'user']
+
+    def test_only_the_invoked_subcommand_is_registered(self):
+        do_list = mock.Mock(arguments=[
+            (('--all-tenants',), {'action': 'store_true'})])
+        self.useFixture(fixtures.MockPatchObject(v1_shell, 'do_list',
+                                                 do_list))
+        sgs = shell.SGServiceShell()
+        sgs.main(self.argv + ['list', '--all-tenants'])
+        self.assertEqual(['list'], list(sgs.subcommands))
+        self.assertEqual(1, do_list.call_count)
+        client, args = do_list.call_args[0]
+        self.assertIs(self.client.return_value, client)
+        self.assertTrue(args.all_tenants)
+
+    def test_unknown_subcommand_lists_all_of_them(self):
+        sgs = shell.SGServiceShell()
+        e = self.assertRaises(SystemExit, sgs.main, self.argv + ['nope'])
+        self.assertEqual(2, e.code)
+        self.assertIn("invalid choice: 'nope'", self.stderr.getvalue())
+        self.assertIn('snapshot-delete', self.stderr.getvalue())
+        self.assertIn('bash-completion', sgs.subcommands)
+        self.assertFalse(self.client.called)
+
+    def test_underscore_name_is_not_registered_alone(self):
+        sgs = shell.SGServiceShell()
+        self.assertRaises(SystemExit, sgs.main,
+                          self.argv + ['backup_delete', '1'])
+        self.assertIn("invalid choice: 'backup_delete'",
+                      self.stderr.getvalue())
+        self.assertIn('backup-delete', sgs.subcommands)
+
+    def test_subcommand_help(self):
+        sgs = shell.SGServiceShell()
+        e = self.assertRaises(SystemExit, sgs.main,
+                              ['backup-delete', '--help'])
+        self.assertEqual(0, e.code)
+        self.assertIn('usage: sgs backup-delete', self.stdout.getvalue())
+        self.assertFalse(self.client.called)
+
+
+class ShellAuthCacheTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(ShellAuthCacheTest, self).setUp()
+        self.cache_dir = self.useFixture(fixtures.TempDir()).path
+        for name, value in (('OS_USERNAME', 'user'),
+                            ('OS_PASSWORD', 'secret'),
+                            ('OS_PROJECT_NAME', 'demo'),
+                            ('OS_AUTH_URL', 'http://keystone/v2.0'),
+                            ('OS_CACHE', '1'),
+                            ('OS_CACHE_DIR', self.cache_dir)):
+            self.useFixture(fixtures.EnvironmentVariable(name, value))
+        self.discover = self.useFixture(fixtures.MockPatchObject(
+            shell.SGServiceShell, '_discover_auth_versions',
+            return_value=('http://keystone/v2.0', None))).mock
+        password = 'keystoneclient.auth.identity.generic.password.Password'
+        self.get_endpoint = self.useFixture(fixtures.MockPatch(
+            password + '.get_endpoint',
+            return_value='http://sgs/v1/demo')).mock
+        expires = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        self.get_access = self.useFixture(fixtures.MockPatch(
+            password + '.get_access',
+            return_value=mock.Mock(auth_token='cached-token',
+                                   expires=expires))).mock
+        self.client = self.useFixture(fixtures.MockPatch(
+            'sgsclient.client.Client')).mock
+        self.do_list = mock.Mock(arguments=[])
+        self.useFixture(fixtures.MockPatchObject(v1_shell, 'do_list',
+                                                 self.do_list))
+
+    def test_cached_token_is_reused(self):
+        shell.SGServiceShell().main(['list'])
+        self.assertEqual(1, self.discover.call_count)
+        self.assertEqual(1, self.get_access.call_count)
+
+        shell.SGServiceShell().main(['list'])
+        self.assertEqual(1, self.discover.call_count)
+        self.assertEqual(1, self.get_endpoint.call_count)
+        self.assertEqual(1, self.get_access.call_count)
+        args, kwargs = self.client.call_args
+        self.assertEqual(('1', 'http://sgs/v1/demo'), args)
+        self.assertIsInstance(kwargs['auth'], token_endpoint.Token)
+        self.assertEqual('cached-token', kwargs['auth'].token)
+        self.assertEqual('http://sgs/v1/demo', kwargs['auth'].endpoint)
+        self.assertEqual(2, self.do_list.call_count)
+
+    def test_unauthorized_clears_the_cache(self):
+        shell.SGServiceShell().main(['list'])
+        self.do_list.side_effect = exceptions.Unauthorized()
+        self.assertRaises(exceptions.Unauthorized,
+                          shell.SGServiceShell().main, ['list'])
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+        self.do_list.side_effect = None
+        shell.SGServiceShell().main(['list'])
+        self.assertEqual(2, self.discover.call_count)
+        self.assertEqual(2, self.get_access.call_count)
+
+    def test_other_password_is_not_served_from_cache(self):
+        shell.SGServiceShell().main(['list'])
+        self.useFixture(fixtures.EnvironmentVariable('OS_PASSWORD',
+                                                     'wrong'))
+        shell.SGServiceShell().main(['list'])
+        self.assertEqual(2, self.get_access.call_count)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name)) as f:
+                self.assertNotIn('secret', f.read())
@@ -0,0 +1,31 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests of the asyncio client.
+
+They are written with coroutines and async generators, which older
+interpreters fail to parse, so the modules of this package are only
+imported on Python 3.6 or later.
+"""
+
+import os
+import sys
+
+
+def load_tests(loader, tests, pattern):
+    if sys.version_info < (3, 6):
+        return tests
+    this_dir = os.path.dirname(__file__)
+    top_dir = os.path.abspath(os.path.join(this_dir, *(['..'] * 5)))
+    tests.addTests(loader.discover(this_dir, pattern or 'test*.py',
+                                   top_level_dir=top_dir))
+    return tests
@@ -0,0 +1,280 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import threading
+import time
+
+import mock
+from oslo_serialization import jsonutils
+from oslo_utils import importutils
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+import testtools
+
+from sgsclient import exceptions
+from sgsclient.tests.unit import base
+from sgsclient.v1 import aio_client
+
+aiohttp = importutils.try_import('aiohttp')
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _collect(async_iterable):
+    items = []
+
+    async def _consume():
+        async for item in async_iterable:
+            items.append(item)
+
+    _run(_consume())
+    return items
+
+
+def _backups(*ids):
+    return ({}, {'backups': [{'id': i, 'name': 'backup-%s' % i}
+                             for i in ids]})
+
+
+class AsyncManagerTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(AsyncManagerTest, self).setUp()
+        self.api = mock.Mock(project_id=None)
+        self.api.json_request = mock.AsyncMock()
+        self.api.raw_request = mock.AsyncMock()
+
+    def test_list(self):
+        self.api.json_request.return_value = _backups('1', '2')
+        manager = aio_client.BackupManager(self.api)
+        backups = _run(manager.list(limit=2))
+        self.assertEqual(['1', '2'], [b.id for b in backups])
+        self.api.json_request.assert_called_once_with(
+            'GET', '/backups?limit=2', headers={})
+
+    def test_get_returns_loaded_resource(self):
+        self.api.json_request.return_value = ({}, {'volume': {'id': '1'}})
+        manager = aio_client.VolumeManager(self.api)
+        volume = _run(manager.get('1'))
+        self.assertEqual('1', volume.id)
+        self.assertTrue(volume.is_loaded())
+        self.assertRaises(AttributeError, getattr, volume, 'name')
+        self.assertEqual(1, self.api.json_request.call_count)
+
+    def test_action(self):
+        self.api.json_request.return_value = (
+            {}, {'replicate': {'id': '1', 'replicate_status': 'enabling'}})
+        manager = aio_client.ReplicateManager(self.api)
+        volume = _run(manager.enable('1'))
+        self.assertEqual('enabling', volume.replicate_status)
+        self.api.json_request.assert_called_once_with(
+            'POST', '/volume_replicate/1/action',
+            data={'enable_replicate': None})
+
+    def test_update_without_changes_is_awaitable(self):
+        manager = aio_client.SnapshotManager(self.api)
+        self.assertIsNone(_run(manager.update('1')))
+        self.assertFalse(self.api.json_request.called)
+
+    def test_delete(self):
+        manager = aio_client.CheckpointManager(self.api)
+        _run(manager.delete('1'))
+        self.api.raw_request.assert_called_once_with(
+            'DELETE', '/checkpoints/1', headers={})
+
+    def test_list_iter_follows_markers(self):
+        self.api.json_request.side_effect = [
+            _backups('1', '2'), _backups('3', '4'), _backups('5'),
+            _backups()]
+        manager = aio_client.BackupManager(self.api)
+        backups = _collect(manager.list_iter(page_size=2))
+        self.assertEqual(['1', '2', '3', '4', '5'], [b.id for b in backups])
+        self.assertEqual(
+            [mock.call('GET', '/backups?limit=2', headers={}),
+             mock.call('GET', '/backups?limit=2&marker=2', headers={}),
+             mock.call('GET', '/backups?limit=2&marker=4', headers={}),
+             mock.call('GET', '/backups?limit=2&marker=5', headers={})],
+            self.api.json_request.call_args_list)
+
+    def test_list_iter_stops_when_marker_is_ignored(self):
+        self.api.json_request.return_value = _backups('1', '2')
+        manager = aio_client.BackupManager(self.api)
+        backups = _collect(manager.list_iter())
+        self.assertEqual(['1', '2'], [b.id for b in backups])
+        self.assertEqual(2, self.api.json_request.call_count)
+
+    def test_list_iter_does_not_stream(self):
+        manager = aio_client.BackupManager(self.api)
+        self.assertRaises(ValueError, _collect,
+                          manager.list_iter(stream=True))
+        self.assertFalse(self.api.raw_request.called)
+
+    def test_list_columns(self):
+        self.api.json_request.side_effect = [
+            _backups('1', '2'), _backups('3'), _backups()]
+        manager = aio_client.BackupManager(self.api)
+        columns = _run(manager.list_columns(['id'], page_size=2))
+        self.assertEqual({'id': ['1', '2', '3']}, dict(columns))
+
+    def test_find(self):
+        self.api.json_request.side_effect = [_backups('1', '2'), _backups()]
+        manager = aio_client.BackupManager(self.api)
+        backup = _run(manager.find(name='backup-2'))
+        self.assertEqual('2', backup.id)
+        self.assertEqual('backup-2', backup.name)
+        self.assertEqual(
+            mock.call('GET', '/backups/detail?all_tenants=1&name=backup-2',
+                      headers={}),
+            self.api.json_request.call_args_list[0])
+
+    def test_get_many_returns_not_found(self):
+        def _get(method, url, headers):
+            if url.endswith('missing'):
+                raise exceptions.NotFound(404)
+            return {}, {'backup': {'id': url.rsplit('/', 1)[1]}}
+
+        self.api.json_request.side_effect = _get
+        manager = aio_client.BackupManager(self.api)
+        results = _run(manager.get_many(['1', 'missing', '3']))
+        self.assertEqual('1', results[0].id)
+        self.assertIsInstance(results[1], exceptions.NotFound)
+        self.assertEqual('3', results[2].id)
+
+    @mock.patch('asyncio.sleep', new_callable=mock.AsyncMock)
+    def test_wait_for(self, mock_sleep):
+        self.api.json_request.side_effect = [
+            ({}, {'backups': [{'id': '1', 'status': 'restoring'}]}),
+            ({}, {'backups': [{'id': '1', 'status': 'available'}]})]
+        manager = aio_client.BackupManager(self.api)
+        backup = _run(manager.wait_for('1'))
+        self.assertEqual('available', backup.status)
+        self.assertEqual(1, mock_sleep.call_count)
+
+    def test_list_stream(self):
+        chunks = [b'{"backups": [{"id": "1"}, ', b'{"id": "2"}]}']
+
+        async def _iter_content(chunk_size):
+            for chunk in chunks:
+                yield chunk
+
+        resp = mock.Mock(iter_content=_iter_content)
+        self.api.raw_request.return_value = resp
+        manager = aio_client.BackupManager(self.api)
+        backups = _collect(manager.list(stream=True))
+        self.assertEqual(['1', '2'], [b.id for b in backups])
+        self.api.raw_request.assert_called_once_with(
+            'GET', '/backups', headers={}, stream=True)
+        resp.close.assert_called_once_with()
+
+
+class SlowHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight,
+                                       server.in_flight)
+        time.sleep(0.05)
+        with server.lock:
+            server.in_flight -= 1
+        volume_id = self.path.rsplit('/', 1)[1]
+        if self.headers.get('X-Auth-Token') == 'expired':
+            self.send_response(401)
+            body = b'{"error": {"message": "Token expired"}}'
+        elif volume_id == 'missing':
+            self.send_response(404)
+            body = b'{"itemNotFound": {"message": "No volume"}}'
+        else:
+            self.send_response(200)
+            body = jsonutils.dump_as_bytes({'volume': {'id': volume_id}})
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadedServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+@testtools.skipUnless(aiohttp, 'the asyncio client needs aiohttp')
+class AsyncHTTPClientTest(base.TestCaseShell):
+
+    def setUp(self):
+        super(AsyncHTTPClientTest, self).setUp()
+        self.server = ThreadedServer(('127.0.0.1', 0), SlowHandler)
+        self.server.lock = threading.Lock()
+        self.server.in_flight = self.server.max_in_flight = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.endpoint = 'http://127.0.0.1:%d' % self.server.server_port
+
+    def test_requests_run_concurrently(self):
+        async def _get_all():
+            async with aio_client.Client(self.endpoint, token='token') as sgs:
+                return await sgs.volumes.get_many(
+                    [str(i) for i in range(20)] + ['missing'],
+                    concurrency=20)
+
+        results = _run(_get_all())
+        self.assertEqual([str(i) for i in range(20)],
+                         [v.id for v in results[:20]])
+        self.assertIsInstance(results[20], exceptions.NotFound)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_streamed_response(self):
+        async def _stream():
+            async with aio_client.Client(self.endpoint, token='token') as sgs:
+                resp = await sgs.http_client.raw_request(
+                    'GET', '/volumes/1', stream=True)
+                try:
+                    return b''.join([c async for c in resp.iter_content(4)])
+                finally:
+                    resp.close()
+
+        self.assertEqual({'volume': {'id': '1'}},
+                         jsonutils.loads(_run(_stream())))
+
+    def test_expired_session_token_is_renewed(self):
+        session = mock.Mock()
+        session.get_token.side_effect = ['expired', 'fresh']
+
+        async def _get():
+            async with aio_client.Client(self.endpoint,
+                                         session=session) as sgs:
+                return await sgs.volumes.get('1')
+
+        self.assertEqual('1', _run(_get()).id)
+        self.assertEqual(2, session.get_token.call_count)
+        session.invalidate.assert_called_once_with(None)
+
+    def test_given_token_is_not_renewed(self):
+        async def _get():
+            async with aio_client.Client(self.endpoint,
+                                         token='expired') as sgs:
+                return await sgs.volumes.get('1')
+
+        self.assertRaises(exceptions.AuthorizationFailure, _run, _get())
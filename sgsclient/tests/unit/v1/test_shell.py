@@ -0,0 +1,127 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import argparse
+import threading
+
+import mock
+
+from sgsclient import exceptions
+from sgsclient.tests.unit import base
+from sgsclient.tests.unit.v1 import fakes
+from sgsclient.v1 import shell
+
+cs = fakes.FakeClient()
+
+
+class DeleteCommandsTest(base.TestCaseShell):
+
+    def _find(self, cs, item):
+        if item.startswith('missing'):
+            raise exceptions.CommandError('No snapshot %s' % item)
+        return mock.Mock(id=item)
+
+    @mock.patch('sgsclient.shell_utils.find_snapshot')
+    @mock.patch('sgsclient.client.HTTPClient.raw_request')
+    @mock.patch('six.moves.builtins.print')
+    def test_snapshot_delete_in_parallel(self, mock_print, mock_request,
+                                         mock_find):
+        mock_find.side_effect = self._find
+        items = ['snap-%d' % i for i in range(10)] + ['missing-1']
+        args = argparse.Namespace(snapshot=items, parallel=4)
+        shell.do_snapshot_delete(cs, args)
+
+        self.assertEqual(10, mock_request.call_count)
+        printed = [c[0][0] for c in mock_print.call_args_list]
+        expected = ["Request to delete snapshot %s has been accepted." % i
+                    for i in items[:-1]]
+        expected.append("Delete for snapshot missing-1 failed: "
+                        "No snapshot missing-1")
+        self.assertEqual(expected, printed)
+
+    @mock.patch('sgsclient.shell_utils.find_snapshot')
+    @mock.patch('sgsclient.client.HTTPClient.raw_request')
+    @mock.patch('six.moves.builtins.print')
+    def test_snapshot_delete_prints_as_it_goes(self, mock_print,
+                                               mock_request, mock_find):
+        events = []
+        mock_find.side_effect = self._find
+        mock_request.side_effect = (
+            lambda method, url, **kwargs: events.append(url))
+        mock_print.side_effect = lambda line: events.append(line[-9:])
+        args = argparse.Namespace(snapshot=['snap-1', 'snap-2'], parallel=1)
+        shell.do_snapshot_delete(cs, args)
+        self.assertEqual(['/snapshots/snap-1', 'accepted.',
+                          '/snapshots/snap-2', 'accepted.'], events)
+
+    @mock.patch('sgsclient.shell_utils.find_snapshot')
+    @mock.patch('sgsclient.client.HTTPClient.raw_request')
+    @mock.patch('six.moves.builtins.print')
+    def test_parallel_delete_prints_before_the_end(self, mock_print,
+                                                   mock_request, mock_find):
+        printed = threading.Event()
+        waits = []
+        mock_find.side_effect = self._find
+        mock_print.side_effect = lambda line: printed.set()
+
+        def _delete(method, url, **kwargs):
+            # The slow delete only finishes once the first result has
+            # been printed.
+            if url.endswith('slow'):
+                waits.append(printed.wait(5))
+
+        mock_request.side_effect = _delete
+        args = argparse.Namespace(snapshot=['snap-fast', 'snap-slow'],
+                                  parallel=2)
+        shell.do_snapshot_delete(cs, args)
+        self.assertEqual([True], waits)
+        self.assertEqual(2, mock_print.call_count)
+
+    @mock.patch('sgsclient.shell_utils.find_backup')
+    @mock.patch('six.moves.builtins.print')
+    def test_backup_delete_all_failed(self, mock_print, mock_find):
+        mock_find.side_effect = self._find
+        args = argparse.Namespace(backup=['missing-1', 'missing-2'],
+                                  parallel=2)
+        self.assertRaises(exceptions.CommandError,
+                          shell.do_backup_delete, cs, args)
+
+
+class WaitOptionTest(base.TestCaseShell):
+
+    def _args(self, **kwargs):
+        return argparse.Namespace(replication='rep-1', force=False,
+                                  wait_timeout=60, **kwargs)
+
+    @mock.patch('sgsclient.shell_utils.find_replication')
+    @mock.patch('sgsclient.utils.print_dict')
+    def test_failover_waits(self, mock_print, mock_find):
+        mock_find.return_value = mock.Mock(id='rep-1')
+        failing = mock.Mock(id='rep-1', status='failing-over')
+        done = mock.Mock(id='rep-1', status='failed-over')
+        with mock.patch.object(cs.replications, 'failover',
+                               return_value=failing), \
+                mock.patch.object(cs.replications, 'wait_for',
+                                  return_value=done) as mock_wait:
+            shell.do_replication_failover(cs, self._args(wait=True))
+        mock_wait.assert_called_once_with(failing, timeout=60)
+        mock_print.assert_called_once_with(done.to_dict())
+
+    @mock.patch('sgsclient.shell_utils.find_replication')
+    @mock.patch('sgsclient.utils.print_dict')
+    def test_failover_without_wait(self, mock_print, mock_find):
+        mock_find.return_value = mock.Mock(id='rep-1')
+        with mock.patch.object(cs.replications, 'failover'), \
+                mock.patch.object(cs.replications,
+                                  'wait_for') as mock_wait:
+            shell.do_replication_failover(cs, self._args(wait=False))
+        self.assertFalse(mock_wait.called)
@@ -13,9 +13,11 @@
 from __future__ import print_function
 
 import os
-import prettytable
+import random
 import six
+from six.moves import queue
 import sys
+import threading
 import uuid
 
 from oslo_utils import encodeutils
@@ -47,6 +49,172 @@ def env(*vars, **kwargs):
     return kwargs.get('default', '')
 
 
+_PREFETCH_DONE = object()
+
+
+def prefetch(iterable, depth=1):
+    """Iterate over ``iterable`` while a worker thread reads ahead.
+
+    Up to ``depth`` items are produced in the background while the caller
+    is still busy with the current one, so at most ``depth`` extra items
+    are held in memory. Errors raised by ``iterable`` are re-raised to the
+    caller when it reaches them.
+    """
+    items = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker():
+        try:
+            for item in iterable:
+                if not _put((item, None)):
+                    return
+        except Exception:
+            _put((None, sys.exc_info()))
+            return
+        _put((_PREFETCH_DONE, None))
+
+    worker = threading.Thread(target=_worker)
+    worker.daemon = True
+    worker.start()
+    try:
+        while True:
+            item, exc_info = items.get()
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            if item is _PREFETCH_DONE:
+                return
+            yield item
+    finally:
+        # Tell the worker to give up if the caller stopped early.
+        stop.set()
+
+
+def parallel_map(func, items, concurrency=1):
+    """Call ``func`` on every item using up to ``concurrency`` threads.
+
+    Results are returned in the same order as ``items``. If any call
+    raises, no further items are started and the error of the earliest
+    failing item is re-raised once the running calls have finished.
+    """
+    items = list(items)
+    concurrency = max(1, min(concurrency or 1, len(items)))
+    if concurrency == 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    errors = {}
+    pending = queue.Queue()
+    for index, item in enumerate(items):
+        pending.put((index, item))
+
+    def _worker():
+        while not errors:
+            try:
+                index, item = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[index] = func(item)
+            except Exception:
+                errors[index] = sys.exc_info()
+
+    workers = [threading.Thread(target=_worker) for _i in range(concurrency)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if errors:
+        six.reraise(*errors[min(errors)])
+    return results
+
+
+def parallel_imap(func, items, concurrency=1):
+    """Lazy :func:`parallel_map`: yield the results as they are ready.
+
+    Each result is yielded as soon as its call and the calls of all the
+    items before it have finished, so results keep the order of
+    ``items`` while the caller can report progress. If a call raises, no
+    further items are started, and its error is raised when its turn to
+    be yielded comes.
+    """
+    items = list(items)
+    concurrency = max(1, min(concurrency or 1, len(items)))
+    if concurrency == 1:
+        for item in items:
+            yield func(item)
+        return
+
+    results = {}
+    errors = {}
+    stopped = []
+    ready = threading.Condition()
+    pending = queue.Queue()
+    for index, item in enumerate(items):
+        pending.put((index, item))
+
+    def _worker():
+        while not errors and not stopped:
+            try:
+                index, item = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = func(item)
+            except Exception:
+                with ready:
+                    errors[index] = sys.exc_info()
+                    ready.notify_all()
+            else:
+                with ready:
+                    results[index] = result
+                    ready.notify_all()
+
+    for _i in range(concurrency):
+        worker = threading.Thread(target=_worker)
+        worker.daemon = True
+        worker.start()
+    try:
+        for index in range(len(items)):
+            with ready:
+                while index not in results and index not in errors:
+                    ready.wait()
+                if index in errors:
+                    six.reraise(*errors[index])
+                result = results.pop(index)
+            yield result
+    finally:
+        # The caller stopped early, or an error is raised: do not start
+        # the items left.
+        stopped.append(True)
+
+
+def backoff(initial=1, maximum=30, factor=2, jitter=0.5):
+    """Yield exponentially growing delays, in seconds.
+
+    Each delay is randomized by up to ``jitter`` times its value, so that
+    many clients started together do not keep hitting the server in step.
+
+    :param initial: First delay.
+    :param maximum: Upper bound of the delays.
+    :param factor: Growth of the delay between two attempts.
+    :param jitter: Fraction of the delay that is randomized, from 0 to 1.
+    """
+    delay = initial
+    while True:
+        yield min(maximum, delay * random.uniform(1 - jitter, 1 + jitter))
+        delay = min(delay * factor, maximum)
+
+
 def _print(pt, order):
     if sys.version_info >= (3, 0):
         print(pt.get_string(sortby=order))
@@ -67,6 +235,8 @@ def print_list(objs, fields, exclude_unavailable=False, formatters=None,
                          this index; if None then the object order is not
                          altered
     '''
+    import prettytable
+
     formatters = formatters or {}
     mixed_case_fields = ['serverId']
     removed_fields = []
@@ -115,6 +285,8 @@ def print_list(objs, fields, exclude_unavailable=False, formatters=None,
 
 
 def print_dict(d, property="Property"):
+    import prettytable
+
     pt = prettytable.PrettyTable([property, 'Value'], caching=False)
     pt.aligns = ['l', 'l']
     for r in six.iteritems(d):
@@ -127,6 +299,14 @@ def print_dict(d, property="Property"):
 
 def find_resource(manager, name_or_id, *args, **kwargs):
     """Helper for the _find_* methods."""
+    # A manager with a loaded index answers IDs from it without a request;
+    # names are looked up in it by manager.find() below.
+    index = getattr(manager, 'resource_index', None)
+    if index is not None:
+        resource = index.get(name_or_id)
+        if resource is not None:
+            return resource
+
     # first try to get entity as integer id
     try:
         if isinstance(name_or_id, int) or name_or_id.isdigit():
@@ -0,0 +1,104 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from sgsclient import aio_base
+from sgsclient import aio_client
+from sgsclient.v1 import backups
+from sgsclient.v1 import checkpoints
+from sgsclient.v1 import replicates
+from sgsclient.v1 import replications
+from sgsclient.v1 import snapshots
+from sgsclient.v1 import volumes
+
+
+class VolumeManager(aio_base.AsyncManagerWithFindMixin,
+                    volumes.VolumeManager):
+    pass
+
+
+class ReplicationManager(aio_base.AsyncManagerWithFindMixin,
+                         replications.ReplicationManager):
+    pass
+
+
+class ReplicateManager(aio_base.AsyncManagerMixin,
+                       replicates.ReplicateManager):
+    pass
+
+
+class BackupManager(aio_base.AsyncManagerWithFindMixin,
+                    backups.BackupManager):
+    pass
+
+
+class SnapshotManager(aio_base.AsyncManagerWithFindMixin,
+                      snapshots.SnapshotManager):
+    pass
+
+
+class CheckpointManager(aio_base.AsyncManagerWithFindMixin,
+                        checkpoints.CheckpointManager):
+    pass
+
+
+class Client(object):
+    """Asyncio client for the sgs v1 API.
+
+    The managers have the methods of :class:`sgsclient.v1.client.Client`,
+    but they return awaitables, and all requests share one non-blocking
+    connection pool::
+
+        async with aio_client.Client(endpoint, token=token) as sgs:
+            volumes = await sgs.volumes.list()
+            await asyncio.gather(*[sgs.volumes.enable(v.id)
+                                   for v in volumes])
+
+    :param string endpoint: A user-supplied endpoint URL for the service.
+    :param string token: Token for authentication.
+    :param session: A keystoneclient session to look the token and
+                    endpoint up from, instead of ``endpoint`` and ``token``.
+    :param integer timeout: Total timeout of a request, in seconds.
+                            (optional)
+    :param integer pool_maxsize: Maximum number of requests in flight;
+                                 more wait for a free connection. (optional)
+    :param integer pool_maxsize_per_host: Maximum number of connections to
+                                          one host, 0 for no limit.
+                                          (optional)
+    :param resource_cache: A :class:`sgsclient.resource_cache.ResourceCache`
+                           to serve ``get()`` from. (optional)
+    :param bool conditional_get: Revalidate repeated GETs with their ETag or
+                                 Last-Modified date. (optional)
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize a new asyncio client for the sgs v1 API."""
+        options = {
+            'cache': kwargs.pop('resource_cache', None),
+            'conditional_get': kwargs.pop('conditional_get', False),
+        }
+        self.http_client = aio_client.AsyncHTTPClient(*args, **kwargs)
+        self.replications = ReplicationManager(self.http_client, **options)
+        self.volumes = VolumeManager(self.http_client, **options)
+        self.replicates = ReplicateManager(self.http_client, **options)
+        self.backups = BackupManager(self.http_client, **options)
+        self.snapshots = SnapshotManager(self.http_client, **options)
+        self.checkpoints = CheckpointManager(self.http_client, **options)
+
+    async def close(self):
+        """Close the connections of the pool."""
+        await self.http_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -18,8 +18,18 @@ class Backup(base.Resource):
         return "<Backup %s>" % self._info
 
 
+class CompactBackup(base.CompactResource):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<Backup %s>" % self._info
+
+
 class BackupManager(base.ManagerWithFind):
     resource_class = Backup
+    compact_resource_class = CompactBackup
+    filter_keys = base.ManagerWithFind.filter_keys + ('volume_id',)
+    index_keys = base.ManagerWithFind.index_keys + ('volume_id',)
 
     def create(self, volume_id, name=None, description=None, type='full',
                destination='local'):
@@ -32,7 +42,8 @@ class BackupManager(base.ManagerWithFind):
         return self._create(url, body, 'backup')
 
     def list(self, detailed=False, search_opts=None, marker=None, limit=None,
-             sort_key=None, sort_dir=None, sort=None):
+             sort_key=None, sort_dir=None, sort=None, stream=False,
+             compact=False, return_raw=False):
         """Lists all backups.
 
         :param detailed: Whether to return detailed volume info.
@@ -44,6 +55,13 @@ class BackupManager(base.ManagerWithFind):
         :param sort_dir: Sort direction, should be 'desc' or 'asc'; deprecated
                          in kilo
         :param sort: Sort information
+        :param stream: Decode the backups one at a time while the response
+                       is read and return an iterator instead of a list,
+                       so that large listings are never held in memory.
+        :param compact: Return read-only :class:`CompactBackup` objects,
+                        which take a fraction of the memory of full ones.
+        :param return_raw: Return the backups as dictionaries, without
+                           building any resource.
         :rtype: list of :class:`Backup`
         """
         resource_type = "backups"
@@ -52,7 +70,8 @@ class BackupManager(base.ManagerWithFind):
             search_opts=search_opts, marker=marker,
             limit=limit, sort_key=sort_key,
             sort_dir=sort_dir, sort=sort)
-        return self._list(url, 'backups')
+        return self._list(url, 'backups', stream=stream,
+                          compact=compact, return_raw=return_raw)
 
     def update(self, backup_id, **kwargs):
         if not kwargs:
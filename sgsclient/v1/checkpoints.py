@@ -18,8 +18,18 @@ class Checkpoint(base.Resource):
         return "<Checkpoint %s>" % self._info
 
 
+class CompactCheckpoint(base.CompactResource):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<Checkpoint %s>" % self._info
+
+
 class CheckpointManager(base.ManagerWithFind):
     resource_class = Checkpoint
+    compact_resource_class = CompactCheckpoint
+    filter_keys = base.ManagerWithFind.filter_keys + ('replication_id',)
+    index_keys = base.ManagerWithFind.index_keys + ('replication_id',)
 
     def create(self, replication_id, name=None, description=None):
         body = {'checkpoint': {"replication_id": replication_id,
@@ -29,7 +39,8 @@ class CheckpointManager(base.ManagerWithFind):
         return self._create(url, body, 'checkpoint')
 
     def list(self, detailed=False, search_opts=None, marker=None, limit=None,
-             sort_key=None, sort_dir=None, sort=None):
+             sort_key=None, sort_dir=None, sort=None, stream=False,
+             compact=False, return_raw=False):
         """Lists all checkpoints.
 
         :param detailed: Whether to return detailed checkpoint info.
@@ -41,6 +52,13 @@ class CheckpointManager(base.ManagerWithFind):
         :param sort_dir: Sort direction, should be 'desc' or 'asc'; deprecated
                          in kilo
         :param sort: Sort information
+        :param stream: Decode the checkpoints one at a time while the response
+                       is read and return an iterator instead of a list,
+                       so that large listings are never held in memory.
+        :param compact: Return read-only :class:`CompactCheckpoint` objects,
+                        which take a fraction of the memory of full ones.
+        :param return_raw: Return the checkpoints as dictionaries, without
+                           building any resource.
         :rtype: list of :class:`Checkpoint`
         """
         resource_type = "checkpoints"
@@ -49,7 +67,8 @@ class CheckpointManager(base.ManagerWithFind):
             search_opts=search_opts, marker=marker,
             limit=limit, sort_key=sort_key,
             sort_dir=sort_dir, sort=sort)
-        return self._list(url, 'checkpoints')
+        return self._list(url, 'checkpoints', stream=stream,
+                          compact=compact, return_raw=return_raw)
 
     def update(self, checkpoint_id, **kwargs):
         if not kwargs:
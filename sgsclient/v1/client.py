@@ -28,14 +28,62 @@ class Client(object):
     :param string token: Token for authentication.
     :param integer timeout: Allows customization of the timeout for client
                             http requests. (optional)
+    :param integer pool_connections: Number of per-host connection pools to
+                                     keep when not using a keystone session.
+                                     (optional)
+    :param integer pool_maxsize: Maximum number of keep-alive connections
+                                 per host. (optional)
+    :param bool pool_block: Wait for a free pooled connection instead of
+                            opening an extra one. (optional)
+    :param float pool_idle_timeout: Close pooled connections after this many
+                                    idle seconds. (optional)
+    :param bool compression: Ask for gzip or deflate compressed responses,
+                             or brotli and zstd ones when the brotli or
+                             zstandard modules are installed. Enabled by
+                             default. (optional)
+    :param connection_pool: A :class:`sgsclient.client.ConnectionPool` to
+                            share between several clients. (optional)
+    :param integer http_log_max_body: Truncate request and response bodies
+                                      longer than this in debug logs.
+                                      (optional)
+    :param float http_log_sample_rate: Fraction of the requests to log at
+                                       debug level, from 0 to 1. (optional)
+    :param http_tracer: A :class:`sgsclient.client.HTTPTracer` replacement
+                        to log requests and responses with. (optional)
+    :param retry_policy: A :class:`sgsclient.retry.RetryPolicy` to send
+                         requests failed by connection errors, 413 and
+                         gateway errors again with. Requests are not
+                         retried by default. (optional)
+    :param rate_limiter: A :class:`sgsclient.ratelimit.RateLimiter` to keep
+                         the requests under the limits of the service,
+                         slowing down when it answers over limit. Pass the
+                         same limiter to all the clients of a process.
+                         (optional)
+    :param resource_cache: A :class:`sgsclient.resource_cache.ResourceCache`
+                           to serve ``get()`` from. It can be shared between
+                           clients: entries are kept by endpoint and project,
+                           so tenants are not served each other's
+                           resources. (optional)
+    :param bool conditional_get: Revalidate repeated GETs with their ETag or
+                                 Last-Modified date, so that unchanged
+                                 responses are not downloaded again.
+                                 (optional)
     """
 
     def __init__(self, *args, **kwargs):
         """Initialize a new client for the sgs v1 API."""
+        options = {
+            'cache': kwargs.pop('resource_cache', None),
+            'conditional_get': kwargs.pop('conditional_get', False),
+        }
         self.http_client = client._construct_http_client(*args, **kwargs)
-        self.replications = replications.ReplicationManager(self.http_client)
-        self.volumes = volumes.VolumeManager(self.http_client)
-        self.replicates = replicates.ReplicateManager(self.http_client)
-        self.backups = backups.BackupManager(self.http_client)
-        self.snapshots = snapshots.SnapshotManager(self.http_client)
-        self.checkpoints = checkpoints.CheckpointManager(self.http_client)
+        self.replications = replications.ReplicationManager(self.http_client,
+                                                            **options)
+        self.volumes = volumes.VolumeManager(self.http_client, **options)
+        self.replicates = replicates.ReplicateManager(self.http_client,
+                                                      **options)
+        self.backups = backups.BackupManager(self.http_client, **options)
+        self.snapshots = snapshots.SnapshotManager(self.http_client,
+                                                   **options)
+        self.checkpoints = checkpoints.CheckpointManager(self.http_client,
+                                                         **options)
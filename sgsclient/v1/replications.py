@@ -18,8 +18,18 @@ class Replication(base.Resource):
         return "<Replication %s>" % self._info
 
 
+class CompactReplication(base.CompactResource):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<Replication %s>" % self._info
+
+
 class ReplicationManager(base.ManagerWithFind):
     resource_class = Replication
+    compact_resource_class = CompactReplication
+    index_keys = base.ManagerWithFind.index_keys + ('master_volume',
+                                                    'slave_volume')
 
     def create(self, master_volume, slave_volume, name=None, description=None):
         body = {'replication': {'name': name,
@@ -31,7 +41,8 @@ class ReplicationManager(base.ManagerWithFind):
         return self._create(url, body, 'replication')
 
     def list(self, detailed=False, search_opts=None, marker=None, limit=None,
-             sort_key=None, sort_dir=None, sort=None):
+             sort_key=None, sort_dir=None, sort=None, stream=False,
+             compact=False, return_raw=False):
         """Lists all replications.
 
         :param detailed: Whether to return detailed volume info.
@@ -43,6 +54,13 @@ class ReplicationManager(base.ManagerWithFind):
         :param sort_dir: Sort direction, should be 'desc' or 'asc'; deprecated
                          in kilo
         :param sort: Sort information
+        :param stream: Decode the replications one at a time while the response
+                       is read and return an iterator instead of a list,
+                       so that large listings are never held in memory.
+        :param compact: Return read-only :class:`CompactReplication` objects,
+                        which take a fraction of the memory of full ones.
+        :param return_raw: Return the replications as dictionaries, without
+                           building any resource.
         :rtype: list of :class:`Replication`
         """
         resource_type = "replications"
@@ -51,7 +69,8 @@ class ReplicationManager(base.ManagerWithFind):
             search_opts=search_opts, marker=marker,
             limit=limit, sort_key=sort_key,
             sort_dir=sort_dir, sort=sort)
-        return self._list(url, 'replications')
+        return self._list(url, 'replications', stream=stream,
+                          compact=compact, return_raw=return_raw)
 
     def update(self, replication_id, **kwargs):
         if not kwargs:
@@ -18,6 +18,47 @@ from sgsclient import base
 from sgsclient import exceptions
 from sgsclient import shell_utils
 from sgsclient import utils
+from sgsclient import waiters
+
+
+def _run_for_each(func, items, args):
+    """Call ``func`` on every item, ``args.parallel`` items at a time.
+
+    Yields ``(item, error)`` pairs in the order of ``items``, where
+    ``error`` is None when the call succeeded. Each pair is yielded as
+    soon as its item and the ones before it are done, so that commands
+    print their progress as they go.
+    """
+    def _run(item):
+        try:
+            func(item)
+        except Exception as e:
+            return item, e
+        return item, None
+
+    return utils.parallel_imap(_run, items,
+                               concurrency=getattr(args, 'parallel', 1))
+
+
+def _wait_args(func):
+    """Add the ``--wait`` and ``--wait-timeout`` options to a command."""
+    func = utils.arg('--wait-timeout',
+                     metavar='<seconds>',
+                     type=int,
+                     default=waiters.DEFAULT_TIMEOUT,
+                     help='Seconds to wait with --wait. '
+                          'Default=%d.' % waiters.DEFAULT_TIMEOUT)(func)
+    return utils.arg('--wait',
+                     action='store_true',
+                     default=False,
+                     help='Wait until the operation completes.')(func)
+
+
+def _wait(manager, resource, args):
+    """Wait for resource to leave its transitional status, with --wait."""
+    if not args.wait:
+        return resource
+    return manager.wait_for(resource, timeout=args.wait_timeout)
 
 
 #################
@@ -45,10 +86,12 @@ def do_replication_create(cs, args):
 @utils.arg('replication',
            metavar='<replication>',
            help='ID or name of replication.')
+@_wait_args
 def do_replication_enable(cs, args):
     """Enable a replication."""
     replication = shell_utils.find_replication(cs, args.replication)
     replication = cs.replications.enable(replication.id)
+    replication = _wait(cs.replications, replication, args)
     utils.print_dict(replication.to_dict())
 
 
@@ -69,20 +112,24 @@ def do_replication_disable(cs, args):
            action='store_true',
            default=False,
            help='Force to failover replication')
+@_wait_args
 def do_replication_failover(cs, args):
     """Failover a replication."""
     replication = shell_utils.find_replication(cs, args.replication)
     replication = cs.replications.failover(replication.id, args.force)
+    replication = _wait(cs.replications, replication, args)
     utils.print_dict(replication.to_dict())
 
 
 @utils.arg('replication',
            metavar='<replication>',
            help='ID or name of replication.')
+@_wait_args
 def do_replication_reverse(cs, args):
     """Reverse a replication."""
     replication = shell_utils.find_replication(cs, args.replication)
     replication = cs.replications.reverse(replication.id)
+    replication = _wait(cs.replications, replication, args)
     utils.print_dict(replication.to_dict())
 
 
@@ -91,13 +138,15 @@ def do_replication_reverse(cs, args):
            help='ID or name of replication.')
 def do_replication_delete(cs, args):
     """Delete a replication."""
+    def _delete(item):
+        replication = shell_utils.find_replication(cs, item)
+        cs.replications.delete(replication.id)
+
     failure_count = 0
-    for item in args.replication:
-        try:
-            replication = shell_utils.find_replication(cs, item)
-            cs.replications.delete(replication.id)
+    for item, e in _run_for_each(_delete, args.replication, args):
+        if e is None:
             print("Request to delete replication %s has been accepted." % item)
-        except Exception as e:
+        else:
             failure_count += 1
             print("Delete for replication %s failed: %s" % (item, e))
     if failure_count == len(args.replication):
@@ -385,11 +434,13 @@ def do_create_volume(cs, args):
            metavar='key=val[,key=val,...]',
            default=[],
            help='Metadata info.')
+@_wait_args
 def do_enable_sg(cs, args):
     """Enable volume's SG."""
     metadata = _extract_metadata(args)
     volume = cs.volumes.enable(args.volume_id, args.name, args.description,
                                metadata)
+    volume = _wait(cs.volumes, volume, args)
     utils.print_dict(volume.to_dict())
 
 
@@ -451,6 +502,7 @@ def do_update(cs, args):
 @utils.arg('--mode',
            metavar='<mode>',
            help='The attach mode.')
+@_wait_args
 def do_attach(cs, args):
     """Add sg-volume attachment metadata."""
     mode = args.mode
@@ -460,6 +512,7 @@ def do_attach(cs, args):
         return
     volume = shell_utils.find_volume(cs, args.volume)
     attach = cs.volumes.attach(volume.id, args.instance_uuid, mode)
+    _wait(cs.volumes, volume.id, args)
     utils.print_dict(attach.to_dict())
 
 
@@ -469,11 +522,13 @@ def do_attach(cs, args):
 @utils.arg('instance_uuid',
            metavar='<instance-uuid>',
            help='ID of instance.')
+@_wait_args
 def do_detach(cs, args):
     """Clear attachment metadata."""
     volume = shell_utils.find_volume(cs, args.volume)
     try:
         cs.volumes.detach(volume.id, args.instance_uuid)
+        _wait(cs.volumes, volume.id, args)
         print ("Request to detach volume %s has been accepted." % (
             volume.id))
     except Exception as e:
@@ -486,13 +541,15 @@ def do_detach(cs, args):
            help='ID or name of volume or volumes to delete.')
 def do_delete(cs, args):
     """Delete error or available sg volume."""
+    def _delete(item):
+        volume = shell_utils.find_volume(cs, item)
+        cs.volumes.delete(volume.id)
+
     failure_count = 0
-    for item in args.volume:
-        try:
-            volume = shell_utils.find_volume(cs, item)
-            cs.volumes.delete(volume.id)
+    for item, e in _run_for_each(_delete, args.volume, args):
+        if e is None:
             print ("Request to delete volume %s has been accepted." % item)
-        except Exception as e:
+        else:
             failure_count += 1
             print ("Request to delete volume %s failed: %s." % (item, e))
     if failure_count == len(args.volume):
@@ -550,13 +607,15 @@ def do_snapshot_create(cs, args):
            help='ID or name of snapshot or snapshots to delete.')
 def do_snapshot_delete(cs, args):
     """Delete snapshot."""
+    def _delete(item):
+        snapshot = shell_utils.find_snapshot(cs, item)
+        cs.snapshots.delete(snapshot.id)
+
     failure_count = 0
-    for item in args.snapshot:
-        try:
-            snapshot = shell_utils.find_snapshot(cs, item)
-            cs.snapshots.delete(snapshot.id)
+    for item, e in _run_for_each(_delete, args.snapshot, args):
+        if e is None:
             print("Request to delete snapshot %s has been accepted." % item)
-        except Exception as e:
+        else:
             failure_count += 1
             print("Delete for snapshot %s failed: %s" % (item, e))
     if failure_count == len(args.snapshot):
@@ -576,10 +635,12 @@ def do_snapshot_show(cs, args):
 @utils.arg('snapshot',
            metavar='<snapshot>',
            help='ID or name of snapshot.')
+@_wait_args
 def do_snapshot_rollback(cs, args):
     """Rollback snapshot."""
     snapshot = shell_utils.find_snapshot(cs, args.snapshot)
     rollback = cs.snapshots.rollback(snapshot.id)
+    _wait(cs.snapshots, snapshot.id, args)
     utils.print_dict(rollback.to_dict())
 
 
@@ -751,14 +812,17 @@ def do_backup_create(cs, args):
            metavar='<backup>', nargs='+',
            help='ID or name of backup.')
 def do_backup_delete(cs, args):
-    """Delete snapshot."""
+    """Delete backup."""
+    def _delete(item):
+        backup = shell_utils.find_backup(cs, item)
+        cs.backups.delete(backup.id)
+
     failure_count = 0
-    for item in args.backup:
-        try:
-            backup = shell_utils.find_backup(cs, item)
-            cs.backups.delete(backup.id)
+    for item, e in _run_for_each(_delete, args.backup, args):
+        if e is None:
             print("Request to delete backup %s has been accepted." % item)
-        except Exception as e:
+        else:
+            failure_count += 1
             print("Delete for backup %s failed: %s" % (item, e))
     if failure_count == len(args.backup):
         raise exceptions.CommandError("Unable to delete any of the specified "
@@ -780,10 +844,12 @@ def do_backup_show(cs, args):
 @utils.arg('volume_id',
            metavar='<volume-id>',
            help='ID of restoring cinder volume.')
+@_wait_args
 def do_backup_restore(cs, args):
     """Restore backup."""
     backup = shell_utils.find_backup(cs, args.backup)
     restore = cs.backups.restore(backup.id, args.volume_id)
+    _wait(cs.backups, backup.id, args)
     utils.print_dict(restore.to_dict())
 
 
@@ -998,13 +1064,16 @@ def do_checkpoint_create(cs, args):
            help='ID or name of checkpoint.')
 def do_checkpoint_delete(cs, args):
     """Delete checkpoint."""
+    def _delete(item):
+        checkpoint = shell_utils.find_checkpoint(cs, item)
+        cs.checkpoints.delete(checkpoint.id)
+
     failure_count = 0
-    for item in args.checkpoint:
-        try:
-            checkpoint = shell_utils.find_checkpoint(cs, item)
-            cs.checkpoints.delete(checkpoint.id)
+    for item, e in _run_for_each(_delete, args.checkpoint, args):
+        if e is None:
             print("Request to delete checkpoint %s has been accepted." % item)
-        except Exception as e:
+        else:
+            failure_count += 1
             print("Delete for checkpoint %s failed: %s" % (item, e))
     if failure_count == len(args.checkpoint):
         raise exceptions.CommandError("Unable to delete any of the specified "
@@ -1023,10 +1092,12 @@ def do_checkpoint_show(cs, args):
 @utils.arg('checkpoint',
            metavar='<checkpoint>',
            help='ID or name of checkpoint.')
+@_wait_args
 def do_checkpoint_rollback(cs, args):
     """Rollback checkpoint."""
     checkpoint = shell_utils.find_checkpoint(cs, args.checkpoint)
     rollback = cs.checkpoints.rollback(checkpoint.id)
+    _wait(cs.checkpoints, checkpoint.id, args)
     utils.print_dict(rollback.to_dict())
 
 
@@ -18,8 +18,18 @@ class Snapshot(base.Resource):
         return "<Snapshot %s>" % self._info
 
 
+class CompactSnapshot(base.CompactResource):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<Snapshot %s>" % self._info
+
+
 class SnapshotManager(base.ManagerWithFind):
     resource_class = Snapshot
+    compact_resource_class = CompactSnapshot
+    filter_keys = base.ManagerWithFind.filter_keys + ('volume_id',)
+    index_keys = base.ManagerWithFind.index_keys + ('volume_id',)
 
     def create(self, volume_id, name=None, description=None,
                checkpoint_id=None):
@@ -31,7 +41,8 @@ class SnapshotManager(base.ManagerWithFind):
         return self._create(url, body, 'snapshot')
 
     def list(self, detailed=False, search_opts=None, marker=None, limit=None,
-             sort_key=None, sort_dir=None, sort=None):
+             sort_key=None, sort_dir=None, sort=None, stream=False,
+             compact=False, return_raw=False):
         """Lists all snapshots.
 
         :param detailed: Whether to return detailed volume info.
@@ -43,6 +54,13 @@ class SnapshotManager(base.ManagerWithFind):
         :param sort_dir: Sort direction, should be 'desc' or 'asc'; deprecated
                          in kilo
         :param sort: Sort information
+        :param stream: Decode the snapshots one at a time while the response
+                       is read and return an iterator instead of a list,
+                       so that large listings are never held in memory.
+        :param compact: Return read-only :class:`CompactSnapshot` objects,
+                        which take a fraction of the memory of full ones.
+        :param return_raw: Return the snapshots as dictionaries, without
+                           building any resource.
         :rtype: list of :class:`Snapshot`
         """
         resource_type = "snapshots"
@@ -51,7 +69,8 @@ class SnapshotManager(base.ManagerWithFind):
             search_opts=search_opts, marker=marker,
             limit=limit, sort_key=sort_key,
             sort_dir=sort_dir, sort=sort)
-        return self._list(url, 'snapshots')
+        return self._list(url, 'snapshots', stream=stream,
+                          compact=compact, return_raw=return_raw)
 
     def update(self, snapshot_id, **kwargs):
         if not kwargs:
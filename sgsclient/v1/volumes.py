@@ -18,8 +18,17 @@ class Volume(base.Resource):
         return "<Volume %s>" % self._info
 
 
+class CompactVolume(base.CompactResource):
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<Volume %s>" % self._info
+
+
 class VolumeManager(base.ManagerWithFind):
     resource_class = Volume
+    compact_resource_class = CompactVolume
+    index_keys = base.ManagerWithFind.index_keys + ('replication_id',)
 
     def create(self, snapshot_id=None, checkpoint_id=None, volume_type=None,
                availability_zone=None, name=None, description=None,
@@ -36,7 +45,8 @@ class VolumeManager(base.ManagerWithFind):
         return self._create(url, body, 'volume')
 
     def list(self, detailed=False, search_opts=None, marker=None, limit=None,
-             sort_key=None, sort_dir=None, sort=None):
+             sort_key=None, sort_dir=None, sort=None, stream=False,
+             compact=False, return_raw=False):
         """Lists all volumes.
 
         :param detailed: Whether to return detailed volume info.
@@ -48,6 +58,13 @@ class VolumeManager(base.ManagerWithFind):
         :param sort_dir: Sort direction, should be 'desc' or 'asc'; deprecated
                          in kilo
         :param sort: Sort information
+        :param stream: Decode the volumes one at a time while the response
+                       is read and return an iterator instead of a list,
+                       so that large listings are never held in memory.
+        :param compact: Return read-only :class:`CompactVolume` objects,
+                        which take a fraction of the memory of full ones.
+        :param return_raw: Return the volumes as dictionaries, without
+                           building any resource.
         :rtype: list of :class:`Volume`
         """
         resource_type = "volumes"
@@ -56,7 +73,8 @@ class VolumeManager(base.ManagerWithFind):
             search_opts=search_opts, marker=marker,
             limit=limit, sort_key=sort_key,
             sort_dir=sort_dir, sort=sort)
-        return self._list(url, 'volumes')
+        return self._list(url, 'volumes', stream=stream,
+                          compact=compact, return_raw=return_raw)
 
     def update(self, volume_id, **kwargs):
         if not kwargs:
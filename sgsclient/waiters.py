@@ -0,0 +1,115 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Waiting for resources to reach a status.
+"""
+
+import time
+
+from sgsclient import exceptions as exc
+from sgsclient import utils
+
+DEFAULT_TIMEOUT = 600
+
+
+def is_transitional(status):
+    """Whether status is one the server moves on from by itself.
+
+    Such statuses describe an operation in progress, like ``enabling``,
+    ``failing-over`` or ``restoring-backup``.
+    """
+    return any(part.endswith('ing')
+               for part in (status or '').replace('_', '-').split('-'))
+
+
+def is_error(status):
+    return (status or '').startswith('error')
+
+
+class StatusWaiter(object):
+    """Bookkeeping of a wait for a set of resources.
+
+    The caller alternates between polling the pending resources, handing
+    them to :meth:`update`, and sleeping for :meth:`next_delay` seconds.
+    Delays grow exponentially, with jitter, while nothing changes and start
+    over from ``interval`` whenever a resource changes status.
+
+    :param ids: IDs of the resources to wait for.
+    :param target_statuses: Statuses to wait for. By default, any status
+                            that is not transitional.
+    :param timeout: Seconds to wait before raising
+                    :class:`sgsclient.exceptions.WaitTimeout`.
+    :param status_attr: Resource attribute holding the status.
+    :param interval: First delay between two polls.
+    :param max_interval: Upper bound of the delay between two polls.
+    """
+
+    def __init__(self, ids, target_statuses=None, timeout=DEFAULT_TIMEOUT,
+                 status_attr='status', interval=1, max_interval=30):
+        self.ids = list(ids)
+        self.pending = []
+        for resource_id in self.ids:
+            if resource_id not in self.pending:
+                self.pending.append(resource_id)
+        self.target_statuses = target_statuses
+        self.timeout = timeout
+        self.status_attr = status_attr
+        self.interval = interval
+        self.max_interval = max_interval
+        self.deadline = time.time() + timeout
+        self._done = {}
+        self._statuses = {}
+        self._delays = utils.backoff(interval, max_interval)
+
+    def _reached(self, status):
+        if self.target_statuses:
+            return status in self.target_statuses
+        return not is_transitional(status) and not is_error(status)
+
+    def update(self, resources):
+        """Record the current state of the pending resources.
+
+        :param resources: Dictionary of the polled resources by ID.
+        :returns: Whether every resource reached a target status.
+        :raises ResourceInErrorState: if a resource went into an error
+                                      status that is not a target.
+        """
+        changed = False
+        for resource_id in list(self.pending):
+            resource = resources[resource_id]
+            status = getattr(resource, self.status_attr, None)
+            if self._statuses.get(resource_id) != status:
+                self._statuses[resource_id] = status
+                changed = True
+            if is_error(status) and not self._reached(status):
+                raise exc.ResourceInErrorState(resource, status)
+            if self._reached(status):
+                self._done[resource_id] = resource
+                self.pending.remove(resource_id)
+        if changed:
+            self._delays = utils.backoff(self.interval, self.max_interval)
+        return not self.pending
+
+    def next_delay(self):
+        """Seconds to sleep before the next poll.
+
+        :raises WaitTimeout: if the deadline has passed.
+        """
+        remaining = self.deadline - time.time()
+        if remaining <= 0:
+            raise exc.WaitTimeout(self.pending, self.timeout)
+        return min(next(self._delays), remaining)
+
+    def results(self):
+        """The resources in their final state, in the order of ``ids``."""
+        return [self._done[resource_id] for resource_id in self.ids]
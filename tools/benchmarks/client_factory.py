@@ -0,0 +1,101 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cost of a client per request, with and without a ClientFactory.
+
+Each simulated request of a multi-tenant service builds a client with the
+tenant's token and gets one volume from a local keep-alive server. Built
+with ``sgsclient.client.Client``, every client has its own connection
+pool and opens a new connection; built by a ClientFactory, the clients
+share one pool. The number of connections the server accepted is shown
+next to the time per request.
+
+Usage: python tools/benchmarks/client_factory.py [--requests N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from sgsclient import client
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs
+    # stall every response on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        body = b'{"volume": {"id": "1", "status": "enabled"}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000)
+    options = parser.parse_args()
+
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    endpoint = 'http://127.0.0.1:%d' % server.server_port
+    factory = client.ClientFactory('1')
+
+    def per_request_client(i):
+        sgs = client.Client('1', endpoint, token='token-%d' % i)
+        sgs.volumes.get('1')
+        sgs.http_client.connection_pool.close()
+
+    def factory_client(i):
+        factory.client(endpoint, token='token-%d' % i).volumes.get('1')
+
+    print('%-10s %12s %12s' % ('', 'ms/request', 'connections'))
+    try:
+        for name, func in (('Client', per_request_client),
+                           ('factory', factory_client)):
+            server.connections = 0
+            start = time.time()
+            for i in range(options.requests):
+                func(i)
+            timing = (time.time() - start) / options.requests
+            print('%-10s %12.3f %12d' % (name, timing * 1000,
+                                         server.connections))
+    finally:
+        factory.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
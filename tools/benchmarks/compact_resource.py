@@ -0,0 +1,103 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Memory and CPU cost of full and compact resources.
+
+N volumes, as decoded from a /volumes/detail response, are turned into
+:class:`Volume` and :class:`CompactVolume` objects. The memory kept alive
+by the objects, response dicts included, is measured with tracemalloc,
+and construction, attribute access and ``to_dict()`` are timed.
+
+Usage: python tools/benchmarks/compact_resource.py [--items N] [--runs N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import mock
+from oslo_serialization import jsonutils
+
+from sgsclient.v1 import volumes
+
+
+def make_items(items):
+    body = {'volumes': [{'id': '%08d-0000-0000-0000-000000000000' % i,
+                         'name': 'volume-%d' % i,
+                         'status': 'enabled',
+                         'replicate_status': 'enabled',
+                         'replicate_mode': 'master',
+                         'size': 10,
+                         'availability_zone': 'az1',
+                         'description': 'benchmark volume %d' % i,
+                         'metadata': {'owner': 'bench', 'index': str(i)}}
+                        for i in range(items)]}
+    # Decode a real body so that the dicts are those a listing works on.
+    return jsonutils.dump_as_bytes(body)
+
+
+def best_of(runs, func):
+    timings = []
+    for _i in range(runs):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def build(manager, resource_class, data):
+    return [resource_class(manager, res, loaded=True)
+            for res in jsonutils.loads(data)['volumes']]
+
+
+def retained(func):
+    """Memory, in MB, still allocated by what func returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current / 1024.0 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=5)
+    options = parser.parse_args()
+
+    data = make_items(options.items)
+    manager = volumes.VolumeManager(mock.Mock(project_id=None))
+    print('%d volumes' % options.items)
+    print('%-14s %10s %10s %10s %10s' % ('', 'memory MB', 'build ms',
+                                         'read ms', 'to_dict ms'))
+    for resource_class in (volumes.Volume, volumes.CompactVolume):
+        memory = retained(lambda: build(manager, resource_class, data))
+        built = build(manager, resource_class, data)
+        build_time = best_of(options.runs,
+                             lambda: build(manager, resource_class, data))
+        read_time = best_of(options.runs, lambda: [
+            (v.id, v.name, v.status, v.size) for v in built])
+        dict_time = best_of(options.runs,
+                            lambda: [v.to_dict() for v in built])
+        print('%-14s %10.1f %10.1f %10.1f %10.1f' % (
+            resource_class.__name__, memory, build_time * 1000,
+            read_time * 1000, dict_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
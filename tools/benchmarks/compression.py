@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Wire size and list time of compressed /volumes/detail responses.
+
+A local server answers /volumes/detail with N volumes, gzip or deflate
+encoded when the request accepts it. ``volumes.list(detailed=True)`` is
+timed with compression negotiated and with ``compression=False``, and the
+bytes the server wrote are reported for both. On loopback the time is
+mostly compression cost; the byte counts are what matters on a real
+network.
+
+Usage: python tools/benchmarks/compression.py [--items N ...] [--runs N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+import zlib
+
+from oslo_serialization import jsonutils
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from sgsclient.v1 import client as v1_client
+
+
+def make_body(items):
+    volumes = [{'id': '%08d-0000-0000-0000-000000000000' % i,
+                'name': 'volume-%d' % i,
+                'status': 'enabled',
+                'replicate_status': 'enabled',
+                'replicate_mode': 'master',
+                'size': 10,
+                'availability_zone': 'az1',
+                'description': 'benchmark volume %d' % i,
+                'metadata': {'owner': 'bench', 'index': str(i)}}
+               for i in range(items)]
+    return jsonutils.dump_as_bytes({'volumes': volumes})
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        accepted = self.headers.get('Accept-Encoding') or ''
+        body, encoding = self.server.bodies['identity'], None
+        for coding in ('gzip', 'deflate'):
+            if coding in accepted:
+                body, encoding = self.server.bodies[coding], coding
+                break
+        self.server.bytes_sent = len(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def encode(body):
+    # Compressed once up front so the server does not time its own work.
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return {'identity': body,
+            'gzip': gzip.compress(body) + gzip.flush(),
+            'deflate': zlib.compress(body, 6)}
+
+
+def best_of(runs, func):
+    timings = []
+    for _i in range(runs):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--runs', type=int, default=5)
+    options = parser.parse_args()
+
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    endpoint = 'http://127.0.0.1:%d' % server.server_port
+
+    print('%8s  %-12s %12s %10s' % ('items', 'encoding', 'wire bytes',
+                                    'list ms'))
+    try:
+        for items in options.items:
+            server.bodies = encode(make_body(items))
+            for name, compression in (('identity', False),
+                                      ('negotiated', True)):
+                sgs = v1_client.Client(endpoint, token='token',
+                                       compression=compression)
+                timing = best_of(options.runs, lambda: sgs.volumes.list(
+                    detailed=True))
+                sgs.http_client.connection_pool.close()
+                print('%8d  %-12s %12d %10.1f' % (
+                    items, name, server.bytes_sent, timing * 1000))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Cost of decoding large list responses in HTTPClient and SessionClient.
+
+A /volumes/detail response with 10k items is fed to ``json_request`` of
+both transports, with the network call stubbed out. The "previous" rows
+repeat the decoding the transports used to do: the body was loaded from
+``resp.text`` to pick the error class, then decoded again as the result.
+
+Usage: python tools/benchmarks/json_decode.py [--items N] [--runs N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+import mock
+from oslo_serialization import jsonutils
+import requests
+
+from sgsclient import client
+
+
+def make_response(items):
+    volumes = [{'id': '%08d-0000-0000-0000-000000000000' % i,
+                'name': 'volume-%d' % i,
+                'status': 'enabled',
+                'replicate_status': 'enabled',
+                'replicate_mode': 'master',
+                'size': 10,
+                'availability_zone': 'az1',
+                'description': 'benchmark volume %d' % i,
+                'metadata': {'owner': 'bench', 'index': str(i)}}
+               for i in range(items)]
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers['Content-Type'] = 'application/json'
+    resp._content = jsonutils.dump_as_bytes({'volumes': volumes})
+    resp.raw = mock.Mock(version=11)
+    return resp
+
+
+def best_of(runs, func):
+    timings = []
+    for _i in range(runs):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=10)
+    options = parser.parse_args()
+
+    resp = make_response(options.items)
+    print('%d items, %.1f MB body' % (options.items,
+                                      len(resp.content) / 1024.0 / 1024))
+
+    http = client.HTTPClient('http://endpoint', token='token')
+    session = client.SessionClient(session=mock.Mock())
+
+    def previous_http():
+        jsonutils.loads(resp.text)
+        resp.json()
+
+    def previous_session():
+        jsonutils.loads(resp.text)
+        jsonutils.loads(resp.text)
+
+    with mock.patch.object(client.ConnectionPool, 'request',
+                           return_value=resp), \
+            mock.patch('keystoneclient.adapter.Adapter.request',
+                       return_value=resp):
+        rows = [
+            ('HTTPClient previous', best_of(options.runs, previous_http)),
+            ('HTTPClient current', best_of(
+                options.runs, lambda: http.json_request('GET', '/v'))),
+            ('SessionClient previous', best_of(options.runs,
+                                               previous_session)),
+            ('SessionClient current', best_of(
+                options.runs, lambda: session.json_request('GET', '/v'))),
+        ]
+
+    for name, timing in rows:
+        print('%-24s %8.1f ms' % (name, timing * 1000))
+
+
+if __name__ == '__main__':
+    main()
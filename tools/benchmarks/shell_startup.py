@@ -0,0 +1,109 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Startup time of ``sgs list``, with eager and lazy subcommand loading.
+
+The eager mode reproduces the previous startup: the pbr version lookup,
+every keystoneclient module and prettytable are loaded up front and the
+parser registers all subcommands. Both modes run ``sgs list`` end to end
+against a local stand-in SG-Service that returns an empty volume list.
+
+Usage: python tools/benchmarks/shell_startup.py [--runs N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+LAZY = """
+import sys
+from sgsclient import shell
+shell.main(sys.argv[1:])
+"""
+
+EAGER = """
+import sys
+from keystoneclient.auth.identity.generic import password
+from keystoneclient.auth.identity.generic import token
+from keystoneclient.auth.identity import v3
+from keystoneclient.auth import token_endpoint
+from keystoneclient import discover
+from keystoneclient import session
+from oslo_log import handlers
+import prettytable
+import sgsclient
+from sgsclient import shell
+
+sgsclient.__version__
+get_subcommand_parser = shell.SGServiceShell.get_subcommand_parser
+shell.SGServiceShell.get_subcommand_parser = (
+    lambda self, version, command=None, parser=None:
+    get_subcommand_parser(self, version, parser=parser))
+shell.main(sys.argv[1:])
+"""
+
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = b'{"volumes": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(code, url, runs):
+    argv = [sys.executable, '-c', code, '--os-no-client-auth',
+            '--os-auth-token', 'token', '--sgs-url', url, 'list']
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    timings = []
+    for _i in range(runs):
+        start = time.time()
+        subprocess.check_call(argv, env=env, stdout=subprocess.PIPE)
+        timings.append(time.time() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    options = parser.parse_args()
+
+    server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d' % server.server_port
+
+    print('%-8s %10s %10s' % ('mode', 'best (ms)', 'mean (ms)'))
+    for name, code in (('eager', EAGER), ('lazy', LAZY)):
+        best, mean = run(code, url, options.runs)
+        print('%-8s %10.1f %10.1f' % (name, best * 1000, mean * 1000))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Peak memory of iterating over a huge backup listing.
+
+A local server answers /backups/detail with N backups. Every backup is
+visited once, either from ``backups.list(detailed=True)`` or from the
+streamed ``backups.list(detailed=True, stream=True)``, and the peak of
+the memory allocated by Python during the walk is reported with
+tracemalloc.
+
+Usage: python tools/benchmarks/stream_list.py [--items N ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+import tracemalloc
+
+from oslo_serialization import jsonutils
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from sgsclient.v1 import client as v1_client
+
+
+def make_body(items):
+    backups = [{'id': '%08d-0000-0000-0000-000000000000' % i,
+                'name': 'backup-%d' % i,
+                'status': 'available',
+                'volume_id': '%08d-1111-1111-1111-111111111111' % i,
+                'size': 10,
+                'availability_zone': 'az1',
+                'destination': 'local',
+                'description': 'benchmark backup %d' % i}
+               for i in range(items)]
+    return jsonutils.dump_as_bytes({'backups': backups})
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def walk(sgs, stream):
+    count = 0
+    for backup in sgs.backups.list(detailed=True, stream=stream):
+        count += backup.size and 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+',
+                        default=[20000, 200000])
+    options = parser.parse_args()
+
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    sgs = v1_client.Client('http://127.0.0.1:%d' % server.server_port,
+                           token='token', compression=False)
+
+    print('%8s  %-8s %10s %12s' % ('items', 'mode', 'time ms', 'peak MB'))
+    try:
+        for items in options.items:
+            server.body = make_body(items)
+            for name, stream in (('list', False), ('stream', True)):
+                tracemalloc.start()
+                start = time.time()
+                walk(sgs, stream)
+                timing = time.time() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print('%8d  %-8s %10.1f %12.1f' % (
+                    items, name, timing * 1000, peak / 1024.0 / 1024))
+    finally:
+        sgs.http_client.connection_pool.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()